@@ -1 +1,18 @@
-from .qfitswidget import QFitsWidget, MenuAction, MenuHeader, MenuSeparator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .qfitswidget import QFitsWidget, MenuAction, MenuHeader, MenuSeparator, RenderBackend
+
+# the widget is only imported when used, so that e.g. qfitswidget.render works without Qt
+_WIDGET_NAMES = ["QFitsWidget", "MenuAction", "MenuHeader", "MenuSeparator", "RenderBackend"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _WIDGET_NAMES:
+        from . import qfitswidget
+
+        return getattr(qfitswidget, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = _WIDGET_NAMES
@@ -0,0 +1,392 @@
+"""Headless benchmarks for preparing, displaying and redrawing images and for hovering over them.
+
+Run with `python -m qfitswidget.benchmark --help` for options. Results can be written to a JSON file and compared
+with one from another version.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from importlib import metadata
+from typing import Any, Callable, TYPE_CHECKING
+import numpy as np
+from astropy.io import fits
+
+from .frame import FrameSettings, prepare_frame, render_frame
+
+if TYPE_CHECKING:
+    from .qfitswidget import QFitsWidget
+
+SIZES = [1024, 4096]
+DTYPES = ["uint8", "uint16", "int32", "float32"]
+KINDS = ["mono", "bayer", "rgb"]
+
+# number of hover events per case
+HOVER_EVENTS = 200
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """A synthetic frame to run benchmarks on."""
+
+    size: int
+    dtype: str
+    kind: str
+    wcs: bool
+    trimsec: bool
+
+    @property
+    def name(self) -> str:
+        return (
+            f"{self.size} {self.dtype} {self.kind}" + (" wcs" if self.wcs else "") + (" trim" if self.trimsec else "")
+        )
+
+
+@dataclass
+class StageResult:
+    """Wall time and peak memory of one stage."""
+
+    case: str
+    stage: str
+    seconds: float
+    peak_bytes: int
+
+
+class StageTimer:
+    """Measures wall time and, optionally, peak memory of consecutive stages."""
+
+    def __init__(self, trace_memory: bool = False):
+        """Create new timer.
+
+        Args:
+            trace_memory: Whether to measure peak memory of allocations traced by tracemalloc, which includes
+                numpy arrays, but slows down Python code.
+        """
+        self.trace_memory = trace_memory
+        self.results: dict[str, tuple[float, int]] = {}
+        self._stage: str | None = None
+        self._start = 0.0
+        self._base = 0
+
+    def start(self, stage: str) -> None:
+        """Finish current stage and start a new one."""
+        self.stop()
+        self._stage = stage
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+
+    def stop(self) -> None:
+        """Finish current stage."""
+        if self._stage is None:
+            return
+        elapsed = time.perf_counter() - self._start
+        peak = tracemalloc.get_traced_memory()[1] - self._base if self.trace_memory else 0
+        self.results[self._stage] = (elapsed, peak)
+        self._stage = None
+
+
+def synthetic_hdu(case: BenchmarkCase, seed: int = 0) -> fits.PrimaryHDU:
+    """Create synthetic frame with noisy sky background, stars, overscan and WCS.
+
+    Args:
+        case: Benchmark case describing the frame.
+        seed: Seed for random numbers.
+
+    Returns:
+        HDU with image.
+    """
+    rng = np.random.default_rng(seed)
+    shape = (3, case.size, case.size) if case.kind == "rgb" else (case.size, case.size)
+    dtype = np.dtype(case.dtype)
+    sky, noise, saturation = (30.0, 5.0, 255.0) if dtype == np.uint8 else (1000.0, 30.0, 65535.0)
+    if dtype == np.int32:
+        # range beyond exact integer histograms
+        sky, noise, saturation = 1e6, 3e4, 2.0**24
+
+    # noisy background, scaled in place to save memory for large frames
+    data = rng.standard_normal(shape, dtype=np.float32)
+    data *= noise
+    data += sky
+
+    # stars as single bright pixels
+    n = case.size * case.size // 10000
+    ys, xs = rng.integers(0, case.size, n), rng.integers(0, case.size, n)
+    data[..., ys, xs] = rng.uniform(sky, saturation, n).astype(np.float32)
+    np.clip(data, 0, saturation, out=data)
+
+    # header
+    header = fits.Header()
+    if case.kind == "bayer":
+        header["BAYERPAT"] = "RGGB"
+    if case.trimsec:
+        header["TRIMSEC"] = f"[33:{case.size - 32},1:{case.size}]"
+        data[..., :32] = sky / 2
+        data[..., -32:] = sky / 2
+    if case.wcs:
+        header.update(
+            CTYPE1="RA---TAN",
+            CTYPE2="DEC--TAN",
+            CRPIX1=case.size / 2,
+            CRPIX2=case.size / 2,
+            CRVAL1=150.0,
+            CRVAL2=2.0,
+            CD1_1=-1e-4,
+            CD1_2=1e-5,
+            CD2_1=1e-5,
+            CD2_2=1e-4,
+        )
+    return fits.PrimaryHDU(data.astype(dtype, copy=False), header=header)
+
+
+def cases(
+    sizes: list[int], dtypes: list[str], kinds: list[str], wcs: list[bool], trimsec: list[bool]
+) -> list[BenchmarkCase]:
+    """Create all combinations of given parameters, skipping float and int32 Bayer images, which can't be debayered."""
+    return [
+        BenchmarkCase(size, dtype, kind, w, t)
+        for size in sizes
+        for dtype in dtypes
+        for kind in kinds
+        for w in wcs
+        for t in trimsec
+        if not (kind == "bayer" and dtype in ("float32", "int32"))
+    ]
+
+
+def _run_stages(
+    case: BenchmarkCase,
+    hdu: fits.PrimaryHDU,
+    widget: QFitsWidget,
+    process_events: Callable[[], None],
+    timer: StageTimer,
+) -> None:
+    """Run all stages once for a frame."""
+    from .qfitswidget import MouseHoverRequest, process_mouse_hover
+
+    # prepare frame, timed per stage via progress
+    def progress(stage: str, percent: int) -> None:
+        if stage == "done":
+            timer.stop()
+        else:
+            timer.start(f"prepare {stage}")
+
+    prepare_frame(hdu, FrameSettings(trimsec=case.trimsec), progress=progress)
+    frame = prepare_frame(hdu, FrameSettings(trimsec=case.trimsec, rgba_lut=True))
+    if frame is None:
+        raise RuntimeError("Preparing frame failed.")
+
+    # render to RGBA
+    timer.start("render rgba")
+    render_frame(frame)
+
+    # display in widget, reset settings first, so that they don't count as a redraw
+    timer.stop()
+    widget.checkTrimSec.setChecked(case.trimsec)
+    widget.comboStretch.setCurrentText("sqrt")
+    widget.comboCuts.setCurrentText("99.9%")
+    process_events()
+    timer.start("display")
+    widget.display(hdu)
+    process_events()
+
+    # redraw with new stretch and new cuts preset
+    timer.start("redraw stretch")
+    widget.comboStretch.setCurrentText("linear")
+    process_events()
+    timer.start("redraw cuts")
+    widget.comboCuts.setCurrentText("99.0%")
+    process_events()
+
+    # hover, synchronously in this thread
+    if widget.data is not None:
+        rng = np.random.default_rng(1)
+        positions = rng.uniform(0, case.size - 1, (HOVER_EVENTS, 2))
+        timer.start("hover")
+        for x, y in positions:
+            process_mouse_hover(
+                MouseHoverRequest(
+                    x=x,
+                    y=y,
+                    data=widget.data,
+                    normalize=widget.normalize_data,
+                    timestamp=time.perf_counter(),
+                    size=widget.zoom_size,
+                    scaled=widget.scaled_data,
+                    offset=widget._data_offset,
+                )
+            )
+    timer.stop()
+
+
+def run_case(
+    case: BenchmarkCase, widget: QFitsWidget, process_events: Callable[[], None], repeat: int = 3
+) -> list[StageResult]:
+    """Benchmark all stages for a case.
+
+    Times are the best of all runs, while memory is measured in an extra run, since tracing slows things down.
+
+    Args:
+        case: Case to run.
+        widget: Widget to display frame in, should prepare frames synchronously.
+        process_events: Called to process pending Qt events.
+        repeat: Number of runs for timing.
+
+    Returns:
+        Results for all stages, hover time is per event.
+    """
+    hdu = synthetic_hdu(case)
+
+    # time
+    times: dict[str, float] = {}
+    for _ in range(repeat):
+        timer = StageTimer()
+        _run_stages(case, hdu, widget, process_events, timer)
+        for stage, (seconds, _) in timer.results.items():
+            times[stage] = min(seconds, times.get(stage, np.inf))
+
+    # memory
+    tracemalloc.start()
+    try:
+        timer = StageTimer(trace_memory=True)
+        _run_stages(case, hdu, widget, process_events, timer)
+    finally:
+        tracemalloc.stop()
+
+    return [
+        StageResult(
+            case=case.name,
+            stage=stage,
+            seconds=seconds / HOVER_EVENTS if stage == "hover" else seconds,
+            peak_bytes=timer.results[stage][1],
+        )
+        for stage, seconds in times.items()
+    ]
+
+
+def _format_row(cells: list[str], widths: list[int]) -> str:
+    return "  ".join(c.ljust(w) if i < 2 else c.rjust(w) for i, (c, w) in enumerate(zip(cells, widths)))
+
+
+def print_results(results: list[StageResult], baseline: dict[tuple[str, str], float] | None = None) -> None:
+    """Print results as table.
+
+    Args:
+        results: Results to print.
+        baseline: If given, time of each (case, stage) in a previous run, ratios to it are added.
+    """
+    header = ["case", "stage", "time [ms]", "peak [MB]"] + (["vs. baseline"] if baseline is not None else [])
+    rows = []
+    for r in results:
+        row = [r.case, r.stage, f"{r.seconds * 1000:.2f}", f"{r.peak_bytes / 1024**2:.1f}"]
+        if baseline is not None:
+            before = baseline.get((r.case, r.stage))
+            row.append(f"{r.seconds / before:.2f}x" if before else "-")
+        rows.append(row)
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    print(_format_row(header, widths))
+    for row in rows:
+        print(_format_row(row, widths))
+
+
+def _version() -> str:
+    try:
+        return metadata.version("qfitswidget")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _choices(values: str, allowed: list[str]) -> list[str]:
+    items = [v.strip() for v in values.split(",") if v.strip()]
+    for item in items:
+        if item not in allowed:
+            raise argparse.ArgumentTypeError(f"Invalid value {item}, must be one of {', '.join(allowed)}.")
+    return items
+
+
+def _flags(value: str) -> list[bool]:
+    return {"on": [True], "off": [False], "both": [False, True]}[value]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark QFitsWidget on synthetic frames.")
+    parser.add_argument(
+        "--sizes", default=",".join(str(s) for s in SIZES), help="comma-separated sizes, e.g. 1024,4096,16384"
+    )
+    parser.add_argument("--dtypes", default=",".join(DTYPES), help="comma-separated data types")
+    parser.add_argument("--kinds", default=",".join(KINDS), help="comma-separated kinds of images")
+    parser.add_argument("--wcs", choices=["on", "off", "both"], default="both", help="frames with WCS")
+    parser.add_argument("--trimsec", choices=["on", "off", "both"], default="both", help="frames with TRIMSEC")
+    parser.add_argument("--backend", choices=["matplotlib", "qimage"], default="matplotlib", help="render backend")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs per case, best time is reported")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON file with results of a previous run to compare with")
+    args = parser.parse_args(argv)
+
+    try:
+        benchmark_cases = cases(
+            [int(s) for s in args.sizes.split(",")],
+            _choices(args.dtypes, DTYPES),
+            _choices(args.kinds, KINDS),
+            _flags(args.wcs),
+            _flags(args.trimsec),
+        )
+    except (ValueError, argparse.ArgumentTypeError) as e:
+        parser.error(str(e))
+
+    # Qt without display, must be set before Qt is loaded
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from qtpy import QtCore, QtWidgets  # type: ignore
+    from .qfitswidget import QFitsWidget, RenderBackend
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    widget = QFitsWidget(render_backend=RenderBackend(args.backend))
+    widget.prepare_in_background = False
+    widget.resize(1024, 768)
+    widget.show()
+    app.processEvents()
+
+    # baseline
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = {(r["case"], r["stage"]): r["seconds"] for r in json.load(f)["results"]}
+
+    # run
+    results: list[StageResult] = []
+    for i, case in enumerate(benchmark_cases, 1):
+        print(f"[{i}/{len(benchmark_cases)}] {case.name}", file=sys.stderr)
+        results.extend(run_case(case, widget, app.processEvents, args.repeat))
+    print_results(results, baseline)
+
+    # delete widget, which stops its threads
+    widget.deleteLater()
+    QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.Type.DeferredDelete)
+
+    # write results
+    if args.json is not None:
+        output: dict[str, Any] = {
+            "version": _version(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "repeat": args.repeat,
+            "results": [asdict(r) for r in results],
+        }
+        with open(args.json, "w") as f:
+            json.dump(output, f, indent=2)
+
+
+__all__ = ["BenchmarkCase", "StageResult", "StageTimer", "synthetic_hdu", "cases", "run_case", "print_results", "main"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+from __future__ import annotations
+from typing import Any, Iterator
+import numpy as np
+import numpy.typing as npt
+from astropy.stats import sigma_clipped_stats
+from astropy.visualization import ZScaleInterval
+
+# number of pixels processed at once, keeps temporary arrays small
+CHUNK_SIZE = 1 << 20
+
+# maximum number of bins for exact integer histograms, larger ranges use the float path
+MAX_INTEGER_BINS = 1 << 22
+
+# number of bins per level for float histograms
+FLOAT_BINS = 1 << 16
+
+# number of pixels in stratified samples for sample-based cuts, so their cost doesn't depend on the image size
+SAMPLE_SIZE = 10000
+
+
+def _chunks(flat: npt.NDArray[Any]) -> Iterator[npt.NDArray[Any]]:
+    """Iterate over a flat array in chunks of CHUNK_SIZE."""
+    for i in range(0, len(flat), CHUNK_SIZE):
+        yield flat[i : i + CHUNK_SIZE]
+
+
+class HistogramCuts:
+    """Calculates percentile cuts from a histogram of all positive pixels in O(n).
+
+    Integer data is counted exactly using a bincount. For float data, the bins adapt to the range of valid pixels
+    and the requested ranks are picked exactly from the pixels within their bins. So results are identical to
+    picking from a sorted array, but without ever sorting (or copying) all pixels.
+    """
+
+    def __init__(self, data: npt.NDArray[Any], positive: tuple[int, float, float] | None = None):
+        """Build histogram from given data.
+
+        Args:
+            data: Image data, may be of any shape. Only finite pixels > 0 are used.
+            positive: Number, min and max of finite pixels > 0, if already known, which saves a pass over float data.
+        """
+
+        # store flat view on data, only copies if data is not contiguous
+        self._flat = data.reshape(-1)
+        self._ranks: dict[int, float] = {}
+
+        # number of used pixels and their range, and number of zeros for integer data
+        self.count = 0
+        self.zeros = 0
+        self.min = np.nan
+        self.max = np.nan
+
+        # integer data with reasonable range can be counted exactly
+        self._counts: npt.NDArray[np.int64] = np.zeros(0, dtype=np.int64)
+        self._cumsum: npt.NDArray[np.int64] | None = None
+        self._scale: float | None = None
+        if np.issubdtype(self._flat.dtype, np.integer) and self._init_integer():
+            return
+        self._init_float(positive)
+
+    def _init_integer(self) -> bool:
+        """Initialize exact histogram for integer data.
+
+        Returns:
+            Whether the exact histogram could be built.
+        """
+
+        # get max value and check it
+        if len(self._flat) == 0:
+            return True
+        hi = int(np.max(self._flat))
+        if hi > MAX_INTEGER_BINS:
+            return False
+
+        # count all values, bincount casts to intp, so do it in chunks
+        counts = np.zeros(max(hi, 0) + 1, dtype=np.int64)
+        signed = np.issubdtype(self._flat.dtype, np.signedinteger)
+        for chunk in _chunks(self._flat):
+            if signed:
+                chunk = chunk[chunk > 0]
+            counts += np.bincount(chunk, minlength=len(counts))
+
+        # ignore zeros
+        self.zeros = int(counts[0])
+        counts[0] = 0
+        self._counts = counts
+
+        # statistics
+        self.count = int(np.sum(counts))
+        if self.count > 0:
+            nonzero = np.flatnonzero(counts)
+            self.min, self.max = float(nonzero[0]), float(nonzero[-1])
+        return True
+
+    def _init_float(self, positive: tuple[int, float, float] | None = None) -> None:
+        """Initialize histogram for float data, or integer data with a range too large for exact counting."""
+
+        # get range and number of finite positive pixels
+        if positive is not None:
+            count, lo, hi = positive
+        else:
+            lo, hi, count = np.inf, -np.inf, 0
+            for chunk in _chunks(self._flat):
+                if chunk.dtype.kind != "f":
+                    chunk = chunk.astype(np.float64)
+                valid = np.isfinite(chunk) & (chunk > 0)
+                n = int(np.count_nonzero(valid))
+                if n > 0:
+                    count += n
+                    lo = min(lo, float(np.min(chunk, where=valid, initial=np.inf)))
+                    hi = max(hi, float(np.max(chunk, where=valid, initial=-np.inf)))
+        self.count = count
+        if count == 0:
+            return
+        self.min, self.max = lo, hi
+
+        # bins adapt to the actual range of valid pixels
+        self._scale = FLOAT_BINS / (hi - lo) if hi > lo else 0.0
+
+        # count pixels per bin, last bin collects invalid pixels
+        counts = np.zeros(FLOAT_BINS + 1, dtype=np.int64)
+        for chunk in _chunks(self._flat):
+            counts += np.bincount(self._bin_index(chunk), minlength=FLOAT_BINS + 1)
+        self._counts = counts[:-1]
+
+    def _bin_index(self, chunk: npt.NDArray[Any]) -> npt.NDArray[np.intp]:
+        """Calculate bin indices for given chunk of data, invalid pixels go to bin FLOAT_BINS."""
+        idx = chunk.astype(np.float64)
+        idx -= self.min
+        idx *= self._scale or 0.0
+        np.minimum(idx, FLOAT_BINS - 1, out=idx)
+        idx[~(np.isfinite(chunk) & (chunk > 0))] = FLOAT_BINS
+        result: npt.NDArray[np.intp] = idx.astype(np.intp)
+        return result
+
+    @property
+    def exact_counts(self) -> npt.NDArray[np.int64] | None:
+        """Number of pixels > 0 for each value of integer data, None for float data."""
+        return self._counts if self._scale is None else None
+
+    def estimate(self, k: int) -> float:
+        """Estimates the k-th smallest value of all used pixels from the histogram alone, without accessing the data.
+
+        Exact for integer data, otherwise the center of the bin containing the rank.
+
+        Args:
+            k: Zero-based rank.
+
+        Returns:
+            Estimated value at given rank.
+        """
+        if k < 0 or k >= self.count:
+            raise IndexError("Rank out of range.")
+        if self._cumsum is None:
+            self._cumsum = np.cumsum(self._counts)
+        b = int(np.searchsorted(self._cumsum, k, side="right"))
+        if self._scale is None:
+            return float(b)
+        return min(self.max, self.min + (b + 0.5) / self._scale) if self._scale > 0 else self.min
+
+    def rank(self, k: int) -> float:
+        """Returns the k-th smallest value of all used pixels.
+
+        Args:
+            k: Zero-based rank.
+
+        Returns:
+            Value at given rank.
+        """
+        return self.ranks([k])[0]
+
+    def ranks(self, ks: list[int]) -> list[float]:
+        """Returns the values at the given zero-based ranks.
+
+        Args:
+            ks: List of zero-based ranks.
+
+        Returns:
+            Values at given ranks.
+        """
+
+        # check
+        if any(k < 0 or k >= self.count for k in ks):
+            raise IndexError("Rank out of range.")
+
+        # calculate missing ones
+        missing = [k for k in ks if k not in self._ranks]
+        if missing:
+            if self._cumsum is None:
+                self._cumsum = np.cumsum(self._counts)
+            bins = np.searchsorted(self._cumsum, missing, side="right")
+            if self._scale is None:
+                # integer histogram, bin is value
+                self._ranks.update({k: float(b) for k, b in zip(missing, bins)})
+            else:
+                self._ranks.update(self._float_ranks(missing, bins))
+        return [self._ranks[k] for k in ks]
+
+    def _float_ranks(self, ks: list[int], bins: npt.NDArray[np.intp]) -> dict[int, float]:
+        """Pick exact values for given ranks from their bins in a single pass over the data."""
+
+        # collect all pixels in the requested bins
+        wanted = np.unique(bins)
+        collected: dict[int, list[npt.NDArray[Any]]] = {int(b): [] for b in wanted}
+        for chunk in _chunks(self._flat):
+            idx = self._bin_index(chunk)
+            for b in wanted:
+                collected[int(b)].append(chunk[idx == b])
+
+        # partition bins and pick values
+        result = {}
+        for k, b in zip(ks, bins):
+            values = np.concatenate(collected[int(b)])
+            below = int(self._cumsum[b - 1]) if b > 0 else 0  # type: ignore
+            result[k] = float(np.partition(values, k - below)[k - below])
+        return result
+
+    def percentile_cuts(self, percent: float) -> tuple[float, float]:
+        """Calculate cuts by discarding (100-percent)% of all pixels at both ends.
+
+        Args:
+            percent: Percentage of pixels to keep.
+
+        Returns:
+            Tuple of low and high cut.
+        """
+
+        # no pixels?
+        if self.count == 0:
+            raise ValueError("No valid pixels.")
+
+        # get number of pixels to discard at both ends
+        n = int(self.count * (1.0 - (percent / 100.0)))
+        if 2 * n >= self.count:
+            n = (self.count - 1) // 2
+
+        # get min/max in cut range
+        lo, hi = self.ranks([n, self.count - 1 - n])
+        return lo, hi
+
+
+def stratified_sample(data: npt.NDArray[Any], size: int = SAMPLE_SIZE, seed: int = 0) -> npt.NDArray[Any]:
+    """Take a sample of finite pixels, one at a random position in each cell of a regular grid over the image.
+
+    Unlike a strided sample, it doesn't alias with periodic patterns like Bayer matrices or readout artefacts, and
+    unlike a purely random sample, it covers the whole image evenly. With a fixed seed, the same positions are
+    used for images of same size, so cuts of consecutive frames are stable.
+
+    Args:
+        data: Image of shape (h, w) or (h, w, c), or a flat array.
+        size: Number of pixels in sample, including all channels, all pixels are used for smaller images.
+        seed: Seed for random positions within cells.
+
+    Returns:
+        Flat array with finite pixels of sample.
+    """
+    if data.ndim == 1:
+        data = data[np.newaxis, :]
+    h, w = data.shape[:2]
+    n = max(1, size // (data.shape[2] if data.ndim == 3 else 1))
+
+    if h * w <= n:
+        sample = data.reshape(-1)
+    else:
+        # grid of about n cells with same aspect ratio as image
+        ny = min(h, max(1, int(round(np.sqrt(n * h / w)))))
+        nx = min(w, max(1, n // ny))
+        y0, x0 = np.arange(ny + 1) * h // ny, np.arange(nx + 1) * w // nx
+
+        # one random pixel per cell
+        rng = np.random.default_rng(seed)
+        ys = y0[:-1, None] + (rng.random((ny, nx)) * np.diff(y0)[:, None]).astype(np.intp)
+        xs = x0[None, :-1] + (rng.random((ny, nx)) * np.diff(x0)[None, :]).astype(np.intp)
+        sample = np.asarray(data[ys, xs]).reshape(-1)
+
+    return sample[np.isfinite(sample)] if sample.dtype.kind == "f" else sample
+
+
+def zscale_cuts(sample: npt.NDArray[Any], contrast: float = 0.25) -> tuple[float, float] | None:
+    """Calculate cuts with the zscale algorithm known from IRAF and DS9.
+
+    Args:
+        sample: Sample of pixels, e.g. from stratified_sample().
+        contrast: Scaling factor for the slope of the fitted line.
+
+    Returns:
+        Low and high cut or None, if sample is empty.
+    """
+    if len(sample) == 0:
+        return None
+    lo, hi = ZScaleInterval(n_samples=len(sample), contrast=contrast).get_limits(sample)
+    return float(lo), float(hi)
+
+
+def sigma_clip_cuts(sample: npt.NDArray[Any], k: float, sigma: float = 3.0) -> tuple[float, float] | None:
+    """Calculate cuts at the sigma-clipped median +/- k times the sigma-clipped standard deviation.
+
+    Args:
+        sample: Sample of pixels, e.g. from stratified_sample().
+        k: Number of standard deviations around median.
+        sigma: Number of standard deviations for clipping outliers.
+
+    Returns:
+        Low and high cut or None, if sample is empty.
+    """
+    if len(sample) == 0:
+        return None
+    _, median, std = sigma_clipped_stats(sample, sigma=sigma, maxiters=5)
+    if not np.isfinite(median) or not np.isfinite(std):
+        return None
+    return float(median - k * std), float(median + k * std)
+
+
+__all__ = ["HistogramCuts", "stratified_sample", "zscale_cuts", "sigma_clip_cuts"]
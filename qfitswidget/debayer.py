@@ -0,0 +1,165 @@
+from __future__ import annotations
+from typing import Any
+import cv2  # type: ignore
+import numpy as np
+import numpy.typing as npt
+
+# OpenCV names patterns by the second row, starting at the second column, so they are shifted against FITS
+BAYER_CODES = {
+    "RGGB": cv2.COLOR_BayerBG2RGB,
+    "BGGR": cv2.COLOR_BayerRG2RGB,
+    "GRBG": cv2.COLOR_BayerGB2RGB,
+    "GBRG": cv2.COLOR_BayerGR2RGB,
+}
+
+# (row, column) of red, both green and blue pixel in each 2x2 cell
+BAYER_OFFSETS = {
+    "RGGB": ((0, 0), (0, 1), (1, 0), (1, 1)),
+    "BGGR": ((1, 1), (0, 1), (1, 0), (0, 0)),
+    "GRBG": ((0, 1), (0, 0), (1, 1), (1, 0)),
+    "GBRG": ((1, 0), (0, 0), (1, 1), (0, 1)),
+}
+
+
+def bayer_pattern(pattern: str) -> str:
+    """Check and normalize name of Bayer pattern.
+
+    Args:
+        pattern: Name of pattern, e.g. from BAYERPAT or COLORTYP keyword.
+
+    Returns:
+        Pattern in upper case.
+    """
+    p = str(pattern).strip().upper()
+    if p not in BAYER_OFFSETS:
+        raise ValueError(f"Unknown Bayer pattern: {pattern}")
+    return p
+
+
+def debayer_shape(shape: tuple[int, ...], superpixel: bool = False) -> tuple[int, int, int]:
+    """Get shape of debayered image.
+
+    Args:
+        shape: Shape of raw image.
+        superpixel: Whether each 2x2 cell becomes a single pixel.
+
+    Returns:
+        Shape of RGB image.
+    """
+    h, w = shape
+    return (h // 2, w // 2, 3) if superpixel else (h, w, 3)
+
+
+def debayer(
+    arr: npt.NDArray[Any],
+    pattern: str,
+    superpixel: bool = False,
+    out: npt.NDArray[Any] | None = None,
+    scratch: npt.NDArray[Any] | None = None,
+) -> npt.NDArray[Any]:
+    """Debayer an image.
+
+    Interpolating at full resolution is only supported for 8 and 16 bit unsigned integers, while the superpixel
+    mode works with any data type. In both cases, the result has the same type as the raw image.
+
+    Args:
+        arr: Raw image.
+        pattern: Bayer pattern, one of RGGB, BGGR, GRBG and GBRG.
+        superpixel: If True, each 2x2 cell becomes a single pixel with the mean of both green pixels, which is a
+            lot faster and gives an image of half the size.
+        out: Buffer to write result into, must have shape from debayer_shape() and same type as raw image.
+        scratch: Buffer of shape (h // 2, w // 2) and same type for intermediate results of the superpixel mode
+            with integer images, allocated if not given.
+
+    Returns:
+        RGB image of shape (h, w, 3) or (h // 2, w // 2, 3).
+    """
+    pattern = bayer_pattern(pattern)
+    shape = debayer_shape(arr.shape, superpixel)
+    dtype = arr.dtype.newbyteorder("=")
+    if out is not None and (out.shape != shape or out.dtype != dtype):
+        raise ValueError("Output buffer doesn't match debayered image.")
+
+    # full resolution
+    if not superpixel:
+        if dtype not in (np.uint8, np.uint16):
+            raise ValueError("Debayering is only supported for 8 and 16 bit unsigned integers.")
+        return cv2.cvtColor(np.ascontiguousarray(arr, dtype=dtype), BAYER_CODES[pattern], dst=out)  # type: ignore
+
+    # superpixel, all colours are strided views on the raw image
+    h, w = shape[:2]
+    (ry, rx), (g1y, g1x), (g2y, g2x), (by, bx) = BAYER_OFFSETS[pattern]
+    red = arr[ry : 2 * h : 2, rx : 2 * w : 2]
+    green1 = arr[g1y : 2 * h : 2, g1x : 2 * w : 2]
+    green2 = arr[g2y : 2 * h : 2, g2x : 2 * w : 2]
+    blue = arr[by : 2 * h : 2, bx : 2 * w : 2]
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    np.copyto(out[..., 0], red)
+    np.copyto(out[..., 2], blue)
+
+    # mean of green pixels in place
+    green = out[..., 1]
+    if dtype.kind in "iu":
+        # (a >> 1) + (b >> 1) + (a & b & 1) is the floor of the mean without overflowing the type
+        if scratch is None:
+            scratch = np.empty(shape[:2], dtype=dtype)
+        np.right_shift(green1, 1, out=green)
+        np.right_shift(green2, 1, out=scratch)
+        green += scratch
+        np.bitwise_and(green1, green2, out=scratch)
+        scratch &= 1
+        green += scratch
+    else:
+        np.add(green1, green2, out=green)
+        green *= 0.5
+    return out
+
+
+class Debayer:
+    """Debayers images of same size and type into reused buffers, e.g. frames of a live stream.
+
+    Results are written to a ring of buffers, so a returned image is only valid until `buffers` more images have
+    been debayered.
+    """
+
+    def __init__(self, buffers: int = 2):
+        """Create new debayer.
+
+        Args:
+            buffers: Number of output buffers.
+        """
+        self._buffers: list[npt.NDArray[Any]] = []
+        self._count = buffers
+        self._next = 0
+        self._scratch: npt.NDArray[Any] | None = None
+        self._key: tuple[Any, ...] | None = None
+
+    def __call__(self, arr: npt.NDArray[Any], pattern: str, superpixel: bool = False) -> npt.NDArray[Any]:
+        """Debayer an image, see debayer() for details.
+
+        Args:
+            arr: Raw image.
+            pattern: Bayer pattern.
+            superpixel: Whether to use superpixel mode.
+
+        Returns:
+            RGB image in one of the buffers.
+        """
+
+        # allocate buffers for new size or type
+        shape = debayer_shape(arr.shape, superpixel)
+        dtype = arr.dtype.newbyteorder("=")
+        if self._key != (shape, dtype):
+            self._key = (shape, dtype)
+            self._buffers = [np.empty(shape, dtype=dtype) for _ in range(self._count)]
+            self._scratch = np.empty(shape[:2], dtype=dtype) if superpixel and dtype.kind in "iu" else None
+            self._next = 0
+
+        # next buffer
+        out = self._buffers[self._next]
+        self._next = (self._next + 1) % self._count
+        return debayer(arr, pattern, superpixel, out=out, scratch=self._scratch)
+
+
+__all__ = ["bayer_pattern", "debayer_shape", "debayer", "Debayer"]
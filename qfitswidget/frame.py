@@ -0,0 +1,771 @@
+from __future__ import annotations
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+import numpy as np
+import numpy.typing as npt
+import astropy.units as u
+from astropy.io import fits
+from astropy.wcs import WCS
+from matplotlib import colormaps, colors  # type: ignore
+
+from .cuts import sigma_clip_cuts, zscale_cuts
+from .imagestatistics import ImageStatistics
+from .debayer import Debayer, debayer
+from .norm import FuncNorm, LookupTable
+from .sources import Sources
+from .timing import TimingRecord
+from .wcsgrid import WCSGrid
+
+# sections are read via the file object shared by all HDUs of a file, so never do that concurrently
+_read_lock = threading.Lock()
+
+# presets for cuts and names of stretch functions, in the order shown in the widget
+CUTS_PRESETS = ["100.0%", "99.9%", "99.0%", "95.0%", "zscale", "3 sigma", "5 sigma"]
+STRETCHES = ["linear", "log", "sqrt", "squared", "asinh"]
+
+# number of pixels in strided sample for previews, which are only created for images at least four times as large
+PREVIEW_PIXELS = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class FrameSettings:
+    """Snapshot of the display settings required for preparing a frame."""
+
+    trimsec: bool = False
+    cuts_preset: str = "99.9%"
+    cuts: tuple[float, float] = (0.0, 1.0)
+    stretch: str = "sqrt"
+    cmap: str = "gray"
+    rgba_lut: bool = False
+    superpixel: bool = False
+
+
+@dataclass
+class PreparedFrame:
+    """A frame with everything calculated that is required for rendering it.
+
+    For a preview, statistics, cuts and normalized data are only calculated for a sample taken at every step-th row
+    and column of the trimmed data. Sources are only detected on demand later and stored here for caching.
+    """
+
+    hdu: fits.ImageHDU
+    settings: FrameSettings
+    wcs: WCS | None
+    wcs_grid: WCSGrid | None
+    position_angle: float | None
+    mirrored: bool | None
+    data: npt.NDArray[Any]
+    trimmed_data: npt.NDArray[Any]
+    statistics: ImageStatistics
+    cuts: tuple[float, float]
+    norm: colors.Normalize
+    lut: LookupTable | None
+    scaled_data: npt.NDArray[Any] | None
+    binning: int = 1
+    offset: tuple[int, int] = (0, 0)
+    timing: TimingRecord | None = None
+    step: int = 1
+    sources: Sources | None = None
+
+
+def position_angle(header: fits.Header, wcs: WCS) -> tuple[float | None, bool | None]:
+    """Get position angle and check whether image was mirrored.
+
+    Args:
+        header: Header of image.
+        wcs: WCS created from header.
+
+    Returns:
+        Tuple of position angle in degrees and whether image is mirrored, both None if unknown.
+    """
+    if not (
+        "CRPIX1" in header
+        and "CRPIX2" in header
+        and "CTYPE1" in header
+        and header["CTYPE1"]
+        and "CTYPE2" in header
+        and header["CTYPE2"]
+    ):
+        return None, None
+
+    cx, cy = header["CRPIX1"], header["CRPIX2"]
+    coord = wcs.pixel_to_world(cx, cy)
+    coord_up = wcs.pixel_to_world(cx, cy + 10)
+    coord_left = wcs.pixel_to_world(cx - 10, cy)
+    pa_up = coord.position_angle(coord_up).wrap_at(360 * u.deg)
+    pa_left = coord.position_angle(coord_left).wrap_at(360 * u.deg)
+    return -pa_up.to(u.deg).value, bool(pa_up - pa_left > 0)
+
+
+def bayer_binning(header: fits.Header, superpixel: bool) -> int:
+    """Get binning of displayed image against raw data.
+
+    Args:
+        header: Header of image.
+        superpixel: Whether Bayer images are debayered in superpixel mode.
+
+    Returns:
+        2 for Bayer images in superpixel mode, 1 otherwise.
+    """
+    return 2 if superpixel and ("BAYERPAT" in header or "COLORTYP" in header) else 1
+
+
+def binned_wcs_header(header: fits.Header, binning: int) -> fits.Header:
+    """Adjust WCS in header for a binned image.
+
+    Args:
+        header: Header of unbinned image.
+        binning: Binning factor for both axes.
+
+    Returns:
+        Copy of header with reference pixel, scale and SIP distortion converted to binned pixels.
+    """
+    if binning == 1:
+        return header
+    header = header.copy()
+    for i in (1, 2):
+        if f"NAXIS{i}" in header:
+            header[f"NAXIS{i}"] = header[f"NAXIS{i}"] // binning
+        if f"CRPIX{i}" in header:
+            header[f"CRPIX{i}"] = (header[f"CRPIX{i}"] - 0.5) / binning + 0.5
+        for j in (1, 2):
+            if f"CD{j}_{i}" in header:
+                header[f"CD{j}_{i}"] *= binning
+        if f"CDELT{i}" in header and "CD1_1" not in header:
+            header[f"CDELT{i}"] *= binning
+
+    # SIP coefficients of order p+q work on pixel offsets and return one
+    for key in list(header.keys()):
+        m = re.fullmatch(r"(A|B|AP|BP)_(\d+)_(\d+)", key)
+        if m is not None:
+            header[key] *= float(binning) ** (int(m.group(2)) + int(m.group(3)) - 1)
+    return header
+
+
+def image_data(hdu: fits.ImageHDU, superpixel: bool = False, buffers: Debayer | None = None) -> npt.NDArray[Any]:
+    """Get image data from HDU, debayered and with colour in last axis.
+
+    Args:
+        hdu: HDU to take data from.
+        superpixel: Whether to debayer Bayer images in superpixel mode at half resolution.
+        buffers: If given, Bayer images are debayered into its reused buffers.
+
+    Returns:
+        Image data of shape (h, w) or (h, w, 3).
+    """
+
+    # do we have a bayer matrix given?
+    if "BAYERPAT" in hdu.header or "COLORTYP" in hdu.header:
+        # check layers
+        if len(hdu.data.shape) != 2:
+            raise ValueError("Invalid data format.")
+
+        # got a bayer pattern
+        pattern = hdu.header["BAYERPAT" if "BAYERPAT" in hdu.header else "COLORTYP"]
+
+        # debayer iamge
+        data = debayer(hdu.data, pattern, superpixel) if buffers is None else buffers(hdu.data, pattern, superpixel)
+
+    else:
+        data = hdu.data
+
+    # 3D, i.e. color, image?
+    if len(data.shape) == 3:
+        # we need three images of uint8 format
+        if data.shape[0] != 3 and data.shape[2] != 3:
+            raise ValueError("Data cubes only supported with three layers, which are interpreted as RGB.")
+        if data.shape[0] == 3:
+            # move axis
+            data = np.moveaxis(data, 0, 2)
+    return data
+
+
+def data_shape(header: fits.Header) -> tuple[int, ...]:
+    """Get shape of image data from header without reading it.
+
+    Args:
+        header: Header of image.
+
+    Returns:
+        Shape in numpy order, i.e. the last axis is NAXIS1.
+    """
+    return tuple(int(header[f"NAXIS{i}"]) for i in range(int(header.get("NAXIS", 0)), 0, -1))
+
+
+def plane_count(hdu: fits.ImageHDU) -> int:
+    """Get number of image planes in HDU.
+
+    All axes beyond the first two are flattened into planes, except for cubes with three layers, which are a
+    single RGB image.
+
+    Args:
+        hdu: HDU to check.
+
+    Returns:
+        Number of planes, 0 if HDU contains no image.
+    """
+    shape = data_shape(hdu.header)
+    if len(shape) < 2:
+        return 0
+    if len(shape) == 2 or (len(shape) == 3 and (shape[0] == 3 or shape[2] == 3)):
+        return 1
+    return int(np.prod(shape[:-2]))
+
+
+def plane_hdu(hdu: fits.ImageHDU, plane: int) -> fits.ImageHDU:
+    """Get HDU containing a single plane of a cube.
+
+    If HDU has been read from a file, only the requested plane is read.
+
+    Args:
+        hdu: HDU to take plane from.
+        plane: Index of plane, see plane_count().
+
+    Returns:
+        HDU with plane, or the given HDU itself, if it only contains one.
+    """
+
+    # single plane?
+    count = plane_count(hdu)
+    if not 0 <= plane < count:
+        raise IndexError("Plane index out of range.")
+    if count == 1:
+        if hdu.fileinfo() is not None:
+            with _read_lock:
+                # load data now, not when accessed the first time, maybe while another plane is read
+                hdu.data
+        return hdu
+
+    # read only this plane from file, if possible
+    index = tuple(int(i) for i in np.unravel_index(plane, data_shape(hdu.header)[:-2]))
+    data = None
+    if hdu.fileinfo() is not None:
+        try:
+            with _read_lock:
+                data = hdu.section[index]
+        except ValueError:
+            # memory-mapped with scaling, astropy doesn't support sections for that
+            pass
+    if data is None:
+        data = hdu.data[index]
+    return fits.ImageHDU(data=data, header=hdu.header)
+
+
+def parse_section(section: str) -> tuple[int, int, int, int]:
+    """Parse a FITS section like "[1:2048,1:4096]".
+
+    Args:
+        section: Section in one-based, inclusive FITS notation, x axis first.
+
+    Returns:
+        Zero-based section as (y0, y1, x0, x1) with exclusive upper bounds.
+    """
+    s = section.strip()[1:-1].split(",")
+    x = [int(v) for v in s[0].split(":")]
+    y = [int(v) for v in s[1].split(":")]
+    return min(y) - 1, max(y), min(x) - 1, max(x)
+
+
+def trimsec_bounds(header: fits.Header, binning: int = 1) -> tuple[int, int, int, int] | None:
+    """Get science region of an image from its header.
+
+    The region is taken from TRIMSEC, DATASEC or, if only an overscan at one side of the image is given, everything
+    but BIASSEC, in this order.
+
+    Args:
+        header: Header to parse sections from.
+        binning: Binning of image against the raw data the sections refer to, only fully covered pixels are included.
+
+    Returns:
+        Zero-based section as (y0, y1, x0, x1) or None, if not given.
+    """
+
+    # science region given?
+    if "TRIMSEC" in header:
+        y0, y1, x0, x1 = parse_section(header["TRIMSEC"])
+    elif "DATASEC" in header:
+        y0, y1, x0, x1 = parse_section(header["DATASEC"])
+    elif "BIASSEC" in header and header.get("NAXIS", 0) >= 2:
+        # overscan strip along one edge, science region is the remaining part
+        h, w = data_shape(header)[-2:]
+        y0, y1, x0, x1 = 0, h, 0, w
+        by0, by1, bx0, bx1 = parse_section(header["BIASSEC"])
+        if by0 <= 0 and by1 >= h and bx0 <= 0:
+            x0 = bx1
+        elif by0 <= 0 and by1 >= h and bx1 >= w:
+            x1 = bx0
+        elif bx0 <= 0 and bx1 >= w and by0 <= 0:
+            y0 = by1
+        elif bx0 <= 0 and bx1 >= w and by1 >= h:
+            y1 = by0
+        else:
+            return None
+    else:
+        return None
+
+    return -(-y0 // binning), y1 // binning, -(-x0 // binning), x1 // binning
+
+
+def trimsec(header: fits.Header, data: npt.NDArray[Any], binning: int = 1) -> tuple[npt.NDArray[Any], tuple[int, int]]:
+    """Trim an image to its science region, see trimsec_bounds().
+
+    Args:
+        header: Header to take sections from.
+        data: Image data.
+        binning: Binning of image against raw data.
+
+    Returns:
+        Tuple of view on science region and its offset (x, y) in image, which is the whole image, if not given.
+    """
+
+    # keyword not given?
+    bounds = trimsec_bounds(header, binning)
+    if bounds is None:
+        # return whole data
+        return data, (0, 0)
+
+    # view on region, clipped to image
+    h, w = data.shape[:2]
+    y0, y1, x0, x1 = max(0, bounds[0]), min(h, bounds[1]), max(0, bounds[2]), min(w, bounds[3])
+    if y1 <= y0 or x1 <= x0:
+        return data, (0, 0)
+    return data[y0:y1, x0:x1], (x0, y0)
+
+
+def image_extent(shape: tuple[int, ...], offset: tuple[int, int] = (0, 0)) -> tuple[float, float, float, float]:
+    """Get extent of an image in pixel coordinates.
+
+    Args:
+        shape: Shape of image.
+        offset: Offset (x, y) of image, e.g. if it is trimmed.
+
+    Returns:
+        Extent as (left, right, bottom, top).
+    """
+    h, w = shape[:2]
+    return offset[0] - 0.5, offset[0] + w - 0.5, offset[1] - 0.5, offset[1] + h - 0.5
+
+
+def cutout(
+    data: npt.NDArray[Any] | Any,
+    x: float,
+    y: float,
+    size: int,
+    offset: tuple[int, int] = (0, 0),
+    fill: float = np.nan,
+) -> npt.NDArray[Any]:
+    """Cut square around a pixel, padded where it exceeds the image.
+
+    Args:
+        data: Image of shape (h, w) or (h, w, c), or anything that can be sliced like it, e.g. a LazyImage.
+        x: X pixel coordinate of center.
+        y: Y pixel coordinate of center.
+        size: Width and height of cutout.
+        offset: Position (x, y) of first pixel of data in pixel coordinates, e.g. for a trimmed image.
+        fill: Value for pixels outside of data and masked ones.
+
+    Returns:
+        Cutout of shape (size, size) or (size, size, c).
+    """
+
+    # bounds of cutout in data
+    h, w = data.shape[:2]
+    x0 = int(np.floor(x + 0.5)) - offset[0] - size // 2
+    y0 = int(np.floor(y + 0.5)) - offset[1] - size // 2
+    sx0, sx1, sy0, sy1 = max(0, x0), min(w, x0 + size), max(0, y0), min(h, y0 + size)
+
+    # copy overlapping part
+    out = np.full((size, size, *data.shape[2:]), fill, dtype=np.result_type(data.dtype, fill))
+    if sx1 > sx0 and sy1 > sy0:
+        out[sy0 - y0 : sy1 - y0, sx0 - x0 : sx1 - x0] = np.ma.filled(data[sy0:sy1, sx0:sx1], fill)
+    return out
+
+
+def preset_cuts(statistics: ImageStatistics, preset: str) -> tuple[float, float] | None:
+    """Calculate cuts for given preset.
+
+    Percentiles like "99.9%" are exact and calculated from the histogram. "zscale" and "<k> sigma", i.e. the
+    sigma-clipped median +/- k standard deviations, are calculated from the stratified sample.
+
+    Args:
+        statistics: Statistics of image, including a histogram.
+        preset: Name of preset, e.g. "99.9%".
+
+    Returns:
+        Low and high cut or None, if preset is "Custom" or there are no valid pixels.
+    """
+
+    # sample-based
+    if preset == "zscale":
+        return zscale_cuts(statistics.sample)
+    m = re.fullmatch(r"(\d+(?:\.\d+)?) sigma", preset)
+    if m is not None:
+        return sigma_clip_cuts(statistics.sample, float(m.group(1)))
+
+    # percentile
+    histogram = statistics.histogram
+    if preset == "Custom" or histogram is None or histogram.count == 0:
+        return None
+    return histogram.percentile_cuts(float(preset[:-1]))
+
+
+def create_norm(stretch: str, vmin: float, vmax: float) -> colors.Normalize:
+    """Create normalization for given stretch function.
+
+    Args:
+        stretch: Name of stretch function.
+        vmin: Low cut.
+        vmax: High cut.
+
+    Returns:
+        Normalization.
+    """
+    if stretch == "linear":
+        return colors.Normalize(vmin=vmin, vmax=vmax, clip=True)
+    elif stretch == "log":
+        return colors.LogNorm(vmin=vmin, vmax=vmax, clip=True)
+    elif stretch == "sqrt":
+        return FuncNorm(np.sqrt, vmin=vmin, vmax=vmax, clip=True)
+    elif stretch == "squared":
+        return colors.PowerNorm(2, vmin=vmin, vmax=vmax, clip=True)
+    elif stretch == "asinh":
+        return FuncNorm(np.arcsinh, vmin=vmin, vmax=vmax, clip=True)
+    else:
+        raise ValueError("Invalid stretch")
+
+
+def normalize(
+    data: npt.NDArray[Any], norm: Callable[..., Any], lut: LookupTable | None = None
+) -> npt.NDArray[np.floating[Any]]:
+    """Normalize data.
+
+    Args:
+        data: Data to normalize.
+        norm: Normalization to use.
+        lut: Lookup table to use for matching 8/16 bit integer data.
+
+    Returns:
+        Normalized data.
+    """
+    # for 8/16 bit integer data, mono or RGB, we can use the lookup table
+    if lut is not None and data.dtype.newbyteorder("=") == lut.dtype.newbyteorder("="):
+        return lut(data)
+    # RGB data is normalized here as well, since it's not done by imshow, which also expects it within 0..1
+    if len(data.shape) == 3:
+        return np.clip(norm(data), 0, 1)  # type: ignore
+    return norm(data)  # type: ignore
+
+
+def create_lut(norm: colors.Normalize, data: npt.NDArray[Any]) -> LookupTable | None:
+    """Create lookup table for normalizing data, if possible.
+
+    Args:
+        norm: Normalization to use.
+        data: Data to normalize, only its shape and type are used.
+
+    Returns:
+        Lookup table for 8/16 bit integer mono and RGB images, None otherwise.
+    """
+    return LookupTable(norm, data.dtype) if len(data.shape) in (2, 3) and LookupTable.supports(data.dtype) else None
+
+
+def to_rgba(
+    data: npt.NDArray[Any],
+    scaled_data: npt.NDArray[Any] | None,
+    lut: LookupTable | None,
+    cmap: colors.Colormap,
+) -> npt.NDArray[np.uint8]:
+    """Convert image to RGBA.
+
+    Args:
+        data: Image data, only used with a lookup table containing a colormap.
+        scaled_data: Normalized data, either mono or RGB.
+        lut: Lookup table.
+        cmap: Colormap for normalized mono data.
+
+    Returns:
+        RGBA image as uint8.
+    """
+
+    # lookup table with colormap for mono image?
+    if lut is not None and lut.rgba is not None and len(data.shape) == 2:
+        return lut.to_rgba(data)
+
+    # RGB, emulate imshow, which clips to 0..1
+    if scaled_data is None:
+        raise ValueError("No normalized data available.")
+    if len(scaled_data.shape) == 3:
+        rgba = np.full((*scaled_data.shape[:2], 4), 255, dtype=np.uint8)
+        rgba[..., :3] = np.clip(np.ma.filled(scaled_data, 0), 0, 1) * 255
+        return rgba
+
+    # mono
+    return cmap(scaled_data, bytes=True)
+
+
+def normalize_frame(
+    data: npt.NDArray[Any], stretch: str, vmin: float, vmax: float, rgba_lut: bool = False
+) -> tuple[colors.Normalize, LookupTable | None, npt.NDArray[Any] | None]:
+    """Create normalization and lookup table for data and normalize it.
+
+    The colormap is not applied here, so that changing it doesn't require normalizing again. With rgba_lut, it is
+    supposed to be added to the lookup table later via LookupTable.set_cmap().
+
+    Args:
+        data: Data to normalize.
+        stretch: Name of stretch function.
+        vmin: Low cut.
+        vmax: High cut.
+        rgba_lut: Whether the lookup table is used for creating RGBA images directly.
+
+    Returns:
+        Tuple of normalization, lookup table (if possible) and normalized data, which is None if the lookup table
+        is used for RGBA.
+    """
+    norm = create_norm(stretch, vmin, vmax)
+    lut = create_lut(norm, data)
+    scaled_data = None if rgba_lut and lut is not None and len(data.shape) == 2 else normalize(data, norm, lut)
+    return norm, lut, scaled_data
+
+
+def prepare_frame(
+    hdu: fits.ImageHDU,
+    settings: FrameSettings,
+    progress: Callable[[str, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+    plane: int = 0,
+    cuts: tuple[float, float] | None = None,
+    preview: Callable[[PreparedFrame], None] | None = None,
+) -> PreparedFrame | None:
+    """Prepare a frame for display.
+
+    Args:
+        hdu: HDU to take image from.
+        settings: Display settings.
+        progress: Called with name of stage and progress in percent before each stage.
+        cancelled: Called before each stage, preparation is aborted if it returns True.
+        plane: Plane to show, if HDU contains a cube.
+        cuts: If given, these cuts are used instead of evaluating the preset.
+        preview: For large images, called with a preview before cuts are calculated on the full image.
+
+    Returns:
+        Prepared frame or None, if cancelled. Its timing contains the duration of each stage.
+    """
+    timing = TimingRecord("prepare")
+    current: list[Any] = [None, time.perf_counter()]
+
+    def stage(name: str, percent: int) -> bool:
+        # finish previous stage
+        now = time.perf_counter()
+        if current[0] is not None:
+            timing.add(current[0], now - current[1])
+        current[:] = [name, now]
+
+        if progress is not None:
+            progress(name, percent)
+        return cancelled is not None and cancelled()
+
+    # read plane
+    if stage("read", 0):
+        return None
+    hdu = plane_hdu(hdu, plane)
+
+    # WCS, only for image axes, and in binned pixels for superpixel mode
+    if stage("wcs", 5):
+        return None
+    wcs = WCS(hdu.header, naxis=2)
+    pa, mirrored = position_angle(hdu.header, wcs)
+    binning = bayer_binning(hdu.header, settings.superpixel)
+    if binning > 1:
+        wcs = WCS(binned_wcs_header(hdu.header, binning), naxis=2)
+
+    # data
+    if stage("debayer", 10):
+        return None
+    data = image_data(hdu, settings.superpixel)
+    wcs_grid = WCSGrid(wcs, data.shape)
+
+    # trimsec, only a view on the science region
+    if stage("trimsec", 30):
+        return None
+    trimmed_data, offset = trimsec(hdu.header, data, binning) if settings.trimsec else (data, (0, 0))
+
+    # preview from a strided sample
+    h, w = trimmed_data.shape[:2]
+    if preview is not None and h * w > 4 * PREVIEW_PIXELS:
+        if stage("preview", 35):
+            return None
+        step = int(np.ceil(np.sqrt(h * w / PREVIEW_PIXELS)))
+        sample = trimmed_data[::step, ::step]
+        sample_statistics = ImageStatistics(sample)
+        sample_cuts = cuts or preset_cuts(sample_statistics, settings.cuts_preset) or settings.cuts
+        sample_norm, sample_lut, sample_scaled = normalize_frame(
+            sample, settings.stretch, *sample_cuts, settings.rgba_lut
+        )
+        preview(
+            PreparedFrame(
+                hdu=hdu,
+                settings=settings,
+                wcs=wcs,
+                wcs_grid=wcs_grid,
+                position_angle=pa,
+                mirrored=mirrored,
+                data=data,
+                trimmed_data=trimmed_data,
+                statistics=sample_statistics,
+                cuts=sample_cuts,
+                norm=sample_norm,
+                lut=sample_lut,
+                scaled_data=sample_scaled,
+                binning=binning,
+                offset=offset,
+                step=step,
+            )
+        )
+
+    # cuts
+    if stage("cuts", 40):
+        return None
+    statistics = ImageStatistics(trimmed_data)
+    cuts = cuts or preset_cuts(statistics, settings.cuts_preset) or settings.cuts
+
+    # normalize
+    if stage("normalize", 70):
+        return None
+    norm, lut, scaled_data = normalize_frame(trimmed_data, settings.stretch, *cuts, settings.rgba_lut)
+
+    # finished
+    if stage("done", 100):
+        return None
+    return PreparedFrame(
+        hdu=hdu,
+        settings=settings,
+        wcs=wcs,
+        wcs_grid=wcs_grid,
+        position_angle=pa,
+        mirrored=mirrored,
+        data=data,
+        trimmed_data=trimmed_data,
+        statistics=statistics,
+        cuts=cuts,
+        norm=norm,
+        lut=lut,
+        scaled_data=scaled_data,
+        binning=binning,
+        offset=offset,
+        timing=timing,
+    )
+
+
+def shared_cuts(
+    hdus: list[fits.ImageHDU], settings: FrameSettings, max_pixels: int = 2048 * 2048
+) -> tuple[float, float] | None:
+    """Calculate cuts from combined statistics of several images.
+
+    Args:
+        hdus: HDUs to take images from.
+        settings: Display settings.
+        max_pixels: Maximum number of pixels sampled from all images.
+
+    Returns:
+        Low and high cut or None, if preset is "Custom" or there are no valid pixels.
+    """
+    if settings.cuts_preset == "Custom" or len(hdus) == 0:
+        return None
+
+    # strided samples of science regions of all images
+    samples = []
+    for hdu in hdus:
+        data = image_data(hdu, settings.superpixel)
+        if settings.trimsec:
+            data, _ = trimsec(hdu.header, data, bayer_binning(hdu.header, settings.superpixel))
+        step = max(1, int(np.ceil(np.sqrt(data.shape[0] * data.shape[1] * len(hdus) / max_pixels))))
+        samples.append(data[::step, ::step].reshape(-1))
+    return preset_cuts(ImageStatistics(np.concatenate(samples)), settings.cuts_preset)
+
+
+def prepare_frames(
+    hdus: list[fits.ImageHDU],
+    settings: FrameSettings,
+    shared: bool = False,
+    progress: Callable[[str, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> list[PreparedFrame] | None:
+    """Prepare several frames for display, e.g. for comparing them.
+
+    Args:
+        hdus: HDUs to take images from.
+        settings: Display settings.
+        shared: Whether to use the same cuts, calculated from the combined statistics, for all frames.
+        progress: Called with name of stage and total progress in percent before each stage.
+        cancelled: Called before each stage, preparation is aborted if it returns True.
+
+    Returns:
+        Prepared frames or None, if cancelled.
+    """
+    n = len(hdus)
+    cuts = shared_cuts(hdus, settings) if shared else None
+
+    # prepare all frames, progress is for all of them
+    frames = []
+    for i, hdu in enumerate(hdus):
+
+        def frame_progress(name: str, percent: int, i: int = i) -> None:
+            if progress is not None:
+                progress(name, (100 * i + percent) // n)
+
+        frame = prepare_frame(hdu, settings, frame_progress, cancelled, cuts=cuts)
+        if frame is None:
+            return None
+        frames.append(frame)
+    return frames
+
+
+def render_frame(frame: PreparedFrame) -> npt.NDArray[np.uint8]:
+    """Render prepared frame to RGBA image with the colormap from its settings, only the sample for a preview.
+
+    Args:
+        frame: Prepared frame.
+
+    Returns:
+        RGBA image as uint8.
+    """
+    cmap = colormaps[frame.settings.cmap]
+    if frame.settings.rgba_lut and frame.lut is not None:
+        frame.lut.set_cmap(cmap)
+    return to_rgba(frame.trimmed_data[:: frame.step, :: frame.step], frame.scaled_data, frame.lut, cmap)
+
+
+__all__ = [
+    "CUTS_PRESETS",
+    "STRETCHES",
+    "PREVIEW_PIXELS",
+    "FrameSettings",
+    "PreparedFrame",
+    "position_angle",
+    "debayer",
+    "bayer_binning",
+    "binned_wcs_header",
+    "image_data",
+    "data_shape",
+    "plane_count",
+    "plane_hdu",
+    "parse_section",
+    "trimsec_bounds",
+    "trimsec",
+    "image_extent",
+    "cutout",
+    "preset_cuts",
+    "create_norm",
+    "normalize",
+    "create_lut",
+    "to_rgba",
+    "normalize_frame",
+    "prepare_frame",
+    "shared_cuts",
+    "prepare_frames",
+    "render_frame",
+]
@@ -0,0 +1,118 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Hashable
+import numpy as np
+
+from .frame import PreparedFrame
+
+
+def frame_nbytes(frame: PreparedFrame) -> int:
+    """Estimate memory used by a prepared frame.
+
+    Arrays that are only views of other data, e.g. planes of a cube in memory, are not counted.
+
+    Args:
+        frame: Frame to estimate memory for.
+
+    Returns:
+        Size in bytes.
+    """
+    arrays: list[Any] = [frame.data, frame.trimmed_data, frame.scaled_data]
+    if frame.lut is not None:
+        arrays += [frame.lut.values, frame.lut.rgba]
+
+    nbytes = 0
+    seen: set[int] = set()
+    for arr in arrays:
+        if arr is None or id(arr) in seen:
+            continue
+        seen.add(id(arr))
+        if isinstance(arr, np.ma.MaskedArray):
+            # normalized data, which always owns its data and maybe a mask
+            nbytes += arr.nbytes + (arr.mask.nbytes if arr.mask is not np.ma.nomask else 0)
+        elif arr.flags.owndata:
+            nbytes += arr.nbytes
+    return nbytes
+
+
+class FrameCache:
+    """Memory-bounded LRU cache of prepared frames."""
+
+    def __init__(self, max_bytes: int = 512 * 1024**2):
+        """Create new cache.
+
+        Args:
+            max_bytes: Maximum memory used by cached frames, least recently used ones are dropped first.
+        """
+        self.nbytes = 0
+        self._frames: OrderedDict[Hashable, tuple[PreparedFrame, int]] = OrderedDict()
+        self._max_bytes = max_bytes
+
+    @property
+    def max_bytes(self) -> int:
+        """Maximum memory used by cached frames."""
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._evict(0)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._frames
+
+    def get(self, key: Hashable) -> PreparedFrame | None:
+        """Get frame from cache and mark it as recently used.
+
+        Args:
+            key: Key of frame.
+
+        Returns:
+            Frame or None, if not in cache.
+        """
+        if key not in self._frames:
+            return None
+        self._frames.move_to_end(key)
+        return self._frames[key][0]
+
+    def put(self, key: Hashable, frame: PreparedFrame) -> None:
+        """Store frame in cache, dropping least recently used ones, if necessary.
+
+        Args:
+            key: Key of frame.
+            frame: Frame to store, ignored if it is larger than the cache.
+        """
+        self.remove(key)
+        nbytes = frame_nbytes(frame)
+        if nbytes > self._max_bytes:
+            return
+        self._evict(nbytes)
+        self._frames[key] = (frame, nbytes)
+        self.nbytes += nbytes
+
+    def _evict(self, nbytes: int) -> None:
+        """Drop least recently used frames until given number of bytes fits into cache."""
+        while len(self._frames) > 0 and self.nbytes + nbytes > self._max_bytes:
+            _, (_, size) = self._frames.popitem(last=False)
+            self.nbytes -= size
+
+    def remove(self, key: Hashable) -> None:
+        """Remove frame from cache, if it exists.
+
+        Args:
+            key: Key of frame.
+        """
+        if key in self._frames:
+            _, size = self._frames.pop(key)
+            self.nbytes -= size
+
+    def clear(self) -> None:
+        """Remove all frames."""
+        self._frames.clear()
+        self.nbytes = 0
+
+
+__all__ = ["FrameCache", "frame_nbytes"]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+from typing import Any
+import numpy as np
+import numpy.typing as npt
+from qtpy import QtCore, QtGui  # type: ignore
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.transforms import Bbox
+
+
+class ImageCanvas(FigureCanvasQTAgg):  # type: ignore
+    """Matplotlib canvas that can paint an RGBA image directly with Qt below the (transparent) figure.
+
+    This bypasses imshow completely, the figure is only used for overlays, which are drawn on top of the image.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        FigureCanvasQTAgg.__init__(self, *args, **kwargs)
+        self._image: QtGui.QImage | None = None
+        self._image_buffer: npt.NDArray[np.uint8] | None = None
+        self._image_extent = (0.0, 1.0, 0.0, 1.0)
+        self._image_axes: Axes | None = None
+
+    def set_image(
+        self,
+        rgba: npt.NDArray[np.uint8] | None,
+        axes: Axes | None = None,
+        extent: tuple[float, float, float, float] = (0.0, 1.0, 0.0, 1.0),
+    ) -> None:
+        """Set image to paint below figure.
+
+        Args:
+            rgba: RGBA image of shape (h, w, 4) with origin at lower left or None to paint figure only.
+            axes: Axes whose data coordinates the extent is given in.
+            extent: Extent of image as (left, right, bottom, top).
+        """
+
+        # reset?
+        if rgba is None or axes is None:
+            self._image, self._image_buffer, self._image_axes = None, None, None
+            return
+
+        # wrap buffer in QImage without copying, we need to keep a reference to the buffer
+        self._image_buffer = np.ascontiguousarray(rgba)
+        h, w = self._image_buffer.shape[:2]
+        self._image = QtGui.QImage(self._image_buffer.data, w, h, 4 * w, QtGui.QImage.Format.Format_RGBA8888)
+        self._image_axes = axes
+        self._image_extent = extent
+
+    def _qt_rect(self, x0: float, y0: float, x1: float, y1: float) -> QtCore.QRectF:
+        """Convert rectangle in display coordinates to Qt coordinates."""
+        dpr = self.device_pixel_ratio
+        height = self.figure.bbox.height
+        return QtCore.QRectF(x0 / dpr, (height - y1) / dpr, (x1 - x0) / dpr, (y1 - y0) / dpr)
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        """Paint image and figure on top of it."""
+
+        # no image?
+        if self._image is None or self._image_axes is None:
+            FigureCanvasQTAgg.paintEvent(self, event)
+            return
+
+        # same as in FigureCanvasQTAgg
+        self._draw_idle()
+        if not hasattr(self, "renderer"):
+            return
+
+        painter = QtGui.QPainter(self)
+        try:
+            rect = event.rect()
+            painter.fillRect(rect, QtGui.QColor("black"))
+
+            # get target rect for image and clip to axes
+            left, right, bottom, top = self._image_extent
+            (x0, y0), (x1, y1) = self._image_axes.transData.transform([(left, bottom), (right, top)])
+            target = self._qt_rect(x0, y0, x1, y1)
+            painter.save()
+            painter.setClipRect(self._qt_rect(*self._image_axes.get_window_extent().extents))
+
+            # origin is at lower left, so flip vertically
+            painter.translate(0, target.top() + target.bottom())
+            painter.scale(1, -1)
+            painter.drawImage(target, self._image)
+            painter.restore()
+
+            # draw figure from Agg buffer on top
+            width = rect.width() * self.device_pixel_ratio
+            height = rect.height() * self.device_pixel_ratio
+            left, top = self.mouseEventCoords(rect.topLeft())
+            bbox = Bbox(np.array([[left, top - height], [left + width, top]]))
+            buf = memoryview(self.copy_from_bbox(bbox))
+            assert buf.shape is not None
+            overlay = QtGui.QImage(buf, buf.shape[1], buf.shape[0], QtGui.QImage.Format.Format_RGBA8888)
+            overlay.setDevicePixelRatio(self.device_pixel_ratio)
+            painter.drawImage(QtCore.QPoint(rect.left(), rect.top()), overlay)
+
+            self._draw_rect_callback(painter)
+        finally:
+            painter.end()
+
+
+__all__ = ["ImageCanvas"]
@@ -0,0 +1,129 @@
+from __future__ import annotations
+from typing import Any
+import numpy as np
+import numpy.typing as npt
+
+from .cuts import SAMPLE_SIZE, HistogramCuts, _chunks, stratified_sample
+
+
+class ImageStatistics:
+    """Statistics of an image, calculated in a single pass over its data.
+
+    Count, min, max, mean and standard deviation are calculated from all finite pixels, NaNs and infinite values are
+    only counted. The histogram, which is used for percentile cuts and the median estimate, only contains finite
+    pixels > 0. Sample-based cuts use a stratified sample of fixed size.
+    """
+
+    def __init__(self, data: npt.NDArray[Any], histogram: bool = True, sample_size: int = SAMPLE_SIZE):
+        """Calculate statistics for given data.
+
+        Args:
+            data: Image data, may be of any shape.
+            histogram: Whether to build a histogram as well, without it, the median is not available.
+            sample_size: Size of stratified sample of finite pixels, 0 for none.
+        """
+        self.sample = stratified_sample(data, sample_size) if sample_size > 0 else np.empty(0, dtype=data.dtype)
+        flat = data.reshape(-1)
+        is_float = flat.dtype.kind == "f"
+        self.histogram: HistogramCuts | None = None
+
+        # number of finite pixels and their moments, merged over chunks
+        self.count = 0
+        self.nan_count = 0
+        self.inf_count = 0
+        self.min = np.nan
+        self.max = np.nan
+        self.mean = np.nan
+        self.std = np.nan
+        lo, hi, mean, m2 = np.inf, -np.inf, 0.0, 0.0
+
+        # number and range of finite positive pixels for histogram of float data
+        pos_count, pos_lo, pos_hi = 0, np.inf, -np.inf
+
+        # unsigned integers are counted exactly in the histogram, so everything can be derived from it
+        if histogram and flat.dtype.kind == "u":
+            self.histogram = HistogramCuts(flat)
+            counts = self.histogram.exact_counts
+            if counts is not None:
+                self._from_counts(counts, self.histogram.zeros)
+                return
+
+        for chunk in _chunks(flat):
+            # only finite pixels, only copy if there are others
+            values = chunk
+            if is_float:
+                finite = np.isfinite(chunk)
+                n = int(np.count_nonzero(finite))
+                if n < len(chunk):
+                    nans = int(np.count_nonzero(np.isnan(chunk)))
+                    self.nan_count += nans
+                    self.inf_count += len(chunk) - n - nans
+                    values = chunk[finite]
+            n = len(values)
+            if n == 0:
+                continue
+
+            # range and moments in double precision without temporary arrays, combined with previous chunks
+            chunk_lo, chunk_hi = float(np.min(values)), float(np.max(values))
+            lo, hi = min(lo, chunk_lo), max(hi, chunk_hi)
+            chunk_mean = float(np.sum(values, dtype=np.float64)) / n
+            chunk_m2 = max(0.0, float(np.einsum("i,i->", values, values, dtype=np.float64)) - n * chunk_mean**2)
+            total = self.count + n
+            delta = chunk_mean - mean
+            mean += delta * n / total
+            m2 += chunk_m2 + delta**2 * self.count * n / total
+            self.count = total
+
+            # positive pixels, usually all of them
+            if is_float and histogram and chunk_lo > 0:
+                pos_count, pos_lo, pos_hi = pos_count + n, min(pos_lo, chunk_lo), max(pos_hi, chunk_hi)
+            elif is_float and histogram:
+                positive = values > 0
+                pos_count += int(np.count_nonzero(positive))
+                pos_lo = min(pos_lo, float(np.min(values, where=positive, initial=np.inf)))
+                pos_hi = max(pos_hi, float(np.max(values, where=positive, initial=-np.inf)))
+
+        # finish
+        if self.count > 0:
+            self.min, self.max = lo, hi
+            self.mean, self.std = mean, float(np.sqrt(m2 / self.count))
+
+        # histogram of positive pixels
+        if histogram and self.histogram is None:
+            self.histogram = HistogramCuts(flat, (pos_count, pos_lo, pos_hi) if is_float else None)
+
+    def _from_counts(self, counts: npt.NDArray[np.int64], zeros: int) -> None:
+        """Calculate statistics from number of pixels for each value of unsigned integer data."""
+        counts = counts.copy()
+        counts[0] = zeros
+        self.count = int(np.sum(counts))
+        if self.count == 0:
+            return
+        nonzero = np.flatnonzero(counts)
+        self.min, self.max = float(nonzero[0]), float(nonzero[-1])
+        values = np.arange(len(counts), dtype=np.float64)
+        self.mean = float(np.dot(values, counts) / self.count)
+        self.std = float(np.sqrt(np.dot((values - self.mean) ** 2, counts) / self.count))
+
+    @property
+    def median(self) -> float:
+        """Estimate of median of finite pixels > 0 from histogram, NaN if not available."""
+        if self.histogram is None or self.histogram.count == 0:
+            return np.nan
+        return self.histogram.estimate(self.histogram.count // 2)
+
+    def as_dict(self) -> dict[str, float]:
+        """Returns all statistics as dictionary, e.g. for showing them."""
+        return {
+            "count": self.count,
+            "nan_count": self.nan_count,
+            "inf_count": self.inf_count,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "std": self.std,
+            "median": self.median,
+        }
+
+
+__all__ = ["ImageStatistics"]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+from typing import Any
+import numpy as np
+import numpy.typing as npt
+from astropy.io import fits
+
+
+class LazyImage:
+    """Memory-mapped image data that is only ever read in (strided) sections.
+
+    The HDU must have been opened with memmap=True and do_not_scale_image_data=True, otherwise astropy loads and
+    scales the whole image on first access. BSCALE/BZERO/BLANK are applied to each section read instead.
+    """
+
+    def __init__(self, hdu: fits.ImageHDU):
+        """Wrap data of given HDU.
+
+        Args:
+            hdu: HDU opened with memmap=True and do_not_scale_image_data=True.
+        """
+
+        # store raw (memory-mapped) data
+        self._raw: npt.NDArray[Any] = hdu.data
+        if self._raw is None:
+            raise ValueError("HDU contains no data.")
+        self.shape: tuple[int, ...] = self._raw.shape
+
+        # scaling
+        self._bscale = float(hdu.header.get("BSCALE", 1.0))
+        self._bzero = float(hdu.header.get("BZERO", 0.0))
+        self._blank = hdu.header.get("BLANK", None)
+
+        # unsigned integers are stored as signed ones with BZERO=2^(bits-1)
+        raw = self._raw.dtype
+        self._unsigned = (
+            raw.kind == "i" and raw.itemsize > 1 and self._bscale == 1.0 and self._bzero == 2 ** (8 * raw.itemsize - 1)
+        )
+
+        # resulting dtype
+        if self._unsigned:
+            self.dtype = np.dtype(f"u{raw.itemsize}")
+        elif self._bscale == 1.0 and self._bzero == 0.0 and self._blank is None:
+            self.dtype = raw.newbyteorder("=")
+        else:
+            self.dtype = np.dtype(np.float32 if raw.kind in "iu" and raw.itemsize <= 2 else np.float64)
+
+    def __getitem__(self, key: Any) -> npt.NDArray[Any]:
+        """Read a section of the image and apply scaling."""
+        return self._scale(np.asarray(self._raw[key]))
+
+    def _scale(self, raw: npt.NDArray[Any]) -> npt.NDArray[Any]:
+        """Apply BSCALE/BZERO/BLANK to raw data."""
+
+        # unsigned integer, just flip the sign bit
+        if self._unsigned:
+            native = raw.astype(raw.dtype.newbyteorder("="))
+            native ^= np.array(1 << (8 * raw.dtype.itemsize - 1), dtype=self.dtype).view(native.dtype)
+            return native.view(self.dtype)
+
+        # no scaling at all
+        if self.dtype.kind != "f" or raw.dtype.kind == "f" and self._bscale == 1.0 and self._bzero == 0.0:
+            return raw.astype(self.dtype, copy=False)
+
+        # scale to float
+        data = raw.astype(self.dtype)
+        if self._blank is not None and raw.dtype.kind in "iu":
+            data[raw == self._blank] = np.nan
+        if self._bscale != 1.0:
+            data *= self._bscale
+        if self._bzero != 0.0:
+            data += self._bzero
+        return data
+
+    def step_for(self, max_pixels: int, bounds: tuple[int, int, int, int] | None = None) -> int:
+        """Returns the smallest stride that keeps a section below the given number of pixels.
+
+        Args:
+            max_pixels: Maximum number of pixels.
+            bounds: Section as (y0, y1, x0, x1), whole image if None.
+
+        Returns:
+            Stride in both axes.
+        """
+        y0, y1, x0, x1 = bounds if bounds is not None else (0, self.shape[0], 0, self.shape[1])
+        return max(1, int(np.ceil(np.sqrt((y1 - y0) * (x1 - x0) / max_pixels))))
+
+    def sample(self, max_pixels: int, bounds: tuple[int, int, int, int] | None = None) -> npt.NDArray[Any]:
+        """Returns a strided sample of the image for statistics.
+
+        Args:
+            max_pixels: Maximum number of pixels in sample.
+            bounds: Section as (y0, y1, x0, x1) to sample from, whole image if None.
+
+        Returns:
+            Sampled pixels.
+        """
+        y0, y1, x0, x1 = bounds if bounds is not None else (0, self.shape[0], 0, self.shape[1])
+        step = self.step_for(max_pixels, (y0, y1, x0, x1))
+        return self[y0:y1:step, x0:x1:step]
+
+    def tile(self, bounds: tuple[int, int, int, int], step: int = 1) -> npt.NDArray[Any]:
+        """Read a rectangular tile from the image.
+
+        Args:
+            bounds: Tile as (y0, y1, x0, x1).
+            step: Stride in both axes.
+
+        Returns:
+            Tile data.
+        """
+        y0, y1, x0, x1 = bounds
+        return self[y0:y1:step, x0:x1:step]
+
+
+__all__ = ["LazyImage"]
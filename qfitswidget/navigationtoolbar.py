@@ -30,6 +30,20 @@ class NavigationToolbar(NavigationToolbar2QT):  # type: ignore
         ("Clear overlay", "Clear overlay and show image", "image-solid", "clear_overlay"),
     )
 
+    # append region selection, star measurement and line profile after zoom
+    toolitems.insert(
+        [name for name, *_ in toolitems].index("Zoom") + 1,
+        ("Select region", "Select rectangle for region statistics", "region", "select_region"),
+    )
+    toolitems.insert(
+        [name for name, *_ in toolitems].index("Select region") + 1,
+        ("Measure star", "Click near star to measure FWHM and HFD", "crosshairs", "measure_star"),
+    )
+    toolitems.insert(
+        [name for name, *_ in toolitems].index("Measure star") + 1,
+        ("Line profile", "Draw line for intensity profile", "line-profile", "draw_line"),
+    )
+
     def __init__(self, fits_widget: QFitsWidget, *args: Any, **kwargs: Any):
         NavigationToolbar2QT.__init__(self, *args, **kwargs)
         self.fits_widget = fits_widget
@@ -37,6 +51,9 @@ class NavigationToolbar(NavigationToolbar2QT):  # type: ignore
         self.show_overlay = True
         self._actions["clear_overlay"].setCheckable(True)
         self._actions["clear_overlay"].setChecked(not fits_widget.show_overlay)
+        self._actions["select_region"].setCheckable(True)
+        self._actions["measure_star"].setCheckable(True)
+        self._actions["draw_line"].setCheckable(True)
 
     def _icon(self, name: str) -> QtGui.QIcon:
         # check, whether there is a Qt resource with this name
@@ -61,5 +78,41 @@ class NavigationToolbar(NavigationToolbar2QT):  # type: ignore
         self.fits_widget.show_overlay = not self.fits_widget.show_overlay
         self._actions["clear_overlay"].setChecked(not self.fits_widget.show_overlay)
 
+    def pan(self, *args: Any) -> None:
+        self.fits_widget.region_selection = False
+        self.fits_widget.star_measurement = False
+        self.fits_widget.line_drawing = False
+        super().pan(*args)
+
+    def zoom(self, *args: Any) -> None:
+        self.fits_widget.region_selection = False
+        self.fits_widget.star_measurement = False
+        self.fits_widget.line_drawing = False
+        super().zoom(*args)
+
+    def select_region(self, *args: Any) -> None:
+        self.fits_widget.region_selection = not self.fits_widget.region_selection
+
+    def measure_star(self, *args: Any) -> None:
+        self.fits_widget.star_measurement = not self.fits_widget.star_measurement
+
+    def draw_line(self, *args: Any) -> None:
+        self.fits_widget.line_drawing = not self.fits_widget.line_drawing
+
+    def update_modes(self) -> None:
+        """Check buttons for modes of widget and leave pan/zoom mode, if one of them is enabled."""
+        region, star, line = (
+            self.fits_widget.region_selection,
+            self.fits_widget.star_measurement,
+            self.fits_widget.line_drawing,
+        )
+        self._actions["select_region"].setChecked(region)
+        self._actions["measure_star"].setChecked(star)
+        self._actions["draw_line"].setChecked(line)
+        if (region or star or line) and self.mode.name == "PAN":
+            super().pan()
+        elif (region or star or line) and self.mode.name == "ZOOM":
+            super().zoom()
+
 
 __all__ = ["NavigationToolbar"]
@@ -1,5 +1,5 @@
 from typing import Any, Callable, cast, overload
-from matplotlib.colors import Normalize
+from matplotlib.colors import Colormap, Normalize
 import numpy as np
 import numpy.typing as npt
 
@@ -47,6 +47,7 @@ class FuncNorm(Normalize):  # type: ignore
             else:
                 mask |= resdat <= 0
             np.copyto(resdat, 1, where=mask)
+            resdat = self._func(resdat)
             resdat -= self._func(vmin)
             resdat /= self._func(vmax) - self._func(vmin)
             result = np.ma.MaskedArray(resdat, mask=mask, copy=False)  # type: ignore
@@ -55,4 +56,91 @@ class FuncNorm(Normalize):  # type: ignore
         return result
 
 
-__all__ = ["FuncNorm"]
+class LookupTable:
+    """Precomputed normalization (and colormap) for all possible values of 8/16 bit integer images.
+
+    Applying it to an image is a single gather, so changing stretch or cuts only means rebuilding a table with
+    at most 65536 entries instead of normalizing every pixel.
+    """
+
+    def __init__(self, norm: Callable[..., Any], dtype: npt.DTypeLike, cmap: Colormap | None = None):
+        """Build table.
+
+        Args:
+            norm: Normalization to apply, e.g. a FuncNorm.
+            dtype: Integer data type of images to apply table to.
+            cmap: If given, also build table of RGBA values.
+        """
+
+        # check
+        self.dtype = np.dtype(dtype)
+        if not self.supports(self.dtype):
+            raise ValueError("Lookup tables are only supported for 8 and 16 bit integers.")
+
+        # table is indexed by the unsigned view of the data, so get value for each index
+        self._index_dtype = np.dtype(f"u{self.dtype.itemsize}")
+        values = np.arange(2 ** (8 * self.dtype.itemsize)).astype(self._index_dtype).view(self.dtype.newbyteorder("="))
+
+        # normalize, masked values become NaN
+        normed = norm(values)
+        self.values: npt.NDArray[np.float32] = np.ma.filled(np.ma.asarray(normed).astype(np.float32), np.nan)
+        # rounding errors of the normalization may leave values slightly outside 0..1
+        np.clip(self.values, 0, 1, out=self.values)
+
+        # colormap
+        self.rgba: npt.NDArray[np.uint32] | None = None
+        self.set_cmap(cmap)
+
+    def set_cmap(self, cmap: Colormap | None) -> None:
+        """Build table of RGBA values for given colormap, without normalizing again.
+
+        Args:
+            cmap: Colormap to apply or None to remove table.
+        """
+
+        # stored as one uint32 per value, so that a lookup is a single gather of scalars
+        self.rgba = (
+            None
+            if cmap is None
+            else np.ascontiguousarray(cmap(self.values.astype(np.float64), bytes=True)).view(np.uint32)[:, 0]
+        )
+
+    @staticmethod
+    def supports(dtype: npt.DTypeLike) -> bool:
+        """Whether lookup tables can be used for the given data type."""
+        dt = np.dtype(dtype)
+        return dt.kind in "iu" and dt.itemsize <= 2
+
+    def _index(self, data: npt.NDArray[Any]) -> npt.NDArray[Any]:
+        """Returns zero-copy unsigned view on data for indexing the table."""
+        if data.dtype.newbyteorder("=") != self.dtype.newbyteorder("="):
+            raise ValueError("Data type does not match lookup table.")
+        return data.view(self._index_dtype.newbyteorder(data.dtype.byteorder))
+
+    def __call__(self, data: npt.NDArray[Any]) -> npt.NDArray[np.float32]:
+        """Normalize data.
+
+        Args:
+            data: Image data of the table's data type.
+
+        Returns:
+            Normalized data with NaN for masked values.
+        """
+        return cast(npt.NDArray[np.float32], self.values[self._index(data)])
+
+    def to_rgba(self, data: npt.NDArray[Any]) -> npt.NDArray[np.uint8]:
+        """Normalize data and apply colormap.
+
+        Args:
+            data: Image data of the table's data type.
+
+        Returns:
+            RGBA image as uint8 with an additional last axis of length 4.
+        """
+        if self.rgba is None:
+            raise ValueError("No colormap given.")
+        rgba = self.rgba[self._index(data)]
+        return cast(npt.NDArray[np.uint8], rgba.view(np.uint8).reshape(*data.shape, 4))
+
+
+__all__ = ["FuncNorm", "LookupTable"]
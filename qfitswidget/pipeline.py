@@ -0,0 +1,85 @@
+from __future__ import annotations
+import time
+from enum import Enum
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+def same_inputs(a: Any, b: Any) -> bool:
+    """Compare two stage inputs.
+
+    Simple values (numbers, strings, enums, None) are compared by value, tuples and lists element-wise, and
+    everything else, e.g. arrays or results of other stages, by identity.
+
+    Args:
+        a: First input.
+        b: Second input.
+
+    Returns:
+        Whether both inputs are the same.
+    """
+    if a is b:
+        return True
+    if isinstance(a, (tuple, list)) and isinstance(b, (tuple, list)):
+        return type(a) is type(b) and len(a) == len(b) and all(same_inputs(x, y) for x, y in zip(a, b))
+    if isinstance(a, (bool, int, float, str, Enum)) and isinstance(b, (bool, int, float, str, Enum)):
+        return type(a) is type(b) and bool(a == b)
+    return False
+
+
+class Stage(Generic[T]):
+    """A cached stage of the render pipeline, which is only evaluated again when its inputs change.
+
+    If a timer is set, it is called with name of stage and duration in seconds after each evaluation.
+    """
+
+    def __init__(self, name: str, func: Callable[..., T]):
+        """Create new stage.
+
+        Args:
+            name: Name of stage.
+            func: Function to evaluate, called with the inputs of the stage.
+        """
+        self.name = name
+        self.version = 0
+        self.timer: Callable[[str, float], None] | None = None
+        self._func = func
+        self._inputs: tuple[Any, ...] | None = None
+        self._value: T | None = None
+
+    def __call__(self, *inputs: Any, **kwargs: Any) -> T:
+        """Get result of stage, evaluate it only if inputs changed.
+
+        Args:
+            inputs: Inputs of stage, passed to function and compared to those of the last evaluation.
+            kwargs: Passed to function, but not compared, i.e. they never trigger an evaluation.
+
+        Returns:
+            Result of stage.
+        """
+        if self._inputs is None or not same_inputs(self._inputs, inputs):
+            start = time.perf_counter()
+            self.set(self._func(*inputs, **kwargs), *inputs)
+            if self.timer is not None:
+                self.timer(self.name, time.perf_counter() - start)
+        return self._value  # type: ignore
+
+    def set(self, value: T, *inputs: Any) -> None:
+        """Set result of stage for given inputs, e.g. if it has been calculated elsewhere.
+
+        Args:
+            value: Result of stage.
+            inputs: Inputs the result belongs to.
+        """
+        self._value = value
+        self._inputs = inputs
+        self.version += 1
+
+    def invalidate(self) -> None:
+        """Force evaluation on next call."""
+        self._inputs = None
+        self._value = None
+
+
+__all__ = ["Stage", "same_inputs"]
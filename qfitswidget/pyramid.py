@@ -0,0 +1,96 @@
+from __future__ import annotations
+from typing import Any
+import numpy as np
+import numpy.typing as npt
+
+# smallest size of a level, no further levels are created below it
+MIN_LEVEL_SIZE = 64
+
+
+def downsample(data: npt.NDArray[Any]) -> npt.NDArray[Any]:
+    """Downsample image by a factor of two by averaging 2x2 blocks, odd rows/columns are dropped.
+
+    Args:
+        data: Image of shape (h, w) or (h, w, c), may be a masked array.
+
+    Returns:
+        Downsampled image as float32, masked if the image was masked or contained NaNs.
+    """
+    # ignore NaNs (e.g. from lookup tables) like masked pixels
+    if not np.ma.isMaskedArray(data) and data.dtype.kind == "f":
+        data = np.ma.masked_invalid(data, copy=False)
+    h, w = data.shape[0] // 2, data.shape[1] // 2
+    blocks = data[: 2 * h, : 2 * w].reshape(h, 2, w, 2, *data.shape[2:])
+    return blocks.mean(axis=(1, 3), dtype=np.float32)  # type: ignore
+
+
+class ImagePyramid:
+    """Multi-resolution pyramid of a (normalized) image, each level being half the size of the previous one."""
+
+    def __init__(self, data: npt.NDArray[Any], strided: bool = False, offset: tuple[int, int] = (0, 0)):
+        """Build pyramid for given image.
+
+        Args:
+            data: Image of shape (h, w) or (h, w, c), may be a masked array.
+            strided: If True, levels are strided views on the image instead of averages, which costs nothing to
+                build, but aliases.
+            offset: Position (x, y) of first pixel of image in pixel coordinates, e.g. for a trimmed image.
+        """
+        self.offset = offset
+
+        # level 0 is the image itself
+        self.levels: list[npt.NDArray[Any]] = [data]
+
+        # downsample until small enough
+        while min(self.levels[-1].shape[:2]) >= 2 * MIN_LEVEL_SIZE:
+            f = 2 ** len(self.levels)
+            self.levels.append(data[::f, ::f] if strided else downsample(self.levels[-1]))
+
+    def level_for(self, pixels_per_screen_pixel: float) -> int:
+        """Returns the level that best matches the given number of image pixels per screen pixel.
+
+        Args:
+            pixels_per_screen_pixel: Number of (full resolution) image pixels per screen pixel.
+
+        Returns:
+            Level index, 0 being the full resolution image.
+        """
+        if pixels_per_screen_pixel < 2:
+            return 0
+        return min(len(self.levels) - 1, int(np.log2(pixels_per_screen_pixel)))
+
+    def get(
+        self, level: int, view: tuple[float, float, float, float] | None = None, margin: float = 0.5
+    ) -> tuple[npt.NDArray[Any], tuple[float, float, float, float]]:
+        """Returns (a cutout of) the image at given level and its extent in full resolution pixel coordinates.
+
+        Args:
+            level: Level index.
+            view: If given, only return the part visible in the view, given as (x0, x1, y0, y1) in full resolution
+                pixel coordinates.
+            margin: Fraction of the view size added on all sides, so that small pans can still use the cutout.
+
+        Returns:
+            Tuple of image and extent as (left, right, bottom, top).
+        """
+        data = self.levels[level]
+        f = 2**level
+        h, w = data.shape[:2]
+        ox, oy = self.offset
+
+        # cutout
+        if view is not None:
+            x0, x1 = min(view[:2]) - ox, max(view[:2]) - ox
+            y0, y1 = min(view[2:]) - oy, max(view[2:]) - oy
+            mx, my = (x1 - x0) * margin, (y1 - y0) * margin
+            ix0, ix1 = max(0, int((x0 - mx + 0.5) // f)), min(w, int(np.ceil((x1 + mx + 0.5) / f)))
+            iy0, iy1 = max(0, int((y0 - my + 0.5) // f)), min(h, int(np.ceil((y1 + my + 0.5) / f)))
+            if ix1 > ix0 and iy1 > iy0:
+                extent = (ox + ix0 * f - 0.5, ox + ix1 * f - 0.5, oy + iy0 * f - 0.5, oy + iy1 * f - 0.5)
+                return data[iy0:iy1, ix0:ix1], extent
+
+        # whole level
+        return data, (ox - 0.5, ox + w * f - 0.5, oy - 0.5, oy + h * f - 0.5)
+
+
+__all__ = ["ImagePyramid", "downsample"]
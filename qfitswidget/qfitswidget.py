@@ -1,35 +1,80 @@
 from __future__ import annotations
+import contextlib
+import logging
+import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, replace
 from enum import Enum
-from typing import Callable, Any, Protocol
-import cv2  # type: ignore
+from typing import Callable, Any, Iterable, Protocol
 import jinja2
 import numpy as np
 import numpy.typing as npt
-from astropy.coordinates import SkyCoord
+from astropy.coordinates import Angle, SkyCoord
 from astropy.io import fits
 from astropy.wcs import WCS
 import astropy.units as u
 from qtpy import QtCore, QtWidgets, QtGui  # type: ignore
 import matplotlib.pyplot as plt
-from astropy.wcs.utils import pixel_to_skycoord
-from matplotlib import colors
 from matplotlib.artist import Artist
 from matplotlib.backend_bases import MouseButton
+from matplotlib.collections import PathCollection
 from matplotlib.cm import ScalarMappable
-from matplotlib.colors import Normalize
+from matplotlib.colors import Colormap, Normalize
 from matplotlib.image import AxesImage
 from matplotlib.lines import Line2D
-from matplotlib.patches import FancyArrow, Circle
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.patches import FancyArrow, Circle, Rectangle
 from matplotlib.text import Text
 from qfitswidget.qt.fitswidget_ui import Ui_FitsWidget
 from qfitswidget.navigationtoolbar import NavigationToolbar
-from qfitswidget.norm import FuncNorm
+from qfitswidget.norm import LookupTable
+from qfitswidget.imagestatistics import ImageStatistics
+from qfitswidget.regionstatistics import SUMMED_AREA_MAX_VALUES, RegionStatistics, SummedAreaTable, region_statistics
+from qfitswidget.lazy import LazyImage
+from qfitswidget.lineprofile import LineProfile, line_profile
+from qfitswidget.pyramid import ImagePyramid
+from qfitswidget.sources import Sources, detect_sources
+from qfitswidget.starmeasurement import StarMeasurement, measure_star, measure_stars
+from qfitswidget.imagecanvas import ImageCanvas
+from qfitswidget.wcsgrid import WCSGrid
+from qfitswidget.pipeline import Stage
+from qfitswidget.framecache import FrameCache
+from qfitswidget.debayer import Debayer
+from qfitswidget.timing import TimingRecord, TimingSummary
+from qfitswidget.frame import (
+    CUTS_PRESETS,
+    STRETCHES,
+    FrameSettings,
+    PreparedFrame,
+    image_data,
+    bayer_binning,
+    plane_count,
+    position_angle,
+    trimsec_bounds,
+    trimsec,
+    image_extent,
+    cutout,
+    debayer,
+    preset_cuts,
+    create_norm,
+    create_lut,
+    normalize,
+    to_rgba,
+    prepare_frame,
+    prepare_frames,
+    render_frame,
+)
 
 plt.style.use("dark_background")
 
+log = logging.getLogger(__name__)
+
+# maximum number of pixels sampled for cuts in lazy mode
+LAZY_SAMPLE_PIXELS = 2048 * 2048
+
+# maximum number of pixels sampled for cuts of streamed frames
+STREAM_SAMPLE_PIXELS = 512 * 512
+
 
 class CenterMarkStyle(Enum):
     FULL_CROSS = "Cross"
@@ -37,6 +82,24 @@ class CenterMarkStyle(Enum):
     CIRCLE = "Circle"
 
 
+class RenderBackend(Enum):
+    MATPLOTLIB = "matplotlib"
+    QIMAGE = "qimage"
+
+
+@dataclass
+class MouseHoverRequest:
+    x: float
+    y: float
+    data: npt.NDArray[Any] | LazyImage
+    normalize: Callable[[npt.NDArray[Any]], npt.NDArray[np.floating[Any]]]
+    timestamp: float
+    size: int = 21
+    scaled: npt.NDArray[Any] | None = None
+    offset: tuple[int, int] = (0, 0)
+    table: SummedAreaTable | None = None
+
+
 @dataclass
 class ProcessMouseHoverResult:
     x: float
@@ -45,55 +108,304 @@ class ProcessMouseHoverResult:
     mean: float
     maxi: float
     cut: np.ndarray
+    timestamp: float
+    started: float = 0.0
+    processed: float = 0.0
+
+
+def process_mouse_hover(request: MouseHoverRequest) -> ProcessMouseHoverResult:
+    """Get pixel value, area statistics and zoom cutout at mouse position.
+
+    Args:
+        request: Hover request.
+
+    Returns:
+        Result to show.
+    """
+    started = time.perf_counter()
+    data = request.data
+    rgb = len(data.shape) == 3
+
+    # value, if inside image
+    h, w = data.shape[:2]
+    ix, iy = int(np.floor(request.x + 0.5)), int(np.floor(request.y + 0.5))
+    if 0 <= ix < w and 0 <= iy < h:
+        value = data[iy, ix, :] if rgb else np.array([data[iy, ix]])
+    else:
+        value = np.array([])
+
+    # mean / max, only finite pixels, like for image statistics
+    r = request.size // 2
+    x0, x1, y0, y1 = max(0, ix - r), max(0, ix + r + 1), max(0, iy - r), max(0, iy + r + 1)
+    stats = region_statistics(data, x0, x1, y0, y1, request.table)
+    mean, maxi = (stats.mean, stats.max) if stats.count > 0 else (0.0, 0.0)
+
+    # zoom, taken from normalized image, if available, otherwise only the cut is normalized
+    fill = 0.0 if rgb else np.nan
+    if request.scaled is not None:
+        cut_normed = cutout(request.scaled, ix, iy, request.size, request.offset, fill)
+    else:
+        cut_normed = cutout(request.normalize(data[y0:y1, x0:x1]), ix, iy, request.size, (x0, y0), fill)
+
+    return ProcessMouseHoverResult(
+        x=request.x,
+        y=request.y,
+        value=value,
+        mean=mean,
+        maxi=maxi,
+        cut=cut_normed,
+        timestamp=request.timestamp,
+        started=started,
+        processed=time.perf_counter(),
+    )
+
+
+class MouseHoverWorker(QtCore.QObject):  # type: ignore
+    """Persistent worker living in its own thread, processing one hover request at a time."""
 
-
-class ProcessMouseHoverSignals(QtCore.QObject):  # type: ignore
     finished = QtCore.Signal(ProcessMouseHoverResult)
 
+    @QtCore.Slot(object)  # type: ignore
+    def process(self, request: MouseHoverRequest) -> None:
+        self.finished.emit(process_mouse_hover(request))
+
+
+@dataclass
+class MeasureStarRequest:
+    x: float
+    y: float
+    data: npt.NDArray[Any] | LazyImage
+    radius: int = 15
+    model: str = "gaussian"
+
+
+class MeasureStarWorker(QtCore.QObject):  # type: ignore
+    """Worker measuring a star, living in the hover thread."""
+
+    finished = QtCore.Signal(object, object)
+
+    @QtCore.Slot(object)  # type: ignore
+    def process(self, request: MeasureStarRequest) -> None:
+        self.finished.emit(
+            request.data, measure_star(request.data, request.x, request.y, request.radius, request.model)
+        )
+
 
-class ProcessMouseHover(QtCore.QRunnable):  # type: ignore
-    def __init__(self, fits_widget: QFitsWidget):
+class BuildPyramidSignals(QtCore.QObject):  # type: ignore
+    finished = QtCore.Signal(int, object)
+
+
+class BuildPyramid(QtCore.QRunnable):  # type: ignore
+    def __init__(self, generation: int, data: npt.NDArray[Any], offset: tuple[int, int] = (0, 0)):
         QtCore.QRunnable.__init__(self)
-        self.signals = ProcessMouseHoverSignals()
+        self.signals = BuildPyramidSignals()
+        self.generation = generation
+        self.data = data
+        self.offset = offset
+
+    def run(self) -> None:
+        pyramid = ImagePyramid(self.data, offset=self.offset)
+        try:
+            self.signals.finished.emit(self.generation, pyramid)
+        except RuntimeError:
+            # widget has been deleted in the meantime
+            pass
+
+
+class BuildSummedAreaTableSignals(QtCore.QObject):  # type: ignore
+    finished = QtCore.Signal(object, object)
+
+
+class BuildSummedAreaTable(QtCore.QRunnable):  # type: ignore
+    def __init__(self, data: npt.NDArray[Any]):
+        QtCore.QRunnable.__init__(self)
+        self.signals = BuildSummedAreaTableSignals()
+        self.data = data
+
+    def run(self) -> None:
+        table = SummedAreaTable(self.data)
+        try:
+            self.signals.finished.emit(self.data, table)
+        except RuntimeError:
+            # widget has been deleted in the meantime
+            pass
+
+
+class DetectSourcesSignals(QtCore.QObject):  # type: ignore
+    finished = QtCore.Signal(object, object)
+
+
+class DetectSources(QtCore.QRunnable):  # type: ignore
+    def __init__(
+        self,
+        fits_widget: QFitsWidget,
+        data: npt.NDArray[Any],
+        offset: tuple[int, int] = (0, 0),
+        frame: PreparedFrame | None = None,
+    ):
+        QtCore.QRunnable.__init__(self)
+        self.signals = DetectSourcesSignals()
         self.fits_widget = fits_widget
-        self.x = fits_widget.mouse_pos[0]
-        self.y = fits_widget.mouse_pos[1]
-        self.wcs = fits_widget.wcs
-        self.data = fits_widget.data
+        self.data = data
+        self.offset = offset
+        self.frame = frame
+
+    def _cancelled(self) -> bool:
+        # a new frame arrived or sources are not shown anymore
+        return self.data is not self.fits_widget.trimmed_data or not self.fits_widget.sources_visible
 
     def run(self) -> None:
-        if self.data is None:
-            return
+        try:
+            sources = detect_sources(self.data, offset=self.offset, cancelled=self._cancelled)
+            if sources is None:
+                return
+            if self.frame is not None:
+                self.frame.sources = sources
+            self.signals.finished.emit(self.data, sources)
+        except RuntimeError:
+            # widget has been deleted in the meantime
+            pass
 
-        # value
-        iy, ix = int(self.y), int(self.x)
-        value = self.data[iy, ix, :] if len(self.data.shape) == 3 else np.array([self.data[iy, ix]])
 
-        # mean / max
-        if len(self.data.shape) == 2:
-            cut = self.data[iy - 10 : iy + 11, ix - 10 : ix + 11]
-        else:
-            cut = self.data[iy - 10 : iy + 11, ix - 10 : ix + 11, :]
+def _error_message(e: Exception) -> str:
+    """Message for reporting an error while preparing a frame, ValueErrors are expected and have a readable one."""
+    if isinstance(e, ValueError):
+        return str(e)
+    log.exception("Could not prepare frame.")
+    return f"{type(e).__name__}: {e}"
+
+
+class PrepareFrameSignals(QtCore.QObject):  # type: ignore
+    progress = QtCore.Signal(str, int)
+    preview = QtCore.Signal(int, object)
+    finished = QtCore.Signal(int, object)
+    failed = QtCore.Signal(int, str)
+
+
+class PrepareFrame(QtCore.QRunnable):  # type: ignore
+    def __init__(
+        self,
+        fits_widget: QFitsWidget,
+        generation: int,
+        hdu: fits.ImageHDU,
+        settings: FrameSettings,
+        plane: int = 0,
+        progressive: bool = False,
+    ):
+        QtCore.QRunnable.__init__(self)
+        self.signals = PrepareFrameSignals()
+        self.fits_widget = fits_widget
+        self.generation = generation
+        self.hdu = hdu
+        self.settings = settings
+        self.plane = plane
+        self.progressive = progressive
 
-        # calculate and show
+    def _cancelled(self) -> bool:
+        # a newer frame has been requested
+        return self.generation != self.fits_widget.frame_generation
+
+    def _preview(self, frame: PreparedFrame) -> None:
+        self.signals.preview.emit(self.generation, frame)
+
+    def run(self) -> None:
+        # every generation ends with either finished or failed, unless it has been cancelled
+        frame, error = None, None
+        try:
+            frame = prepare_frame(
+                self.hdu,
+                self.settings,
+                self.signals.progress.emit,
+                self._cancelled,
+                plane=self.plane,
+                preview=self._preview if self.progressive else None,
+            )
+        except Exception as e:
+            error = _error_message(e)
         try:
-            if any([d == 0 for d in cut.shape]):
-                raise ValueError
-            mean = np.mean(cut)
-            maxi = np.max(cut)
-        except ValueError:
-            mean, maxi = 0, 0
+            if error is not None:
+                self.signals.failed.emit(self.generation, error)
+            elif frame is not None:
+                self.signals.finished.emit(self.generation, frame)
+        except RuntimeError:
+            # widget has been deleted in the meantime
+            pass
 
-        # zoom
-        cut_normed = self.fits_widget.normalize_data(cut)
 
-        # emit
-        self.signals.finished.emit(
-            ProcessMouseHoverResult(x=self.x, y=self.y, value=value, mean=mean, maxi=maxi, cut=cut_normed)
-        )
+class PrepareBlink(QtCore.QRunnable):  # type: ignore
+    def __init__(
+        self,
+        fits_widget: QFitsWidget,
+        generation: int,
+        hdus: list[fits.ImageHDU],
+        settings: FrameSettings,
+        shared_cuts: bool,
+    ):
+        QtCore.QRunnable.__init__(self)
+        self.signals = PrepareFrameSignals()
+        self.fits_widget = fits_widget
+        self.generation = generation
+        self.hdus = hdus
+        self.settings = settings
+        self.shared_cuts = shared_cuts
 
-        # no idea why, but it's a good idea to sleep a little before we finish
-        time.sleep(0.01)
+    def _cancelled(self) -> bool:
+        # a newer frame has been requested
+        return self.generation != self.fits_widget.frame_generation
+
+    def run(self) -> None:
+        # every generation ends with either finished or failed, unless it has been cancelled
+        result, error = None, None
+        try:
+            frames = prepare_frames(
+                self.hdus, self.settings, self.shared_cuts, self.signals.progress.emit, self._cancelled
+            )
+            if frames is not None and not self._cancelled():
+                result = (frames, [render_frame(frame) for frame in frames])
+        except Exception as e:
+            error = _error_message(e)
+        try:
+            if error is not None:
+                self.signals.failed.emit(self.generation, error)
+            elif result is not None:
+                self.signals.finished.emit(self.generation, result)
+        except RuntimeError:
+            # widget has been deleted in the meantime
+            pass
+
+
+class PrefetchFrameSignals(QtCore.QObject):  # type: ignore
+    finished = QtCore.Signal(object, object)
+
+
+class PrefetchFrame(QtCore.QRunnable):  # type: ignore
+    def __init__(
+        self, fits_widget: QFitsWidget, key: tuple[int, int, int], hdu: fits.ImageHDU, settings: FrameSettings
+    ):
+        QtCore.QRunnable.__init__(self)
+        self.setAutoDelete(False)
+        self.signals = PrefetchFrameSignals()
+        self.fits_widget = fits_widget
+        self.key = key
+        self.hdu = hdu
+        self.settings = settings
+
+    def _cancelled(self) -> bool:
+        # frame is not a neighbour of the current one anymore
+        return self.key not in self.fits_widget._prefetch_keys
+
+    def run(self) -> None:
+        frame = None
+        try:
+            frame = prepare_frame(self.hdu, self.settings, cancelled=self._cancelled, plane=self.key[2])
+        except Exception:
+            # reported, when frame is displayed
+            pass
+        try:
+            self.signals.finished.emit(self.key, frame)
+        except RuntimeError:
+            # widget has been deleted in the meantime
+            pass
 
 
 class MenuEntry:
@@ -128,35 +440,134 @@ class CanNormalize(Protocol):
 class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
     """PyQt Widget for displaying FITS images."""
 
-    """Signal emitted when new cuts have been calculated."""
-    calculatedCuts = QtCore.Signal(int, int)
+    """Signal emitted with low and high cut when new cuts have been calculated from a preset."""
+    calculatedCuts = QtCore.Signal(float, float)
+
+    """Signal emitted with name of stage and progress in percent while a new frame is prepared."""
+    frameProgress = QtCore.Signal(str, int)
+
+    """Signal emitted when a new frame has been displayed."""
+    frameDisplayed = QtCore.Signal()
+
+    """Signal emitted with error message when preparing a new frame failed."""
+    frameFailed = QtCore.Signal(str)
+
+    """Signal emitted with time in seconds from mouse move to blitting the updated hover overlay."""
+    hoverLatency = QtCore.Signal(float)
 
-    def __init__(self, parent: QtWidgets.QWidget | None = None):
-        """Init new widget."""
+    """Signal emitted with sustained frame rate in frames per second after each streamed frame."""
+    frameRate = QtCore.Signal(float)
+
+    """Signal emitted with a TimingRecord after each render and hover cycle, if profiling is enabled."""
+    timingRecorded = QtCore.Signal(object)
+
+    """Signal emitted with Sources when detection in a new frame has finished, if they are shown."""
+    sourcesDetected = QtCore.Signal(object)
+
+    """Signal emitted with RegionStatistics when a region has been selected or its frame changed, None if cleared."""
+    regionSelected = QtCore.Signal(object)
+
+    """Signal emitted with StarMeasurement when a star has been measured, either after a click or for a new frame."""
+    starMeasured = QtCore.Signal(object)
+
+    """Signal emitted with LineProfile when a line has been drawn or dragged or its frame changed, None if cleared."""
+    lineProfileChanged = QtCore.Signal(object)
+
+    """Internal signal for sending hover requests to worker thread."""
+    _hoverRequested = QtCore.Signal(object)
+
+    """Internal signal for sending star measurements to worker thread."""
+    _measureRequested = QtCore.Signal(object)
+
+    """Internal signal for notifying GUI thread about a new streamed frame."""
+    _streamFrameReceived = QtCore.Signal()
+
+    def __init__(
+        self, parent: QtWidgets.QWidget | None = None, render_backend: RenderBackend = RenderBackend.MATPLOTLIB
+    ):
+        """Init new widget.
+
+        Args:
+            parent: Parent widget.
+            render_backend: Backend for rendering the image, either with imshow or directly as QImage.
+        """
         QtWidgets.QWidget.__init__(self, parent)
         self.setupUi(self)  # type: ignore
 
         # store hdu and (scaled) data
         self.hdu: fits.PrimaryHDU | None = None
         self.data: npt.NDArray[np.floating[Any]] | None = None
+        self.lazy_data: LazyImage | None = None
         self.trimmed_data: npt.NDArray[np.floating[Any]] | None = None
-        self.sorted_data: npt.NDArray[np.floating[Any]] | None = None
+        self.statistics: ImageStatistics | None = None
         self.scaled_data: npt.NDArray[np.floating[Any]] | None = None
         self.pixmap = None
         self.cuts = None
-        self.wcs = None
-        self.position_angle = None
-        self.mirrored = None
+        self.wcs: WCS | None = None
+        self.wcs_grid: WCSGrid | None = None
+        self.position_angle: float | None = None
+        self.mirrored: bool | None = None
+        self.binning = 1
         self.mouse_pos = (0.0, 0.0)
-        self.mouse_pos_wcs: SkyCoord | None = None
+        self._mouse_pos_wcs: tuple[WCSGrid, tuple[float, float], SkyCoord | None] | None = None
         self.cmap: str | None = None
         self.norm: Normalize | None = None
+        self.lut: LookupTable | None = None
         self._image_plot: AxesImage | None = None
         self._image_text: Text | None = None
         self._image_cache = None
         self._center_artists: list[Artist] = []
         self._directions_artists: list[Artist] = []
-        self._zoom_artist: Artist | None = None
+        self._zoom_artist: AxesImage | None = None
+        self._data_offset = (0, 0)
+        self._hdu_list: fits.HDUList | None = None
+        self._lazy_view: tuple[float, float, float, float] | None = None
+        self._pyramid: ImagePyramid | None = None
+        self._pyramid_generation = 0
+        self._pyramid_task: BuildPyramid | None = None
+        self._pyramid_level = 0
+        self._pyramid_cutout = False
+        self._image_generation: int | None = None
+        self._image_backend: RenderBackend | None = None
+        self._image_scaled: npt.NDArray[Any] | None = None
+        self._image_preview = False
+        self._preview_generation: int | None = None
+        self._axes_generation = 0
+        self._calculated_cuts: tuple[float, float] | None = None
+
+        # region selection, sums come from summed-area tables, which are built in background for the current frame
+        # once a region has been selected
+        self.region: RegionStatistics | None = None
+        self.summed_area_max_values = SUMMED_AREA_MAX_VALUES
+        self._region_selection = False
+        self._region_bounds: tuple[float, float, float, float] | None = None
+        self._region_dragging = False
+        self._region_artist: Rectangle | None = None
+        self._summed_area: tuple[npt.NDArray[Any], SummedAreaTable] | None = None
+        self._summed_area_task: BuildSummedAreaTable | None = None
+
+        # detected sources, which are also cached with their frame
+        self._sources: tuple[npt.NDArray[Any], Sources] | None = None
+        self._sources_artist: PathCollection | None = None
+        self._sources_task: DetectSources | None = None
+        self._sources_frame: PreparedFrame | None = None
+
+        # star measurement, which is repeated at the same position for new frames
+        self.star: StarMeasurement | None = None
+        self.star_radius = 15
+        self.star_model = "gaussian"
+        self._star_measurement = False
+        self._star_position: tuple[float, float] | None = None
+        self._star_artist: Circle | None = None
+
+        # line profile, sampled on the fly, since it is cheap enough to follow the mouse while dragging
+        self.profile: LineProfile | None = None
+        self._line_drawing = False
+        self._line_bounds: tuple[float, float, float, float] | None = None
+        self._line_dragging = False
+        self._line_artist: Line2D | None = None
+        self._profile_lines: list[Line2D] = []
+        self._profile_text: Text | None = None
 
         # options
         self._show_overlay = True
@@ -168,13 +579,89 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
         self._center_mark_size = 30
         self._directions_visible = True
         self._directions_color = "white"
+        self._sources_visible = False
+        self._sources_color = "lime"
         self._zoom_visible = True
+        self._zoom_size = 21
+        self._zoom_magnification = 5.0
+        self._zoom_interpolation = "nearest"
         self._menu_entries: list[MenuEntry] = []
+        self._render_backend = render_backend
+        self._superpixel = False
+        self.prepare_in_background = True
+        self.progressive = True
+        self.frame_generation = 0
+        self._displayed_generation = 0
+        self._compose_generation = 0
+        self._frame_task: PrepareFrame | None = None
+
+        # live streaming, only the latest frame is shown, if they come in faster than they can be drawn
+        self.stream_cuts_smoothing = 0.5
+        self.frames_dropped = 0
+        self._smoothed_cuts: tuple[int, tuple[float, float]] | None = None
+        self._stream_lock = threading.Lock()
+        self._stream_pending: tuple[npt.NDArray[Any], fits.Header | None] | None = None
+        self._stream_times: deque[float] = deque(maxlen=50)
+        self._stream_debayer = Debayer()
+        self._streamFrameReceived.connect(self._process_stream_frame, QtCore.Qt.ConnectionType.QueuedConnection)
+
+        # navigation through HDUs and planes of cubes, prepared frames are cached and neighbours prefetched
+        self.frame_cache = FrameCache()
+        self.prefetch_count = 2
+        self._hdus: list[fits.ImageHDU] = []
+        self._extensions: list[int] = []
+        self._navigation_id = 0
+        self._frame_key: tuple[int, int, int] | None = None
+        self._displayed_key: tuple[int, int, int] | None = None
+        self._awaiting_prefetch = False
+        self._prefetch_keys: set[tuple[int, int, int]] = set()
+        self._prefetch_tasks: dict[tuple[int, int, int], PrefetchFrame] = {}
+
+        # blink mode, images are rendered once and then only flipped
+        self._blink_hdus: list[fits.ImageHDU] = []
+        self._blink_shared_cuts = True
+        self._blink_interval: float | None = None
+        self._blink_frames: list[PreparedFrame] = []
+        self._blink_images: list[npt.NDArray[np.uint8]] = []
+        self._blink_pyramids: list[ImagePyramid] = []
+        self._blink_plots: list[AxesImage] = []
+        self._blink_colorbars: list[QtGui.QPixmap] = []
+        self._blink_backgrounds: dict[int, tuple[tuple[float, ...], Any]] = {}
+        self._blink_index = 0
+        self._blink_task: PrepareBlink | None = None
+
+        # render pipeline, each stage is only evaluated again when its inputs change
+        self._trim_stage = Stage("trim", self._trim)
+        self._statistics_stage = Stage("statistics", self._statistics)
+        self._cuts_stage = Stage("cuts", self._calculate_cuts)
+        self._section_stage = Stage("section", self._read_section)
+        self._normalization_stage = Stage("normalization", self._create_normalization)
+        self._scale_stage = Stage("scale", self._scale)
+        self._colormap_stage = Stage("colormap", self._colormap)
+        self._compose_stage = Stage("compose", self._compose)
+        self._overlay_stage = Stage("overlay", self._create_overlay)
+
+        # profiling, evaluated stages are added to the timing of the current cycle, if there is one
+        self.timing_summary = TimingSummary()
+        self._profiling = False
+        self._timing: TimingRecord | None = None
+        for stage in (
+            self._trim_stage,
+            self._statistics_stage,
+            self._cuts_stage,
+            self._section_stage,
+            self._normalization_stage,
+            self._scale_stage,
+            self._colormap_stage,
+            self._compose_stage,
+            self._overlay_stage,
+        ):
+            stage.timer = self._stage_timed
 
         # Qt canvas
         self.figure, self.ax = plt.subplots()
         self.ax.axis("off")
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = ImageCanvas(self.figure)
         self.tools = NavigationToolbar(self, self.canvas, self.widgetTools, coordinates=False)
         self.widgetCanvas.layout().addWidget(self.canvas)
         self.widgetTools.layout().addWidget(self.tools)
@@ -182,395 +669,1685 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
         # mouse
         self.canvas.mpl_connect("motion_notify_event", self._mouse_moved)
         self.canvas.mpl_connect("button_press_event", self._mouse_clicked)
+        self.canvas.mpl_connect("button_release_event", self._mouse_released)
         self.canvas.mpl_connect("draw_event", self._draw_handler)
 
+        # keyboard
+        self.canvas.setFocusPolicy(QtCore.Qt.FocusPolicy.StrongFocus)
+        self.canvas.mpl_connect("key_press_event", self._key_pressed)
+
         # zoom
         self.ax_zoom = self.figure.add_axes((0.8, 0.8, 0.15, 0.15))
         self.ax_zoom.set_aspect("equal")
         self.ax_zoom.patch.set_alpha(0.01)
         self.ax_zoom.axis("off")
+        self.canvas.mpl_connect("resize_event", lambda event: self._layout_zoom())
+
+        # line profile, only visible with a line
+        self.ax_profile = self.figure.add_axes((0.05, 0.05, 0.4, 0.2))
+        self.ax_profile.patch.set_facecolor("black")
+        self.ax_profile.patch.set_alpha(0.5)
+        self.ax_profile.axis("off")
+        self.ax_profile.set_visible(False)
 
         # set cuts
-        self.comboCuts.addItems(["100.0%", "99.9%", "99.0%", "95.0%", "Custom"])
+        self.comboCuts.addItems(CUTS_PRESETS + ["Custom"])
         self.comboCuts.setCurrentText("99.9%")
 
         # set stretch functions
-        self.comboStretch.addItems(["linear", "log", "sqrt", "squared", "asinh"])
+        self.comboStretch.addItems(STRETCHES)
         self.comboStretch.setCurrentText("sqrt")
 
         # set colormaps
         self.comboColormap.addItems(sorted([cm for cm in plt.colormaps() if not cm.endswith("_r")]))
         self.comboColormap.setCurrentText("gray")
 
-        # mouse over update thread pool
-        self.mouse_over_thread_pool = QtCore.QThreadPool()
-        self.mouse_over_thread_pool.setMaxThreadCount(1)
+        # mouse over worker, only the latest request is processed, at most hover_max_rate times per second
+        self.hover_max_rate = 60.0
+        self._hover_pending: MouseHoverRequest | None = None
+        self._hover_busy = False
+        self._hover_last_dispatch = 0.0
+        self._hover_latencies: deque[float] = deque(maxlen=100)
+        self._hover_timer = QtCore.QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.timeout.connect(self._dispatch_hover)
+        self._hover_thread = QtCore.QThread()
+        self._hover_worker = MouseHoverWorker()
+        self._hover_worker.moveToThread(self._hover_thread)
+        self._hoverRequested.connect(self._hover_worker.process)
+        self._hover_worker.finished.connect(self._hover_finished)
+        self._star_worker = MeasureStarWorker()
+        self._star_worker.moveToThread(self._hover_thread)
+        self._measureRequested.connect(self._star_worker.process)
+        self._star_worker.finished.connect(self._star_measured)
+        self._hover_thread.start()
+
+        # stop thread when widget or application goes away
+        thread = self._hover_thread
+        self.destroyed.connect(lambda: QFitsWidget._stop_thread(thread))
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(lambda: QFitsWidget._stop_thread(thread))
+
+        # thread pool for preparing frames
+        self.frame_thread_pool = QtCore.QThreadPool()
+        self.frame_thread_pool.setMaxThreadCount(1)
+
+        # pyramid thread pool
+        self.pyramid_thread_pool = QtCore.QThreadPool()
+        self.pyramid_thread_pool.setMaxThreadCount(1)
+
+        # prefetch thread pool
+        self.prefetch_thread_pool = QtCore.QThreadPool()
+        self.prefetch_thread_pool.setMaxThreadCount(1)
+
+        # summed-area table thread pool
+        self.summed_area_thread_pool = QtCore.QThreadPool()
+        self.summed_area_thread_pool.setMaxThreadCount(1)
+
+        # source detection thread pool, tiles are processed in parallel by each task
+        self.sources_thread_pool = QtCore.QThreadPool()
+        self.sources_thread_pool.setMaxThreadCount(1)
+
+        # timer for updating the image after zoom/pan/resize
+        self._view_timer = QtCore.QTimer(self)
+        self._view_timer.setSingleShot(True)
+        self._view_timer.setInterval(100)
+        self._view_timer.timeout.connect(self._update_view)
+
+        # timer for blink mode
+        self._blink_timer = QtCore.QTimer(self)
+        self._blink_timer.timeout.connect(self.blink_next)
+        self.canvas.mpl_connect("resize_event", lambda event: self._view_timer.start())
 
         # signals
-        self.checkTrimSec.stateChanged.connect(self._trim_image)
+        self.checkTrimSec.stateChanged.connect(self._draw_image)
         self.comboStretch.currentTextChanged.connect(self._draw_image)
         self.comboColormap.currentTextChanged.connect(self._draw_image)
         self.checkColormapReverse.toggled.connect(self._draw_image)
         self.comboCuts.currentTextChanged.connect(self._draw_image)
         self.spinLoCut.valueChanged.connect(self._draw_image)
         self.spinHiCut.valueChanged.connect(self._draw_image)
+        self.comboExtension.currentIndexChanged.connect(self._navigation_changed)
+        self.spinPlane.valueChanged.connect(self._navigation_changed)
+        self.widgetNavigation.hide()
 
     def display(self, hdu: fits.PrimaryHDU) -> None:
         """Display image from given HDU.
 
+        If prepare_in_background is set, the frame is prepared in a worker thread and displayed when finished. A new
+        call supersedes any frame still in preparation. Cubes are shown plane by plane, see display_hdus().
+
         Args:
             hdu: HDU to show image from.
         """
 
-        # store HDU and create WCS
-        self.hdu = hdu
-        self.wcs = WCS(hdu.header)
+        # cube?
+        if plane_count(hdu) > 1:
+            self.display_hdus([hdu])
+            return
+
+        # close file from lazy mode and leave navigation and blink mode
+        self._close_file()
+        self._reset_navigation()
+        self._leave_blink()
+        self._prepare(hdu)
+
+    def _prepare(self, hdu: fits.ImageHDU, plane: int = 0) -> None:
+        """Prepare and display frame.
 
-        # check
-        if self.hdu is None or self.wcs is None:
+        Args:
+            hdu: HDU to show image from.
+            plane: Plane to show, if HDU contains a cube.
+        """
+
+        # new frame supersedes all older ones
+        self.frame_generation += 1
+        settings = self._frame_settings()
+
+        # prepare synchronously?
+        if not self.prepare_in_background:
+            frame = prepare_frame(hdu, settings, self.frameProgress.emit, plane=plane)
+            if frame is not None:
+                self._frame_prepared(self.frame_generation, frame)
             return
 
-        # get position angle and check whether image was mirrored
+        # drop frames that haven't started yet and start worker, running one cancels itself
+        self.frame_thread_pool.clear()
+        self._frame_task = PrepareFrame(self, self.frame_generation, hdu, settings, plane, self.progressive)
+        self._frame_task.signals.progress.connect(self._frame_progress)
+        self._frame_task.signals.preview.connect(self._frame_preview)
+        self._frame_task.signals.finished.connect(self._frame_prepared)
+        self._frame_task.signals.failed.connect(self._frame_failed)
+        self.frame_thread_pool.start(self._frame_task)
+
+    def _frame_settings(self) -> FrameSettings:
+        """Returns snapshot of current display settings."""
+        cmap = self.comboColormap.currentText()
+        if self.checkColormapReverse.isChecked():
+            cmap += "_r"
+        return FrameSettings(
+            trimsec=self.checkTrimSec.isChecked(),
+            cuts_preset=self.comboCuts.currentText(),
+            cuts=(self.spinLoCut.value(), self.spinHiCut.value()),
+            stretch=self.comboStretch.currentText(),
+            cmap=cmap,
+            rgba_lut=self._render_backend == RenderBackend.QIMAGE,
+            superpixel=self._superpixel,
+        )
+
+    @QtCore.Slot(str, int)  # type: ignore
+    def _frame_progress(self, stage: str, percent: int) -> None:
+        self.frameProgress.emit(stage, percent)
+
+    @QtCore.Slot(int, str)  # type: ignore
+    def _frame_failed(self, generation: int, message: str) -> None:
+        if generation == self.frame_generation:
+            # generation is finished, even though the previous frame is still shown
+            self._preview_generation = None
+            self._displayed_generation = generation
+            self.frameFailed.emit(message)
+
+            # streamed frame waiting?
+            self._process_stream_frame()
+
+    def _new_axes(self, frame: PreparedFrame) -> bool:
+        """Whether a frame gets new axes, which are kept when stepping through frames of same size."""
+        return (
+            self._frame_key is None
+            or self._displayed_key is None
+            or self._displayed_key[0] != self._frame_key[0]
+            or self.data is None
+            or self.data.shape != frame.data.shape
+        )
+
+    @QtCore.Slot(int, object)  # type: ignore
+    def _frame_preview(self, generation: int, frame: PreparedFrame) -> None:
+        """Show preview of a frame still being prepared on new axes, which are kept for the full frame.
+
+        Args:
+            generation: Generation of frame, outdated previews are ignored.
+            frame: Preview of frame.
+        """
+        if generation != self.frame_generation or not self._new_axes(frame):
+            return
+
+        # ignore pyramids of previous image
+        self._pyramid = None
+        self._pyramid_generation += 1
+
+        # show sample with extent of full image
+        cmap = plt.get_cmap(frame.settings.cmap)
+        if frame.settings.rgba_lut and frame.lut is not None:
+            frame.lut.set_cmap(cmap)
+        extent = image_extent(frame.trimmed_data.shape, frame.offset)
+        sample = frame.trimmed_data[:: frame.step, :: frame.step]
+        if not self._create_image(sample, frame.scaled_data, frame.lut, cmap, extent, self._render_backend):
+            return
+        self._image_generation = generation
+        self._image_backend = self._render_backend
+        self._image_scaled = None
+        self._image_preview = True
+        self._preview_generation = generation
+        self.canvas.draw()
+
+    @QtCore.Slot(int, object)  # type: ignore
+    def _frame_prepared(self, generation: int, frame: PreparedFrame) -> None:
+        """Swap in a prepared frame and render it.
+
+        Args:
+            generation: Generation of frame, outdated frames are ignored.
+            frame: Prepared frame.
+        """
+
+        # outdated?
+        if generation != self.frame_generation:
+            return
+        self._preview_generation = None
+
+        # when stepping through frames of same size, keep axes and view
+        new_axes = self._new_axes(frame)
+        if new_axes:
+            self._compose_generation = generation
+
+        # swap in new frame and cache it, if navigating
+        self._displayed_generation = generation
+        self._displayed_key = self._frame_key
+        self._awaiting_prefetch = False
+        if self._frame_key is not None:
+            self.frame_cache.put(self._frame_key, frame)
+        self.lazy_data = None
+        self.hdu = frame.hdu
+        self.wcs = frame.wcs
+        self.wcs_grid = frame.wcs_grid
+        self.position_angle = frame.position_angle
+        self.mirrored = frame.mirrored
+        self.binning = frame.binning
+        self.data = frame.data
+        self.trimmed_data = frame.trimmed_data
+        self.statistics = frame.statistics
+        self._sources_frame = frame
+
+        # update GUI
+        self._enable_gui(self.data.dtype, len(self.data.shape) == 3 and self.data.shape[2] == 3)
+
+        # feed results into pipeline, so that only stages, whose settings changed in the meantime, are evaluated
+        settings = frame.settings
+        self._trim_stage.set((frame.trimmed_data, frame.offset), frame.data, settings.trimsec)
+        self._statistics_stage.set(frame.statistics, frame.trimmed_data)
+        self._cuts_stage.set(frame.cuts, frame.statistics, *self._cuts_inputs(settings))
+        normalization_inputs = self._normalization_inputs(frame.trimmed_data, frame.cuts, settings.stretch)
+        self._normalization_stage.set((frame.norm, frame.lut), *normalization_inputs)
+        self._scale_stage.set(frame.scaled_data, frame.trimmed_data, frame.norm, frame.lut, settings.rgba_lut)
+
+        # render it, timing starts with stages of preparation, which are only reported the first time it is shown
+        timing, frame.timing = frame.timing, None
+        if self._profiling and timing is not None:
+            self._timing = TimingRecord("render", dict(timing.stages), timing.timestamp)
+        self._draw_image()
+
+        # a selected region, a measured star and a line are kept for frames of same size
+        self._summed_area = None
+        if new_axes:
+            self.clear_region()
+            self.clear_star()
+            self.clear_line()
+        else:
+            self._update_region()
+            self._request_star()
+            self._update_line_profile()
+
+        # finished
+        self.frameDisplayed.emit()
+
+        # prepare neighbours
+        self._prefetch()
+
+        # streamed frame waiting?
+        self._process_stream_frame()
+
+    def update_frame(self, data: npt.NDArray[Any], header: fits.Header | None = None) -> None:
+        """Show next frame of a live stream.
+
+        Frames are supposed to have the same shape, type and WCS as the current one, so the WCS is not evaluated
+        again, the existing image and overlay are updated in place and cuts are calculated on a sample only. If
+        frames come in faster than they can be drawn, only the latest one is shown and the others are dropped. A
+        frame that doesn't match the current one is displayed like a new image.
+
+        Can be called from any thread.
+
+        Args:
+            data: Image data.
+            header: FITS header, if not given, the one from the current frame is used.
+        """
+        with self._stream_lock:
+            notify = self._stream_pending is None
+            if not notify:
+                self.frames_dropped += 1
+            self._stream_pending = (data, header)
+        if notify:
+            self._streamFrameReceived.emit()
+
+    @QtCore.Slot()  # type: ignore
+    def _process_stream_frame(self) -> None:
+        """Show latest streamed frame."""
+
+        # still preparing a new image? then wait for it
+        if self._displayed_generation != self.frame_generation:
+            return
+
+        # get latest frame
+        with self._stream_lock:
+            pending, self._stream_pending = self._stream_pending, None
+        if pending is None:
+            return
+        data, header = pending
+        if header is None and self.hdu is not None:
+            header = self.hdu.header
+        hdu = fits.PrimaryHDU(data, header=header)
+
+        # doesn't match current frame?
         if (
-            "CRPIX1" in self.hdu.header
-            and "CRPIX2" in self.hdu.header
-            and "CTYPE1" in self.hdu.header
-            and self.hdu.header["CTYPE1"]
-            and "CTYPE2" in self.hdu.header
-            and self.hdu.header["CTYPE2"]
+            self.hdu is None
+            or self.hdu.data is None
+            or self.lazy_data is not None
+            or len(self._blink_hdus) > 0
+            or data.shape != self.hdu.data.shape
+            or data.dtype != self.hdu.data.dtype
         ):
-            cx, cy = self.hdu.header["CRPIX1"], self.hdu.header["CRPIX2"]
-            coord = self.wcs.pixel_to_world(cx, cy)
-            coord_up = self.wcs.pixel_to_world(cx, cy + 10)
-            coord_left = self.wcs.pixel_to_world(cx - 10, cy)
-            pa_up = coord.position_angle(coord_up).wrap_at(360 * u.deg)
-            pa_left = coord.position_angle(coord_left).wrap_at(360 * u.deg)
-            self.position_angle = -pa_up.to(u.deg).value
-            self.mirrored = pa_up - pa_left > 0
-
-        # do we have a bayer matrix given?
-        if "BAYERPAT" in self.hdu.header or "COLORTYP" in self.hdu.header:
-            # check layers
-            if len(self.hdu.data.shape) != 2:
-                raise ValueError("Invalid data format.")
-
-            # got a bayer pattern
-            pattern = self.hdu.header["BAYERPAT" if "BAYERPAT" in self.hdu.header else "COLORTYP"]
-
-            # debayer iamge
-            self.data = self._debayer(self.hdu.data, pattern)
+            self.display(hdu)
+            return
+
+        # swap data and render it, Bayer images are debayered into reused buffers
+        self._start_timing("stream")
+        self.hdu = hdu
+        self._summed_area = None
+        self._sources_frame = None
+        with self._measure("debayer"):
+            self.data = image_data(hdu, self._superpixel, self._stream_debayer)
+        self._run_pipeline(streaming=True)
+        self._update_region(streaming=True)
+        self._request_star()
+        self._update_line_profile()
+        self.frameDisplayed.emit()
+
+        # frame rate
+        self._stream_times.append(time.perf_counter())
+        frame_rate = self.frame_rate
+        if frame_rate is not None:
+            self.frameRate.emit(frame_rate)
+
+    @property
+    def frame_rate(self) -> float | None:
+        """Sustained frame rate in frames per second over the last streamed frames."""
+        if len(self._stream_times) < 2 or self._stream_times[-1] == self._stream_times[0]:
+            return None
+        return (len(self._stream_times) - 1) / (self._stream_times[-1] - self._stream_times[0])
+
+    def display_file(self, filename: str, ext: int | str = 0, lazy: bool = True) -> None:
+        """Display image from given FITS file.
+
+        In lazy mode, the file is kept memory-mapped and only the sections required for the current view and
+        for the cut statistics are read, so memory usage scales with the screen size instead of the image size.
+
+        Args:
+            filename: Name of FITS file.
+            ext: Extension to show.
+            lazy: Whether to load data lazily, only possible for 2D image HDUs without Bayer pattern.
+        """
+
+        # try lazy mode first
+        if lazy:
+            hdu_list = fits.open(filename, memmap=True, do_not_scale_image_data=True)
+            hdu = hdu_list[ext]
+            if (
+                hdu.is_image
+                and hdu.header.get("NAXIS") == 2
+                and "BAYERPAT" not in hdu.header
+                and "COLORTYP" not in hdu.header
+            ):
+                self._display_lazy(hdu_list, hdu)
+                return
+            hdu_list.close()
+
+        # open file, data is read when needed, so keep it open for navigating through HDUs and planes
+        hdu_list = fits.open(filename, memmap=False)
+        self.display_hdus(hdu_list, hdu_list.index_of(ext))
+        self._hdu_list = hdu_list
+
+    def display_hdus(self, hdus: fits.HDUList | list[fits.ImageHDU], ext: int | None = None, plane: int = 0) -> None:
+        """Display images from a list of HDUs, e.g. a multi-extension file, and allow navigating through them.
+
+        Each plane of each image HDU can be selected in the GUI or via show_frame(). Prepared frames are kept in
+        frame_cache and the prefetch_count neighbouring planes (or HDUs, if there is only a single plane) in both
+        directions are prepared in background, so stepping through them is fast.
+
+        Args:
+            hdus: HDUs to show, only those containing images can be selected.
+            ext: Index of HDU to show first, if it contains no image, the first one that does is shown.
+            plane: Plane to show first.
+        """
+
+        # find images
+        extensions = [i for i, hdu in enumerate(hdus) if hdu.is_image and plane_count(hdu) > 0]
+        if len(extensions) == 0:
+            raise ValueError("No image data found.")
+
+        # close file from lazy mode, leave blink mode and start new navigation
+        self._close_file()
+        self._reset_navigation()
+        self._leave_blink()
+        self._hdus = list(hdus)
+        self._extensions = extensions
+
+        # fill GUI
+        self.comboExtension.blockSignals(True)
+        for i in extensions:
+            name = self._hdus[i].name
+            self.comboExtension.addItem(f"{i}: {name}" if name else str(i), i)
+        self.comboExtension.blockSignals(False)
+
+        # show first frame
+        self.show_frame(ext if ext in extensions else extensions[0], plane)
+
+    def show_frame(self, ext: int, plane: int = 0) -> None:
+        """Show image from HDUs given to display_hdus(), taken from cache, if possible.
+
+        Args:
+            ext: Index of HDU.
+            plane: Index of plane in HDU.
+        """
+        if ext not in self._extensions or not 0 <= plane < plane_count(self._hdus[ext]):
+            raise IndexError("No such image plane.")
+
+        # update GUI
+        key = (self._navigation_id, ext, plane)
+        self._frame_key = key
+        self._awaiting_prefetch = False
+        self._update_navigation_gui()
+
+        # cached?
+        frame = self.frame_cache.get(key)
+        if frame is not None:
+            self.frame_generation += 1
+            self._frame_prepared(self.frame_generation, frame)
+            return
+
+        # being prefetched? then wait for it, if it has already started, otherwise prepare it right now
+        task = self._prefetch_tasks.get(key)
+        if task is not None and key in self._prefetch_keys:
+            if not self.prefetch_thread_pool.tryTake(task):
+                self.frame_generation += 1
+                self._awaiting_prefetch = True
+                return
+            del self._prefetch_tasks[key]
+        self._prepare(self._hdus[ext], plane)
+
+    @property
+    def frame_index(self) -> tuple[int, int] | None:
+        """Index of HDU and plane of current frame, if navigating through HDUs/planes."""
+        return None if self._frame_key is None else self._frame_key[1:]
+
+    def _display_lazy(self, hdu_list: fits.HDUList, hdu: fits.ImageHDU) -> None:
+        """Display memory-mapped HDU lazily.
+
+        Args:
+            hdu_list: Opened file, closed when the next image is displayed.
+            hdu: HDU to show image from.
+        """
+
+        # close old file and store new one, supersedes all frames in preparation
+        self._close_file()
+        self._reset_navigation()
+        self._leave_blink()
+        self._hdu_list = hdu_list
+        self.frame_generation += 1
+        self._displayed_generation = self.frame_generation
+        self._compose_generation = self.frame_generation
+
+        # store HDU, wrap data and create WCS
+        self.hdu = hdu
+        self.binning = 1
+        self.lazy_data = LazyImage(hdu)
+        self._init_wcs()
+        self.data = None
+        self._lazy_view = None
+
+        # update GUI and draw image
+        self._enable_gui(self.lazy_data.dtype, False)
+        self._draw_image()
+
+    def blink(self, hdus: list[fits.ImageHDU], interval: float | None = 0.5, shared_cuts: bool = True) -> None:
+        """Compare images by flipping between them.
+
+        Each image is prepared and rendered only once, a flip just shows the cached rendering. All images share the
+        same axes, so pan and zoom stay in sync. Besides flipping every blink_interval seconds, space or the right
+        arrow key show the next image and the left arrow key the previous one. Displaying another image ends blink
+        mode.
+
+        Args:
+            hdus: HDUs to compare.
+            interval: Time in seconds between flips or None to only flip on key press or via blink_next().
+            shared_cuts: Whether to use the same cuts for all images, calculated from all of them, or own ones.
+        """
+        if len(hdus) == 0:
+            raise ValueError("No images given.")
+
+        # close file from lazy mode, leave navigation and start blinking
+        self._close_file()
+        self._reset_navigation()
+        self._leave_blink()
+        self._blink_hdus = list(hdus)
+        self._blink_shared_cuts = shared_cuts
+        self._prepare_blink()
+        self.blink_interval = interval
+
+    def stop_blink(self) -> None:
+        """End blink mode and display current image."""
+        if len(self._blink_hdus) > 0:
+            self.display(self._blink_hdus[self._blink_index])
+
+    def blink_next(self, step: int = 1) -> None:
+        """Show next image in blink mode.
+
+        Args:
+            step: Number of images to step forward, negative to go back.
+        """
+        if len(self._blink_frames) > 0:
+            self._show_blink((self._blink_index + step) % len(self._blink_frames))
+
+    @property
+    def blink_index(self) -> int | None:
+        """Index of image currently shown in blink mode."""
+        return self._blink_index if len(self._blink_frames) > 0 else None
+
+    @property
+    def blink_interval(self) -> float | None:
+        """Time in seconds between flips in blink mode, None for flipping manually."""
+        return self._blink_interval
+
+    @blink_interval.setter
+    def blink_interval(self, interval: float | None) -> None:
+        self._blink_interval = interval
+        if interval and len(self._blink_hdus) > 0:
+            self._blink_timer.start(int(interval * 1000))
+        else:
+            self._blink_timer.stop()
+
+    def _leave_blink(self) -> None:
+        """Stop flipping and drop all renderings."""
+        self._blink_timer.stop()
+        self._blink_hdus, self._blink_frames, self._blink_images = [], [], []
+        self._blink_pyramids, self._blink_plots, self._blink_colorbars, self._blink_backgrounds = [], [], [], {}
+        self._blink_index = 0
+
+    def _prepare_blink(self) -> None:
+        """Prepare and render all images for blink mode, supersedes all frames in preparation."""
+        self.frame_generation += 1
+        settings = replace(self._frame_settings(), rgba_lut=True)
+
+        # prepare synchronously?
+        if not self.prepare_in_background:
+            frames = prepare_frames(self._blink_hdus, settings, self._blink_shared_cuts, self.frameProgress.emit)
+            if frames is not None:
+                self._blink_prepared(self.frame_generation, (frames, [render_frame(frame) for frame in frames]))
+            return
+
+        # drop frames that haven't started yet and start worker, running one cancels itself
+        self.frame_thread_pool.clear()
+        self._blink_task = PrepareBlink(
+            self, self.frame_generation, self._blink_hdus, settings, self._blink_shared_cuts
+        )
+        self._blink_task.signals.progress.connect(self._frame_progress)
+        self._blink_task.signals.finished.connect(self._blink_prepared)
+        self._blink_task.signals.failed.connect(self._frame_failed)
+        self.frame_thread_pool.start(self._blink_task)
+
+    @QtCore.Slot(int, object)  # type: ignore
+    def _blink_prepared(self, generation: int, result: tuple[list[PreparedFrame], list[npt.NDArray[np.uint8]]]) -> None:
+        """Set up axes for blink mode and show current image.
+
+        Args:
+            generation: Generation of frames, outdated ones are ignored.
+            result: Prepared frames and their renderings.
+        """
+
+        # outdated?
+        if generation != self.frame_generation:
+            return
+        self._displayed_generation = generation
+        self.lazy_data = None
+
+        # store renderings, for matplotlib with strided pyramids, each shown in its own artist
+        frames, images = result
+        qimage = self._render_backend == RenderBackend.QIMAGE
+        rendered_before = len(self._blink_frames) > 0
+        cmap = plt.get_cmap(frames[0].settings.cmap)
+        self._blink_frames, self._blink_images = frames, images
+        self._blink_pyramids = (
+            [] if qimage else [ImagePyramid(image, strided=True, offset=f.offset) for f, image in zip(frames, images)]
+        )
+        self._blink_colorbars = [self._colorbar(frame.norm, cmap) for frame in frames]
+        self._blink_backgrounds = {}
+        self._blink_index %= len(frames)
+
+        # ignore pyramids still being built
+        self._pyramid = None
+        self._pyramid_generation += 1
+
+        # new axes, keep view, if images are only rendered again, e.g. after settings changed
+        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+        self._clear_axes()
+        extent = image_extent(images[0].shape, frames[0].offset)
+        if qimage:
+            self.ax.set_xlim(*extent[:2])
+            self.ax.set_ylim(*extent[2:])
+            self.ax.set_aspect("equal")
+        else:
+            # start with smallest level, the one matching the view is set when shown
+            with plt.style.context("dark_background"):
+                self._blink_plots = [
+                    self.ax.imshow(
+                        pyramid.levels[-1],
+                        interpolation="nearest",
+                        origin="lower",
+                        extent=image_extent(image.shape, frame.offset),
+                        visible=False,
+                    )
+                    for frame, image, pyramid in zip(frames, images, self._blink_pyramids)
+                ]
+        self._setup_axes(qimage)
+        if rendered_before:
+            self.ax.set_xlim(*xlim)
+            self.ax.set_ylim(*ylim)
+        self._image_backend = self._render_backend
+
+        # update GUI and show image
+        data = frames[0].data
+        self._enable_gui(data.dtype, len(data.shape) == 3 and data.shape[2] == 3)
+        self._show_blink(self._blink_index, draw=True)
+        self.frameDisplayed.emit()
+
+        # streamed frame waiting?
+        self._process_stream_frame()
+
+    def _show_blink(self, index: int, draw: bool = False) -> None:
+        """Show rendering of image in blink mode, if possible only by blitting.
+
+        Args:
+            index: Index of image.
+            draw: Whether to draw the whole figure anyway.
+        """
+
+        # swap in frame, so that hover and overlay refer to it
+        frame, image = self._blink_frames[index], self._blink_images[index]
+        self._blink_index = index
+        self.hdu = frame.hdu
+        self.wcs, self.wcs_grid = frame.wcs, frame.wcs_grid
+        self.position_angle, self.mirrored, self.binning = frame.position_angle, frame.mirrored, frame.binning
+        self.data, self.trimmed_data, self.statistics = frame.data, frame.trimmed_data, frame.statistics
+        self.norm, self.lut, self.scaled_data = frame.norm, frame.lut, frame.scaled_data
+        self._data_offset = frame.offset
+        self.cmap = frame.settings.cmap
+        self.labelColorbar.setPixmap(self._blink_colorbars[index])
+        self._show_cuts(frame.settings.cuts_preset, frame.cuts)
+        overlay = self._update_overlay()
+
+        # QImage is painted below figure, which doesn't change
+        if self._render_backend == RenderBackend.QIMAGE:
+            self.canvas.set_image(image, self.ax, image_extent(image.shape, frame.offset))
+            if draw:
+                self.canvas.draw()
+            elif overlay:
+                self._blit_overlay()
+            else:
+                self.canvas.update()
+            return
+
+        # show artist of image
+        for i, plot in enumerate(self._blink_plots):
+            plot.set_visible(i == index)
+        self._image_plot = self._blink_plots[index]
+        self._pyramid = self._blink_pyramids[index]
+
+        # rendered for current view before? then its artist is up to date as well
+        background = self._blink_backgrounds.get(index)
+        if not draw and background is not None and background[0] == self._blink_view():
+            self._image_cache = background[1]
+            self._blit_overlay()
+            return
+
+        # show pyramid level for current view, figure is cached in draw handler
+        self._pyramid_cutout = False
+        self._update_pyramid_level()
+
+    def _blink_view(self) -> tuple[float, ...]:
+        """Current view and canvas size, renderings in blink mode are only valid for these."""
+        return (*self.ax.get_xlim(), *self.ax.get_ylim(), *self.figure.bbox.bounds)
+
+    def _key_pressed(self, event: Any) -> None:
+        """Flip images in blink mode."""
+        if event.key in (" ", "right"):
+            self.blink_next()
+        elif event.key == "left":
+            self.blink_next(-1)
+
+    def _close_file(self) -> None:
+        """Close file opened in lazy mode."""
+        self.lazy_data = None
+        if self._hdu_list is not None:
+            self._hdu_list.close()
+            self._hdu_list = None
+
+    def _reset_navigation(self) -> None:
+        """Leave navigation through HDUs/planes, drop cached frames and cancel prefetching."""
+        self._hdus, self._extensions = [], []
+        self._navigation_id += 1
+        self._frame_key, self._displayed_key = None, None
+        self._awaiting_prefetch = False
+        self._prefetch_keys = set()
+        self.frame_cache.clear()
+        self.comboExtension.blockSignals(True)
+        self.comboExtension.clear()
+        self.comboExtension.blockSignals(False)
+        self.widgetNavigation.hide()
+
+    def _update_navigation_gui(self) -> None:
+        """Show current HDU and plane in GUI."""
+        if self._frame_key is None:
+            return
+        _, ext, plane = self._frame_key
+        count = plane_count(self._hdus[ext])
+
+        # disable signals and set values
+        self.comboExtension.blockSignals(True)
+        self.spinPlane.blockSignals(True)
+        self.comboExtension.setCurrentIndex(self.comboExtension.findData(ext))
+        self.spinPlane.setRange(0, count - 1)
+        self.spinPlane.setValue(plane)
+        self.spinPlane.setSuffix(f" / {count}")
+        self.comboExtension.blockSignals(False)
+        self.spinPlane.blockSignals(False)
+
+        # only show what can be changed
+        self.labelExtension.setVisible(len(self._extensions) > 1)
+        self.comboExtension.setVisible(len(self._extensions) > 1)
+        self.labelPlane.setVisible(count > 1)
+        self.spinPlane.setVisible(count > 1)
+        self.widgetNavigation.setVisible(len(self._extensions) > 1 or count > 1)
+
+    @QtCore.Slot(int)  # type: ignore
+    def _navigation_changed(self) -> None:
+        """Show HDU and plane selected in GUI."""
+        ext = self.comboExtension.currentData()
+        if ext is None:
+            return
+        self.show_frame(ext, min(self.spinPlane.value(), plane_count(self._hdus[ext]) - 1))
+
+    def _neighbours(self, ext: int, plane: int) -> list[tuple[int, int, int]]:
+        """Keys of neighbouring frames, closest first.
+
+        Args:
+            ext: Index of HDU.
+            plane: Index of plane.
+
+        Returns:
+            Keys of neighbouring planes of a cube or neighbouring HDUs otherwise.
+        """
+        count = plane_count(self._hdus[ext])
+        index = self._extensions.index(ext)
+        keys = []
+        for distance in range(1, self.prefetch_count + 1):
+            for step in (distance, -distance):
+                if count > 1 and 0 <= plane + step < count:
+                    keys.append((self._navigation_id, ext, plane + step))
+                elif count == 1 and 0 <= index + step < len(self._extensions):
+                    keys.append((self._navigation_id, self._extensions[index + step], 0))
+        return keys
+
+    def _prefetch(self) -> None:
+        """Prepare neighbours of current frame in background, tasks for other frames cancel themselves."""
+        if self._frame_key is None:
+            return
+        keys = [key for key in self._neighbours(*self._frame_key[1:]) if key not in self.frame_cache]
+        self._prefetch_keys = set(keys)
+        settings = self._frame_settings()
+        for key in keys:
+            if key not in self._prefetch_tasks:
+                task = PrefetchFrame(self, key, self._hdus[key[1]], settings)
+                task.signals.finished.connect(self._frame_prefetched)
+                self._prefetch_tasks[key] = task
+                self.prefetch_thread_pool.start(task)
+
+    @QtCore.Slot(object, object)  # type: ignore
+    def _frame_prefetched(self, key: tuple[int, int, int], frame: PreparedFrame | None) -> None:
+        """Store prefetched frame in cache and show it, if it is the one we are waiting for.
+
+        Args:
+            key: Key of frame.
+            frame: Prepared frame or None, if cancelled or failed.
+        """
+        self._prefetch_tasks.pop(key, None)
+        waiting = self._awaiting_prefetch and key == self._frame_key
+
+        # cancelled, failed or debayered differently? then prepare it again, if we are waiting for it
+        if frame is None or frame.settings.superpixel != self._superpixel:
+            if waiting:
+                self._prepare(self._hdus[key[1]], key[2])
+            return
+
+        # store and show it
+        if key[0] == self._navigation_id:
+            self.frame_cache.put(key, frame)
+        if waiting:
+            self._frame_prepared(self.frame_generation, frame)
+
+    def _init_wcs(self) -> None:
+        """Create WCS from current HDU and get position angle."""
+        if self.hdu is None:
+            return
+        self.wcs = WCS(self.hdu.header, naxis=2)
+        self.wcs_grid = WCSGrid(self.wcs, self.lazy_data.shape if self.lazy_data is not None else self.hdu.data.shape)
+        self.position_angle, self.mirrored = position_angle(self.hdu.header, self.wcs)
+
+    def _enable_gui(self, dtype: np.dtype[Any], is_color: bool) -> None:
+        """Enable GUI elements for new image.
+
+        Args:
+            dtype: Data type of image.
+            is_color: Whether it's a colour image.
+        """
+
+        # for INT8 images, we don't need cuts
+        is_int8 = dtype == np.uint8
+
+        # enable GUI elements, only important for first image after start
+        self.labelCuts.setEnabled(not is_int8)
+        self.comboCuts.setEnabled(not is_int8)
+        self.spinLoCut.setEnabled(not is_int8)
+        self.spinHiCut.setEnabled(not is_int8)
+        self.labelStretch.setEnabled(not is_int8)
+        self.comboStretch.setEnabled(not is_int8)
+        self.labelColormap.setEnabled(not is_color)
+        self.comboColormap.setEnabled(not is_color)
+        self.checkColormapReverse.setEnabled(not is_color)
+        self.checkTrimSec.setEnabled(True)
+
+    def _draw_handler(self, draw_event: Any) -> None:
+        # cache image without overlay, then draw overlay on top
+        self._image_cache = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_overlay()
+
+        # in blink mode, keep rendering of each image
+        if len(self._blink_frames) > 0:
+            self._blink_backgrounds[self._blink_index] = (self._blink_view(), self._image_cache)
+
+    @QtCore.Slot(str)  # type: ignore
+    @QtCore.Slot(int)  # type: ignore
+    @QtCore.Slot(float)  # type: ignore
+    def _draw_image(self) -> None:
+        if len(self._blink_hdus) > 0:
+            # settings changed, so render all images again
+            self._prepare_blink()
+        else:
+            self._run_pipeline()
+
+    def _run_pipeline(self, streaming: bool = False) -> None:
+        """Run render pipeline, only stages whose inputs changed are evaluated again.
+
+        Args:
+            streaming: Whether data has been replaced by a new frame of a live stream.
+        """
+        source = self.lazy_data if self.lazy_data is not None else self.data
+        if source is None:
+            return
+        settings = self._frame_settings()
+        self._start_timing("stream" if streaming else "render")
+
+        # trim and statistics, in lazy mode and for streams only for a sample, whose size only matters for new data
+        trimmed, offset = self._trim_stage(source, settings.trimsec)
+        self.trimmed_data = trimmed if self.lazy_data is None else None
+        self._data_offset = offset
+        self.statistics = self._statistics_stage(trimmed, max_pixels=STREAM_SAMPLE_PIXELS if streaming else None)
+
+        # cuts, for streams smoothed over time, which are kept as long as the calculated ones don't change
+        cuts = self._cuts_stage(self.statistics, *self._cuts_inputs(settings), fallback=settings.cuts)
+        if streaming and settings.cuts_preset != "Custom" and self.norm is not None:
+            a = self.stream_cuts_smoothing
+            cuts = (a * self.norm.vmin + (1 - a) * cuts[0], a * self.norm.vmax + (1 - a) * cuts[1])
+            self._smoothed_cuts = (self._cuts_stage.version, cuts)
+        elif self._smoothed_cuts is not None and self._smoothed_cuts[0] == self._cuts_stage.version:
+            cuts = self._smoothed_cuts[1]
+        self._show_cuts(settings.cuts_preset, cuts)
+
+        # data to display, in lazy mode only a section of the current view
+        if self.lazy_data is not None:
+            size = (self.figure.bbox.width, self.figure.bbox.height)
+            data, extent = self._section_stage(self.lazy_data, self._lazy_view, settings.trimsec, size)
+        else:
+            data, extent = trimmed, image_extent(trimmed.shape, offset)
+
+        # normalize
+        self.norm, self.lut = self._normalization_stage(*self._normalization_inputs(data, cuts, settings.stretch))
+        self.scaled_data = self._scale_stage(data, self.norm, self.lut, settings.rgba_lut)
+
+        # colormap
+        self.cmap = settings.cmap
+        cmap = self._colormap_stage(self.norm, self.lut, settings.cmap, settings.rgba_lut)
+
+        # compose image and create overlay
+        composed = self._compose_stage.version
+        rebuilt = self._compose_stage(
+            self._compose_generation,
+            data,
+            extent,
+            self.scaled_data,
+            self.lut,
+            cmap,
+            self._render_backend,
+            streaming=streaming,
+        )
+        overlay = self._update_overlay()
+
+        # draw figure only if necessary
+        if self._compose_stage.version != composed:
+            with self._measure("draw"):
+                if rebuilt or overlay or self._render_backend == RenderBackend.MATPLOTLIB:
+                    self.canvas.draw()
+                else:
+                    # figure didn't change, just paint new image below it
+                    self.canvas.update()
+        elif overlay:
+            with self._measure("blit"):
+                self._blit_overlay()
+        self._finish_timing()
+
+        # detect sources in new data
+        self._detect_sources()
+
+    def _start_timing(self, kind: str) -> None:
+        """Start timing of a new cycle, if profiling and not started already."""
+        if self._profiling and self._timing is None:
+            self._timing = TimingRecord(kind)
+
+    def _measure(self, stage: str) -> contextlib.AbstractContextManager[None]:
+        """Context manager adding the time spent in it to given stage of current cycle, if there is one."""
+        return contextlib.nullcontext() if self._timing is None else self._timing.measure(stage)
+
+    def _stage_timed(self, stage: str, seconds: float) -> None:
+        """Called with duration of each evaluated pipeline stage."""
+        if self._timing is not None:
+            self._timing.add(stage, seconds)
+
+    def _finish_timing(self) -> None:
+        """Finish timing of current cycle and report it."""
+        timing, self._timing = self._timing, None
+        if timing is not None:
+            self._record_timing(timing)
+
+    def _record_timing(self, timing: TimingRecord) -> None:
+        """Add timing to summary and emit it."""
+        self.timing_summary.add(timing)
+        self.timingRecorded.emit(timing)
+
+    @staticmethod
+    def _cuts_inputs(settings: FrameSettings) -> tuple[str, tuple[float, float] | None]:
+        """Inputs for cuts stage, custom cuts only matter if no preset is used."""
+        return settings.cuts_preset, settings.cuts if settings.cuts_preset == "Custom" else None
+
+    @staticmethod
+    def _normalization_inputs(
+        data: npt.NDArray[Any], cuts: tuple[float, float], stretch: str
+    ) -> tuple[float, float, str, str, int]:
+        """Inputs for normalization stage, which only depends on type and dimensions of data."""
+        return cuts[0], cuts[1], stretch, data.dtype.str, len(data.shape)
+
+    @staticmethod
+    def _statistics(data: npt.NDArray[Any], max_pixels: int | None = None) -> ImageStatistics:
+        """Statistics stage: calculate statistics and histogram for cuts.
+
+        Args:
+            data: Data to calculate statistics for.
+            max_pixels: If given, only use a strided sample with at most this number of pixels.
+
+        Returns:
+            Statistics.
+        """
+        if max_pixels is not None:
+            step = max(1, int(np.ceil(np.sqrt(data.shape[0] * data.shape[1] / max_pixels))))
+            data = data[::step, ::step]
+        return ImageStatistics(data)
+
+    def _trim(self, data: npt.NDArray[Any] | LazyImage, trim: bool) -> tuple[npt.NDArray[Any], tuple[int, int]]:
+        """Trim stage: restrict image to its science region, if requested.
+
+        Args:
+            data: Image data or lazy image, for which only a sample is returned for statistics.
+            trim: Whether to trim image.
+
+        Returns:
+            Tuple of view on trimmed data and its offset (x, y) in image.
+        """
+        if isinstance(data, LazyImage):
+            bounds = trimsec_bounds(self.hdu.header) if trim and self.hdu is not None else None
+            return data.sample(LAZY_SAMPLE_PIXELS, bounds), (0, 0)
+        return self._trimsec(self.hdu, data) if trim and self.hdu is not None else (data, (0, 0))
+
+    def _calculate_cuts(
+        self,
+        statistics: ImageStatistics,
+        preset: str,
+        custom: tuple[float, float] | None,
+        fallback: tuple[float, float] = (0.0, 1.0),
+    ) -> tuple[float, float]:
+        """Cuts stage: evaluate preset or use custom cuts.
+
+        Args:
+            statistics: Statistics of image.
+            preset: Name of preset.
+            custom: Custom cuts, only given for "Custom" preset.
+            fallback: Cuts to use, if preset cannot be evaluated.
+
+        Returns:
+            Low and high cut.
+        """
+        if custom is not None:
+            return custom
+        return preset_cuts(statistics, preset) or fallback
+
+    def _show_cuts(self, preset: str, cuts: tuple[float, float]) -> None:
+        """Show cuts in GUI."""
+        if preset == "Custom":
+            # just enable text boxes
+            self.spinLoCut.setEnabled(True)
+            self.spinHiCut.setEnabled(True)
+        else:
+            self._update_cuts_gui(*cuts)
+            if cuts != self._calculated_cuts:
+                self._calculated_cuts = cuts
+                self.calculatedCuts.emit(float(cuts[0]), float(cuts[1]))
+
+    def _create_normalization(
+        self, vmin: float, vmax: float, stretch: str, dtype: str, ndim: int
+    ) -> tuple[Normalize, LookupTable | None]:
+        """Normalization stage: create normalization and lookup table.
+
+        Args:
+            vmin: Low cut.
+            vmax: High cut.
+            stretch: Name of stretch function.
+            dtype: Data type of image.
+            ndim: Number of dimensions of image.
+
+        Returns:
+            Tuple of normalization and lookup table, if possible.
+        """
+        norm = create_norm(stretch, vmin, vmax)
+        return norm, create_lut(norm, np.empty((0,) * ndim, dtype=dtype))
+
+    def _scale(
+        self, data: npt.NDArray[Any], norm: Normalize, lut: LookupTable | None, rgba_lut: bool
+    ) -> npt.NDArray[Any] | None:
+        """Scale stage: normalize data, not necessary if lookup table is used for RGBA of a mono image."""
+        return None if rgba_lut and lut is not None and len(data.shape) == 2 else normalize(data, norm, lut)
+
+    def _colormap(self, norm: Normalize, lut: LookupTable | None, name: str, rgba_lut: bool) -> Colormap:
+        """Colormap stage: get colormap, add it to lookup table and update colorbar.
+
+        Args:
+            norm: Current normalization.
+            lut: Current lookup table.
+            name: Name of colormap.
+            rgba_lut: Whether lookup table is used for RGBA.
+
+        Returns:
+            Colormap.
+        """
+        cmap: Colormap = plt.get_cmap(name)
+        if rgba_lut and lut is not None:
+            lut.set_cmap(cmap)
+
+        # set colorbar
+        self.labelColorbar.setPixmap(self._colorbar(norm, cmap))
+        return cmap
+
+    @staticmethod
+    def _colorbar(norm: Normalize, cmap: Colormap) -> QtGui.QPixmap:
+        """Create colorbar image for given normalization and colormap."""
+        cm = ScalarMappable(norm=norm, cmap=cmap)
+        rgba = np.ascontiguousarray(cm.to_rgba(np.linspace(norm.vmin, norm.vmax, 256), bytes=True))
+        colorbar = QtGui.QImage(rgba.data, 1, 256, 4, QtGui.QImage.Format.Format_RGBA8888)
+        return QtGui.QPixmap.fromImage(colorbar)
+
+    def _compose(
+        self,
+        generation: int,
+        data: npt.NDArray[Any],
+        extent: tuple[float, float, float, float],
+        scaled_data: npt.NDArray[Any] | None,
+        lut: LookupTable | None,
+        cmap: Colormap,
+        backend: RenderBackend,
+        streaming: bool = False,
+    ) -> bool:
+        """Compose stage: show normalized data with colormap, the existing image is updated if possible.
+
+        Args:
+            generation: Generation of current frame or of the first one in a series of frames with the same size,
+                axes are only set up again for a new one.
+            data: Image data to display.
+            extent: Extent of data.
+            scaled_data: Normalized data.
+            lut: Lookup table, containing the colormap in case of RGBA.
+            cmap: Colormap.
+            backend: Render backend.
+            streaming: Whether data is a frame of a live stream, which is shown from a strided pyramid.
+
+        Returns:
+            Whether axes have been set up from scratch.
+        """
+        qimage = backend == RenderBackend.QIMAGE
+        rgb = len(data.shape) == 3
+        offset = (int(extent[0] + 0.5), int(extent[2] + 0.5))
+
+        # same frame? then just update image
+        if generation == self._image_generation and backend == self._image_backend:
+            if qimage:
+                self.canvas.set_image(self._to_rgba(data), self.ax, extent)
+            elif self._image_plot is not None and scaled_data is not None:
+                if streaming:
+                    self._stream_pyramid(scaled_data, offset)
+                elif scaled_data is not self._image_scaled:
+                    # a preview is kept until the pyramid is ready, so the full image is never drawn at once
+                    if not self._image_preview:
+                        self._image_plot.set_data(scaled_data)
+                        self._image_plot.set_extent(extent)
+                    self._build_pyramid(scaled_data, backend, offset)
+                if not rgb:
+                    self._image_plot.set_cmap(cmap)
+            self._image_preview = False
+            return False
+
+        # new pyramid and image
+        self._build_pyramid(scaled_data, backend, offset)
+        if self._create_image(data, scaled_data, lut, cmap, extent, backend):
+            self._image_generation = generation
+        self._image_backend = backend
+        self._image_preview = False
+        return True
+
+    def _create_image(
+        self,
+        data: npt.NDArray[Any],
+        scaled_data: npt.NDArray[Any] | None,
+        lut: LookupTable | None,
+        cmap: Colormap,
+        extent: tuple[float, float, float, float],
+        backend: RenderBackend,
+    ) -> bool:
+        """Set up new axes and show image in them.
+
+        Args:
+            data: Image data to display.
+            scaled_data: Normalized data.
+            lut: Lookup table, containing the colormap in case of RGBA.
+            cmap: Colormap.
+            extent: Extent of data.
+            backend: Render backend.
+
+        Returns:
+            Whether an image has been created, which is not the case for empty data.
+        """
+        qimage = backend == RenderBackend.QIMAGE
+        rgb = len(data.shape) == 3
+
+        # no empty axis?
+        self._clear_axes()
+        if any([d == 0 for d in data.shape]):
+            return False
+
+        # plot
+        if qimage:
+            # let Qt paint the image below the transparent figure
+            self.canvas.set_image(to_rgba(data, scaled_data, lut, cmap), self.ax, extent)
+            self.ax.set_xlim(*extent[:2])
+            self.ax.set_ylim(*extent[2:])
+            self.ax.set_aspect("equal")
+        elif scaled_data is not None:
+            with plt.style.context("dark_background"):
+                self._image_plot = self.ax.imshow(
+                    scaled_data,
+                    cmap=None if rgb else cmap,
+                    interpolation="nearest",
+                    origin="lower",
+                    extent=extent,
+                    vmin=None if rgb else 0,
+                    vmax=None if rgb else 1,
+                )
+        self._setup_axes(qimage)
+        return True
+
+    def _clear_axes(self) -> None:
+        """Remove image and all overlays."""
+        self.ax.cla()
+        while len(self.ax.artists) > 0:
+            self.ax.artists[0].remove()
+        while len(self.figure.artists) > 0:
+            self.figure.artists[0].remove()
+        while len(self.figure.texts) > 0:
+            self.figure.texts[0].remove()
+        self._center_artists, self._directions_artists, self._image_text = [], [], None
+        self._region_artist, self._sources_artist, self._star_artist, self._line_artist = None, None, None, None
+        self._axes_generation += 1
+        self._image_plot = None
+        self._image_generation = None
+        self.canvas.set_image(None)
 
-        else:
-            self.data = self.hdu.data
+    def _setup_axes(self, qimage: bool) -> None:
+        """Style axes after adding a new image and watch for changes in view.
 
-        # 3D, i.e. color, image?
-        if len(self.data.shape) == 3:
-            # we need three images of uint8 format
-            if self.data.shape[0] != 3 and self.data.shape[2] != 3:
-                raise ValueError("Data cubes only supported with three layers, which are interpreted as RGB.")
-            if self.data.shape[0] == 3:
-                # move axis
-                self.data = np.moveaxis(self.data, 0, 2)
+        Args:
+            qimage: Whether image is painted by Qt below a transparent figure.
+        """
+        self.figure.patch.set_alpha(0.0 if qimage else 1.0)
+        self.ax.patch.set_alpha(0.0 if qimage else 1.0)
+        self.ax.axis("off")
+        self.ax.set_autoscale_on(False)
+        self.figure.subplots_adjust(0, 0.005, 1, 1)
 
-        # for INT8 images, we don't need cuts
-        is_int8 = self.data.dtype == np.uint8
+        # in lazy mode, keep view
+        if self.lazy_data is not None and self._lazy_view is not None:
+            self.ax.set_xlim(*self._lazy_view[:2])
+            self.ax.set_ylim(*self._lazy_view[2:])
 
-        # colour image?
-        is_color = len(self.data.shape) == 3 and self.data.shape[2] == 3
+        # watch for changes in view
+        self.ax.callbacks.connect("xlim_changed", self._view_changed)
+        self.ax.callbacks.connect("ylim_changed", self._view_changed)
 
-        # enable GUI elements, only important for first image after start
-        self.labelCuts.setEnabled(not is_int8)
-        self.comboCuts.setEnabled(not is_int8)
-        self.spinLoCut.setEnabled(not is_int8)
-        self.spinHiCut.setEnabled(not is_int8)
-        self.labelStretch.setEnabled(not is_int8)
-        self.comboStretch.setEnabled(not is_int8)
-        self.labelColormap.setEnabled(not is_color)
-        self.comboColormap.setEnabled(not is_color)
-        self.checkColormapReverse.setEnabled(not is_color)
-        self.checkTrimSec.setEnabled(True)
+    def _build_pyramid(
+        self, scaled_data: npt.NDArray[Any] | None, backend: RenderBackend, offset: tuple[int, int] = (0, 0)
+    ) -> None:
+        """Build new pyramid in background.
 
-        # draw image
-        self._trim_image()
+        Not needed in lazy mode, which reads at screen resolution anyway, and for QImage, which is scaled by Qt.
+        """
+        self._pyramid = None
+        self._pyramid_level = 0
+        self._pyramid_cutout = False
+        self._pyramid_generation += 1
+        self._image_scaled = scaled_data
+        if self.lazy_data is None and scaled_data is not None and backend == RenderBackend.MATPLOTLIB:
+            self.pyramid_thread_pool.clear()
+            self._pyramid_task = BuildPyramid(self._pyramid_generation, scaled_data, offset)
+            self._pyramid_task.signals.finished.connect(self._pyramid_finished)
+            self.pyramid_thread_pool.start(self._pyramid_task)
+
+    def _stream_pyramid(self, scaled_data: npt.NDArray[Any], offset: tuple[int, int] = (0, 0)) -> None:
+        """Show streamed frame from strided pyramid, which doesn't need to be built in background."""
+        self._pyramid_generation += 1
+        self._pyramid = ImagePyramid(scaled_data, strided=True, offset=offset)
+        self._pyramid_cutout = False
+        self._image_scaled = scaled_data
+        self._update_pyramid_level(draw=False)
+
+    def _to_rgba(self, data: npt.NDArray[Any]) -> npt.NDArray[np.uint8]:
+        """Convert data to RGBA image using current normalization and colormap.
 
-    def _draw_handler(self, draw_event: Any) -> None:
-        self._image_cache = self.canvas.copy_from_bbox(self.figure.bbox)
+        Args:
+            data: Image data, either mono or RGB.
 
-    @QtCore.Slot(int)  # type: ignore
-    def _trim_image(self) -> None:
-        # cut trimsec
-        self.trimmed_data = self._trimsec(self.hdu, self.data) if self.checkTrimSec.isChecked() else self.data
-
-        # store flattened and sorted pixels
-        self.sorted_data = (
-            np.sort(self.trimmed_data[self.trimmed_data > 0].flatten(), kind="stable")
-            if self.trimmed_data is not None
-            else None
-        )
+        Returns:
+            RGBA image as uint8.
+        """
 
-        # draw it
-        self._draw_image()
+        return to_rgba(data, self.scaled_data, self.lut, plt.get_cmap(self.cmap))
 
-    @QtCore.Slot(str)  # type: ignore
-    @QtCore.Slot(int)  # type: ignore
-    @QtCore.Slot(float)  # type: ignore
-    def _draw_image(self) -> None:
-        if self.sorted_data is None:
-            return
-
-        # cuts
-        self._evaluate_cuts_preset()
-        vmin = self.spinLoCut.value()
-        vmax = self.spinHiCut.value()
-
-        # get normalization
-        stretch = self.comboStretch.currentText()
-        if stretch == "linear":
-            self.norm = colors.Normalize(vmin=vmin, vmax=vmax, clip=True)
-        elif stretch == "log":
-            self.norm = colors.LogNorm(vmin=vmin, vmax=vmax, clip=True)
-        elif stretch == "sqrt":
-            self.norm = FuncNorm(np.sqrt, vmin=vmin, vmax=vmax, clip=True)
-        elif stretch == "squared":
-            self.norm = colors.PowerNorm(2, vmin=vmin, vmax=vmax, clip=True)
-        elif stretch == "asinh":
-            self.norm = FuncNorm(np.arcsinh, vmin=vmin, vmax=vmax, clip=True)
-        else:
-            raise ValueError("Invalid stretch")
+    def _update_overlay(self) -> bool:
+        """Run overlay stage.
 
-        # normalize data
-        self.scaled_data = self.normalize_data(self.trimmed_data) if self.trimmed_data is not None else None
+        Returns:
+            Whether overlay has been created anew.
+        """
+        version = self._overlay_stage.version
+        self._overlay_stage(
+            self._axes_generation,
+            self._center_position(),
+            self.position_angle,
+            self.mirrored,
+            self._show_overlay,
+            self._text_overlay_visible,
+            self._text_overlay_color,
+            self._center_mark_visible,
+            self._center_mark_color,
+            self._center_mark_style,
+            self._center_mark_size,
+            self._directions_visible,
+            self._directions_color,
+            self._sources_visible,
+            self._sources_color,
+            self._zoom_visible,
+            self._zoom_size,
+            self._zoom_magnification,
+            self._zoom_interpolation,
+        )
+        return self._overlay_stage.version != version
 
-        # get name of colormap
-        self.cmap = self.comboColormap.currentText()
-        if self.checkColormapReverse.isChecked():
-            self.cmap += "_r"
+    def _overlay_changed(self) -> None:
+        """Called when an overlay setting changed, redraws only the overlay."""
+        if self.hdu is not None and self._update_overlay():
+            self._blit_overlay()
 
-        # get colormap
-        cm = ScalarMappable(norm=self.norm, cmap=plt.get_cmap(self.cmap))
+    def _create_overlay(self, *inputs: Any) -> None:
+        """Overlay stage: replace all overlay artists, inputs are only used for detecting changes."""
 
-        # create colorbar image
-        colorbar = QtGui.QImage(1, 256, QtGui.QImage.Format.Format_ARGB32)
-        for i, f in enumerate(np.linspace(vmin, vmax, 256)):
-            rgba = cm.to_rgba(f, bytes=True)
-            c = QtGui.QColor(*rgba)
-            colorbar.setPixelColor(0, i, c)
+        # remove old artists, but keep text, zoom is persistent
+        text = "" if self._image_text is None else self._image_text.get_text()
+        for a in self._center_artists + self._directions_artists:
+            a.remove()
+        if self._image_text is not None:
+            self._image_text.remove()
+        if self._sources_artist is not None:
+            self._sources_artist.remove()
+        self._center_artists, self._directions_artists, self._image_text = [], [], None
+        self._sources_artist = None
+
+        # create new ones
+        if not self._show_overlay:
+            return
+        if self._center_mark_visible:
+            self._create_center()
+        if self._directions_visible:
+            self._create_directions()
+        if self._sources_visible:
+            self._create_sources()
+        if self._text_overlay_visible:
+            self._create_text_overlay(text)
+        if self._zoom_visible:
+            self._create_zoom()
+
+    def _draw_overlay(self) -> None:
+        """Draw all existing overlay artists."""
+        self._draw_center()
+        self._draw_directions()
+        self._draw_sources()
+        if self._image_text is not None:
+            self.ax.draw_artist(self._image_text)
+        if self._zoom_artist is not None and self._show_overlay and self._zoom_visible:
+            self.ax_zoom.draw_artist(self._zoom_artist)
+        self._draw_region()
+        self._draw_star()
+        self._draw_line_profile()
+
+    def _blit_overlay(self) -> None:
+        """Draw overlay on top of cached image without drawing the whole figure."""
+        if self._image_cache is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._image_cache)
+        self._draw_overlay()
+        self.canvas.blit(self.figure.bbox)
 
-        # set colorbar
-        self.labelColorbar.setPixmap(QtGui.QPixmap(colorbar))
+    @QtCore.Slot(int, object)  # type: ignore
+    def _pyramid_finished(self, generation: int, pyramid: ImagePyramid) -> None:
+        """Store pyramid, if it is still for the current image."""
+        if generation == self._pyramid_generation:
+            self._pyramid = pyramid
+            self._update_pyramid_level()
 
-        # clear axis
-        self.ax.cla()
-        while len(self.ax.artists) > 0:
-            self.ax.artists[0].remove()
-        while len(self.figure.artists) > 0:
-            self.figure.artists[0].remove()
-        while len(self.figure.texts) > 0:
-            self.figure.texts[0].remove()
-        if self._zoom_artist:
-            self._zoom_artist.remove()
-            self._zoom_artist = None
-            self.ax_zoom.cla()
-            self.ax_zoom.axis("off")
+    def _update_pyramid_level(self, draw: bool = True) -> None:
+        """Show pyramid level that best matches current view and canvas size.
 
-        # RGB?
-        rgb = len(self.scaled_data.shape) == 3
+        Args:
+            draw: Whether to draw canvas afterwards.
+        """
+        if self._pyramid is None or self._image_plot is None:
+            return
 
-        # no empty axis?
-        if not any([d == 0 for d in self.scaled_data.shape]):
-            # plot
-            with plt.style.context("dark_background"):
-                self._image_plot = self.ax.imshow(
-                    self.scaled_data, cmap=None if rgb else self.cmap, interpolation="nearest", origin="lower"
-                )
-            self.ax.axis("off")
-            self.figure.subplots_adjust(0, 0.005, 1, 1)
+        # image pixels per screen pixel
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        bbox = self.ax.bbox
+        ratio = max(abs(x1 - x0) / max(bbox.width, 1), abs(y1 - y0) / max(bbox.height, 1))
+
+        # level changed or view outside of current cutout?
+        level = self._pyramid.level_for(ratio)
+        left, right, bottom, top = self._image_plot.get_extent()
+        inside = left <= min(x0, x1) and max(x0, x1) <= right and bottom <= min(y0, y1) and max(y0, y1) <= top
+        if level == self._pyramid_level and inside and self._pyramid_cutout:
+            return
+        self._pyramid_level = level
+        self._pyramid_cutout = True
+
+        # set new data, view stays the same
+        data, extent = self._pyramid.get(level, (x0, x1, y0, y1))
+        self._image_plot.set_data(data)
+        self._image_plot.set_extent(extent)
+        self.ax.set_xlim(x0, x1)
+        self.ax.set_ylim(y0, y1)
+
+        # redraw
+        if draw:
+            self.canvas.draw()
+
+    def _view_changed(self, ax: Any) -> None:
+        """Called when the view changed due to zoom/pan, schedules an update of the image."""
+        if self.lazy_data is not None:
+            self._lazy_view = (*self.ax.get_xlim(), *self.ax.get_ylim())
+        self._view_timer.start()
+
+    def _update_view(self) -> None:
+        """Read new section in lazy mode or pick new pyramid level."""
+        if self.lazy_data is not None:
+            self._draw_image()
+        else:
+            self._update_pyramid_level()
 
-        # draw
-        self.canvas.draw()
+    def _read_section(
+        self,
+        lazy_data: LazyImage,
+        view: tuple[float, float, float, float] | None,
+        trim: bool,
+        size: tuple[float, float],
+    ) -> tuple[npt.NDArray[Any], tuple[float, float, float, float]]:
+        """Section stage: read section of lazy image in current view with about screen resolution.
 
-        # overlay
-        if self._show_overlay:
-            if self._center_mark_visible:
-                self._draw_center(True)
-            if self._directions_visible:
-                self._draw_directions(True)
-            if self._text_overlay_visible:
-                self._draw_text_overlay("", True)
-            if self._zoom_visible:
-                self._draw_zoom(None, True)
+        Args:
+            lazy_data: Lazy image to read from.
+            view: Current view as (x0, x1, y0, y1) or None for full image.
+            trim: Whether to restrict section to science region.
+            size: Size of canvas in pixels.
 
-        # blit image
-        self.canvas.blit(self.figure.bbox)
+        Returns:
+            Tuple of data and its extent.
+        """
 
-    def _draw_text_overlay(self, text: str, initial: bool = False) -> None:
-        if initial:
-            self._image_text = self.figure.text(
-                0.01, 0.98, "", fontsize=10, c=self._text_overlay_color, va="top", animated=True
-            )
+        # get pixel bounds of image, only science region if trimmed
+        by0, by1, bx0, bx1 = 0, lazy_data.shape[0], 0, lazy_data.shape[1]
+        bounds = trimsec_bounds(self.hdu.header) if trim and self.hdu is not None else None
+        if bounds is not None:
+            by0, by1, bx0, bx1 = max(by0, bounds[0]), min(by1, bounds[1]), max(bx0, bounds[2]), min(bx1, bounds[3])
+
+        # get pixel bounds of current view within them
+        x0, x1, y0, y1 = view if view is not None else (bx0 - 0.5, bx1 - 0.5, by0 - 0.5, by1 - 0.5)
+        ix0, ix1 = max(bx0, int(np.floor(min(x0, x1) + 0.5))), min(bx1, int(np.ceil(max(x0, x1) + 0.5)))
+        iy0, iy1 = max(by0, int(np.floor(min(y0, y1) + 0.5))), min(by1, int(np.ceil(max(y0, y1) + 0.5)))
+        if ix1 <= ix0 or iy1 <= iy0:
+            return np.zeros((0, 0), dtype=lazy_data.dtype), (-0.5, 0.5, -0.5, 0.5)
+
+        # read tile with about screen resolution
+        step = max(1, int(max((ix1 - ix0) / size[0], (iy1 - iy0) / size[1])))
+        tile = lazy_data.tile((iy0, iy1, ix0, ix1), step)
+
+        # extent in pixel coordinates
+        extent = (ix0 - 0.5, ix0 + tile.shape[1] * step - 0.5, iy0 - 0.5, iy0 + tile.shape[0] * step - 0.5)
+        return tile, extent
+
+    def _create_text_overlay(self, text: str) -> None:
+        self._image_text = self.figure.text(
+            0.01, 0.98, text, fontsize=10, c=self._text_overlay_color, va="top", animated=True
+        )
 
-        # draw text
+    def _draw_text_overlay(self, text: str) -> None:
         if self._image_text is not None:
             self._image_text.set_text(text)
             self.ax.draw_artist(self._image_text)
 
-    def _draw_center(self, initial: bool = False) -> None:
-        if initial and self.hdu is not None and self.hdu.header is not None and self.hdu.data is not None:
-            # get center position
-            if "CRPIX1" in self.hdu.header and "CRPIX2" in self.hdu.header:
-                x, y = self.hdu.header["CRPIX1"], self.hdu.header["CRPIX2"]
-            else:
-                x, y = self.hdu.data.shape[1] // 2, self.hdu.data.shape[0] // 2
+    def _center_position(self) -> tuple[float, float] | None:
+        """Position of center mark, which is the reference pixel, if given, or the center of the image."""
+        if self.hdu is None or self.hdu.header is None or self.hdu.data is None:
+            return None
+        b = self.binning
+        if "CRPIX1" in self.hdu.header and "CRPIX2" in self.hdu.header:
+            return (self.hdu.header["CRPIX1"] - 0.5) / b + 0.5, (self.hdu.header["CRPIX2"] - 0.5) / b + 0.5
+        return self.hdu.data.shape[1] // 2 // b, self.hdu.data.shape[0] // 2 // b
+
+    def _create_center(self) -> None:
+        # get center position
+        center = self._center_position()
+        if center is None:
+            return
+        x, y = center
 
-            # size
-            ms = self._center_mark_size
-            ms2 = ms * 2
+        # size and style
+        ms = self._center_mark_size
+        ms2 = ms * 2
+        style: dict[str, Any] = dict(color=self._center_mark_color, transform=self.ax.transData, animated=True)
 
-            # init
-            self._center_artists = []
+        # init
+        self._center_artists = []
 
-            # (half) cross?
-            if self._center_mark_style in [CenterMarkStyle.HALF_CROSS, CenterMarkStyle.FULL_CROSS]:
-                # first two lines for half cross
-                self._center_artists.append(
-                    Line2D([x + ms, x + ms2], [y, y], color=self._center_mark_color, transform=self.ax.transData)
-                )
-                self._center_artists.append(
-                    Line2D([x, x], [y + ms, y + ms2], color=self._center_mark_color, transform=self.ax.transData)
-                )
+        # (half) cross?
+        if self._center_mark_style in [CenterMarkStyle.HALF_CROSS, CenterMarkStyle.FULL_CROSS]:
+            # first two lines for half cross
+            self._center_artists.append(Line2D([x + ms, x + ms2], [y, y], **style))
+            self._center_artists.append(Line2D([x, x], [y + ms, y + ms2], **style))
 
-                # full cross?
-                if self._center_mark_style == CenterMarkStyle.FULL_CROSS:
-                    self._center_artists.append(
-                        Line2D([x - ms, x - ms2], [y, y], color=self._center_mark_color, transform=self.ax.transData)
-                    )
-                    self._center_artists.append(
-                        Line2D([x, x], [y - ms, y - ms2], color=self._center_mark_color, transform=self.ax.transData)
-                    )
+            # full cross?
+            if self._center_mark_style == CenterMarkStyle.FULL_CROSS:
+                self._center_artists.append(Line2D([x - ms, x - ms2], [y, y], **style))
+                self._center_artists.append(Line2D([x, x], [y - ms, y - ms2], **style))
 
-            elif self._center_mark_style == CenterMarkStyle.CIRCLE:
-                self._center_artists.append(
-                    Circle((x, y), ms, fill=False, color=self._center_mark_color, transform=self.ax.transData)
-                )
+        elif self._center_mark_style == CenterMarkStyle.CIRCLE:
+            self._center_artists.append(Circle((x, y), ms, fill=False, **style))
 
-            # add them
-            for a in self._center_artists:
-                self.ax.add_artist(a)
+        # add them
+        for a in self._center_artists:
+            self.ax.add_artist(a)
 
-        # draw them
+    def _draw_center(self) -> None:
         for a in self._center_artists:
             self.ax.draw_artist(a)
 
-    def _draw_directions(self, initial: bool = False) -> None:
+    def _create_directions(self) -> None:
         if self.position_angle is None:
             return
 
-        if initial:
-            # size and stuff
-            length = 20
-            text = 35
-            x, y = 50, 50
-            angle_n = np.radians(self.position_angle)
-            self._directions_artists = []
-
-            # N line
-            w, h = length * np.sin(angle_n), length * np.cos(angle_n)
-            self._directions_artists.append(
-                FancyArrow(x, y, w, h, width=0.2, head_width=5, transform=None, color=self._directions_color)
-            )
+        # size and stuff
+        length = 20
+        text = 35
+        x, y = 50, 50
+        angle_n = np.radians(self.position_angle)
+        self._directions_artists = []
+
+        # N line
+        w, h = length * np.sin(angle_n), length * np.cos(angle_n)
+        self._directions_artists.append(
+            FancyArrow(x, y, w, h, width=0.2, head_width=5, transform=None, color=self._directions_color)
+        )
 
-            # draw N text
-            w, h = -text * np.sin(angle_n), -text * np.cos(angle_n)
-            self._directions_artists.append(
-                Text(x - w, y - h, "N", ha="center", va="center", transform=None, c=self._directions_color)
-            )
+        # draw N text
+        w, h = -text * np.sin(angle_n), -text * np.cos(angle_n)
+        self._directions_artists.append(
+            Text(x - w, y - h, "N", ha="center", va="center", transform=None, c=self._directions_color)
+        )
 
-            # E line
-            angle_e = angle_n - (np.pi / 2 if self.mirrored else -np.pi / 2)
-            w, h = -length * np.sin(angle_e), -length * np.cos(angle_e)
-            self._directions_artists.append(
-                FancyArrow(x, y, w, h, width=0.2, head_width=5, transform=None, color=self._directions_color)
-            )
+        # E line
+        angle_e = angle_n - (np.pi / 2 if self.mirrored else -np.pi / 2)
+        w, h = -length * np.sin(angle_e), -length * np.cos(angle_e)
+        self._directions_artists.append(
+            FancyArrow(x, y, w, h, width=0.2, head_width=5, transform=None, color=self._directions_color)
+        )
 
-            # draw E text
-            w, h = -text * np.sin(angle_e), -text * np.cos(angle_e)
-            self._directions_artists.append(
-                Text(x + w, y + h, "E", ha="center", va="center", transform=None, c=self._directions_color)
-            )
+        # draw E text
+        w, h = -text * np.sin(angle_e), -text * np.cos(angle_e)
+        self._directions_artists.append(
+            Text(x + w, y + h, "E", ha="center", va="center", transform=None, c=self._directions_color)
+        )
 
-            # add them
-            for a in self._directions_artists:
-                self.figure.add_artist(a)
+        # add them
+        for a in self._directions_artists:
+            a.set_animated(True)
+            self.figure.add_artist(a)
 
-        # draw them
+    def _draw_directions(self) -> None:
         for a in self._directions_artists:
             self.figure.draw_artist(a)
 
-    def _draw_zoom(self, data: npt.NDArray[np.floating[Any]] | None = None, initial: bool = False) -> None:
-        if not self.ax_zoom:
-            return
+    def _create_sources(self) -> None:
+        self._sources_artist = self.ax.scatter(
+            [], [], s=80, facecolors="none", edgecolors=self._sources_color, linewidths=1, animated=True
+        )
+        self._update_sources()
 
-        # no data
-        if data is None:
-            data = np.zeros((11, 11))
+    def _update_sources(self) -> None:
+        """Move markers to sources of current frame."""
+        if self._sources_artist is not None:
+            sources = self.sources
+            offsets = np.empty((0, 2)) if sources is None else np.column_stack((sources.x, sources.y))
+            self._sources_artist.set_offsets(offsets)
 
-        # RGB?
-        rgb = len(data.shape) == 3
+    def _draw_sources(self) -> None:
+        # sources of a previous frame are not shown
+        if self._sources_artist is not None and self.sources is not None:
+            self.ax.draw_artist(self._sources_artist)
 
-        # no empty axis?
-        if not any([d == 0 for d in data.shape]):
-            # clim?
-            vmin, vmax = self._image_plot.get_clim() if self._image_plot is not None else (0, 1)
+    def _detect_sources(self) -> None:
+        """Detect sources in current frame in background, if they are shown and not known yet.
 
-            # plot
+        Not available in lazy and blink mode, which never have the full frame in memory or switch it all the time.
+        """
+        data = self.trimmed_data
+        if not self._sources_visible or data is None or self.lazy_data is not None or len(self._blink_hdus) > 0:
+            return
+        if self.sources is not None or (self._sources_task is not None and self._sources_task.data is data):
+            return
+
+        # cached with frame?
+        frame = self._sources_frame
+        if frame is None or frame.trimmed_data is not data:
+            frame = None
+        elif frame.sources is not None:
+            self._sources_detected(data, frame.sources)
+            return
+
+        # a running task for a previous frame cancels itself
+        self.sources_thread_pool.clear()
+        self._sources_task = DetectSources(self, data, self._data_offset, frame)
+        self._sources_task.signals.finished.connect(self._sources_detected)
+        self.sources_thread_pool.start(self._sources_task)
+
+    @QtCore.Slot(object, object)  # type: ignore
+    def _sources_detected(self, data: npt.NDArray[Any], sources: Sources) -> None:
+        """Show detected sources, if they are still for the current frame."""
+        if self._sources_task is not None and self._sources_task.data is data:
+            self._sources_task = None
+        if data is not self.trimmed_data:
+            return
+        self._sources = (data, sources)
+        self._update_sources()
+        if self._sources_artist is not None:
+            self._blit_overlay()
+        self.sourcesDetected.emit(sources)
+
+    @property
+    def sources(self) -> Sources | None:
+        """Sources detected in current frame, if detection has finished."""
+        if self._sources is None or self._sources[0] is not self.trimmed_data:
+            return None
+        return self._sources[1]
+
+    def _layout_zoom(self) -> None:
+        """Place zoom in upper right corner, sized to show each pixel of the cutout magnified."""
+        size = self._zoom_size * self._zoom_magnification
+        w = min(size / max(self.figure.bbox.width, 1.0), 0.5)
+        h = min(size / max(self.figure.bbox.height, 1.0), 0.5)
+        self.ax_zoom.set_position((0.95 - w, 0.95 - h, w, h))
+
+    def _create_zoom(self) -> None:
+        """Create zoom artist, if necessary, and reset it to an empty cutout with current settings."""
+        self._layout_zoom()
+        empty = np.full((self._zoom_size, self._zoom_size), np.nan)
+        extent = (-0.5, self._zoom_size - 0.5, -0.5, self._zoom_size - 0.5)
+
+        # updated in place from now on
+        if self._zoom_artist is None:
             with plt.style.context("dark_background"):
                 self._zoom_artist = self.ax_zoom.imshow(
-                    data,
-                    cmap=None if rgb else self.cmap,
-                    interpolation="nearest",
-                    origin="lower",
-                    vmin=vmin,
-                    vmax=vmax,
-                    animated=True,
+                    empty, cmap=self.cmap, origin="lower", vmin=0, vmax=1, extent=extent, animated=True
                 )
-                self.ax_zoom.draw_artist(self._zoom_artist)
+        else:
+            self._zoom_artist.set_data(empty)
+            self._zoom_artist.set_extent(extent)
+        self._zoom_artist.set_interpolation(self._zoom_interpolation)  # type: ignore
+        self.ax_zoom.set_xlim(*extent[:2])
+        self.ax_zoom.set_ylim(*extent[2:])
+
+    def _draw_zoom(self, data: npt.NDArray[np.floating[Any]] | None = None) -> None:
+        """Draw zoom, optionally with a new normalized cutout."""
+        if self._zoom_artist is None:
+            return
+        if data is not None and data.shape[:2] == (self._zoom_size, self._zoom_size):
+            self._zoom_artist.set_data(data)
+            if len(data.shape) == 2 and self.cmap is not None and self._zoom_artist.get_cmap().name != self.cmap:
+                self._zoom_artist.set_cmap(self.cmap)
+        self.ax_zoom.draw_artist(self._zoom_artist)
 
     def normalize_data(self, data: npt.NDArray[np.floating[Any]]) -> npt.NDArray[np.floating[Any]]:
         if self.norm is None:
             raise ValueError("No normalization available")
-        # for RGB data, we need to normalize manually, since it's not done by imshow
-        if len(data.shape) == 3:
-            return np.array([self.norm(data[d, :, :]) / 255.0 for d in range(data.shape[0])])
-        else:
-            return self.norm(data)
-
-    def _evaluate_cuts_preset(self) -> None:
-        """When the cuts preset has changed, calculate the new cuts"""
-
-        # get preset
-        preset = self.comboCuts.currentText()
-        if preset == "Custom":
-            # just enable text boxes
-            self.spinLoCut.setEnabled(True)
-            self.spinHiCut.setEnabled(True)
-            return
-
-        # get percentage
-        percent = float(preset[:-1])
-
-        # get number of pixels to discard at both ends
-        if self.sorted_data is None:
-            return
-        n = int(len(self.sorted_data) * (1.0 - (percent / 100.0)))
+        return normalize(data, self.norm, self.lut)
 
-        # get min/max in cut range
-        cut = self.sorted_data[n:-n] if n > 0 else self.sorted_data
-        cuts = (np.min(cut), np.max(cut))
-
-        # update gui
-        self._update_cuts_gui(*cuts)
-
-    def _update_cuts_gui(self, lo: int, hi: int) -> None:
+    def _update_cuts_gui(self, lo: float, hi: float) -> None:
         """Update current cuts shown in GUI.
 
         Args:
@@ -589,8 +2366,8 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
         self.spinHiCut.setEnabled(False)
 
         # enable signals
-        self.spinLoCut.blockSignals(True)
-        self.spinHiCut.blockSignals(True)
+        self.spinLoCut.blockSignals(False)
+        self.spinHiCut.blockSignals(False)
 
     def _mouse_moved(self, event: Any) -> None:
         """Called, whenever the mouse is moved.
@@ -599,6 +2376,13 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
             event: MPL event
         """
 
+        # dragging line? follow mouse also outside main axes, e.g. over the profile
+        if self._line_dragging and self._line_bounds is not None:
+            lx, ly = self.ax.transData.inverted().transform((event.x, event.y))
+            self._line_bounds = (*self._line_bounds[:2], float(lx), float(ly))
+            self._update_line_profile()
+            self._blit_overlay()
+
         # get x/y
         x, y = event.xdata, event.ydata
 
@@ -609,16 +2393,122 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
         # store position
         self.mouse_pos = (float(x), float(y))
 
+        # dragging region?
+        if self._region_dragging and self._region_bounds is not None:
+            self._region_bounds = (*self._region_bounds[:2], float(x), float(y))
+            self._blit_overlay()
+
+        # nothing to show for a preview
+        if self._preview_generation is not None:
+            return
+
+        # replace pending request and try to process it
+        self._request_hover()
+
+    def _request_hover(self) -> None:
+        """Request hover update for current mouse position."""
+        data = self.data if self.lazy_data is None else self.lazy_data
+        if data is not None:
+            self._hover_pending = MouseHoverRequest(
+                x=self.mouse_pos[0],
+                y=self.mouse_pos[1],
+                data=data,
+                normalize=self.normalize_data,
+                timestamp=time.perf_counter(),
+                size=self._zoom_size,
+                scaled=self.scaled_data if self.lazy_data is None else None,
+                offset=self._data_offset,
+                table=self.summed_area_table,
+            )
+            self._dispatch_hover()
+
+    def _dispatch_hover(self) -> None:
+        """Send pending hover request to worker, if it is idle and the maximum rate allows it."""
+        if self._hover_busy or self._hover_pending is None:
+            return
+
+        # too early? try again later
+        wait = self._hover_last_dispatch + 1.0 / self.hover_max_rate - time.perf_counter()
+        if wait > 0:
+            if not self._hover_timer.isActive():
+                self._hover_timer.start(int(np.ceil(wait * 1000)))
+            return
+
+        # send it
+        self._hover_busy = True
+        self._hover_last_dispatch = time.perf_counter()
+        request, self._hover_pending = self._hover_pending, None
+        self._hoverRequested.emit(request)
+
+    @QtCore.Slot(ProcessMouseHoverResult)  # type: ignore
+    def _hover_finished(self, result: ProcessMouseHoverResult) -> None:
+        """Show hover result, report latency and process next request."""
+        self._hover_busy = False
+        received = time.perf_counter()
+        self._update_mouse_over(result)
+
+        # latency
+        finished = time.perf_counter()
+        latency = finished - result.timestamp
+        self._hover_latencies.append(latency)
+        self.hoverLatency.emit(latency)
+
+        # timing from mouse move via worker to blit
+        if self._profiling:
+            timing = TimingRecord("hover", timestamp=result.timestamp)
+            timing.add("queue", result.started - result.timestamp)
+            timing.add("process", result.processed - result.started)
+            timing.add("deliver", received - result.processed)
+            timing.add("draw", finished - received)
+            self._record_timing(timing)
+
+        # next one
+        self._dispatch_hover()
+
+    @property
+    def hover_latency(self) -> float | None:
+        """Mean latency in seconds from mouse move to blit over the last hover updates."""
+        return float(np.mean(self._hover_latencies)) if self._hover_latencies else None
+
+    @property
+    def profiling(self) -> bool:
+        """Whether the duration of each stage of render and hover cycles is measured.
+
+        Each timing is emitted via timingRecorded and added to the rolling timing_summary.
+        """
+        return self._profiling
+
+    @profiling.setter
+    def profiling(self, profiling: bool) -> None:
+        self._profiling = profiling
+        self._timing = None
+
+    @staticmethod
+    def _stop_thread(thread: QtCore.QThread) -> None:
+        thread.quit()
+        thread.wait()
+
+    @property
+    def mouse_pos_wcs(self) -> SkyCoord | None:
+        """Sky coordinates of current mouse position, if available."""
+
+        # cached?
+        if self.wcs_grid is None:
+            return None
+        if (
+            self._mouse_pos_wcs is not None
+            and self._mouse_pos_wcs[0] is self.wcs_grid
+            and self._mouse_pos_wcs[1] == self.mouse_pos
+        ):
+            return self._mouse_pos_wcs[2]
+
         # convert to RA/Dec and store it
         try:
-            self.mouse_pos_wcs = pixel_to_skycoord(x, y, self.wcs)
+            coord = self.wcs_grid.pixel_to_skycoord(*self.mouse_pos)
         except (ValueError, AttributeError):
-            self.mouse_pos_wcs = None
-
-        # start in thread
-        t = ProcessMouseHover(self)
-        t.signals.finished.connect(self._update_mouse_over)
-        self.mouse_over_thread_pool.tryStart(t)
+            coord = None
+        self._mouse_pos_wcs = (self.wcs_grid, self.mouse_pos, coord)
+        return coord
 
     def _format_template(self, template: str) -> str:
         environment = jinja2.Environment()
@@ -630,6 +2520,41 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
         return tpl.render(pixel=self.mouse_pos, wcs=self.mouse_pos_wcs)
 
     def _mouse_clicked(self, event: Any) -> None:
+        # start dragging a region
+        if (
+            event.button is MouseButton.LEFT
+            and self._region_selection
+            and event.inaxes == self.ax
+            and event.xdata is not None
+            and event.ydata is not None
+        ):
+            x, y = float(event.xdata), float(event.ydata)
+            self._region_bounds = (x, y, x, y)
+            self._region_dragging = True
+            self._blit_overlay()
+
+        # measure star near click
+        if (
+            event.button is MouseButton.LEFT
+            and self._star_measurement
+            and event.inaxes == self.ax
+            and event.xdata is not None
+            and event.ydata is not None
+        ):
+            self.measure_star(float(event.xdata), float(event.ydata))
+
+        # start dragging a line
+        if (
+            event.button is MouseButton.LEFT
+            and self._line_drawing
+            and event.inaxes == self.ax
+            and event.xdata is not None
+            and event.ydata is not None
+        ):
+            x, y = float(event.xdata), float(event.ydata)
+            self._line_bounds = (x, y, x, y)
+            self._line_dragging = True
+
         if event.button is MouseButton.RIGHT:
             # if no menu is set, quit here
             if len(self._menu_entries) == 0:
@@ -665,6 +2590,303 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
         callback, pixel, wcs = action.data()
         callback(pixel, wcs)
 
+    def _mouse_released(self, event: Any) -> None:
+        """Finish dragging a region or line, a click without dragging clears it."""
+        if self._line_dragging and event.button is MouseButton.LEFT and self._line_bounds is not None:
+            self._line_dragging = False
+            x0, y0 = self._line_bounds[:2]
+            x1, y1 = (float(v) for v in self.ax.transData.inverted().transform((event.x, event.y)))
+            if (x0, y0) == (x1, y1):
+                self.clear_line()
+            else:
+                self.draw_line(x0, y0, x1, y1)
+            return
+        if not self._region_dragging or event.button is not MouseButton.LEFT or self._region_bounds is None:
+            return
+        self._region_dragging = False
+        x0, y0, x1, y1 = self._region_bounds
+        if event.inaxes == self.ax and event.xdata is not None and event.ydata is not None:
+            x1, y1 = float(event.xdata), float(event.ydata)
+        if (x0, y0) == (x1, y1):
+            self.clear_region()
+        else:
+            self.select_region(x0, y0, x1, y1)
+
+    @property
+    def region_selection(self) -> bool:
+        """Whether dragging with the left mouse button selects a region for statistics."""
+        return self._region_selection
+
+    @region_selection.setter
+    def region_selection(self, enabled: bool) -> None:
+        self._set_mode("_region_selection", enabled)
+
+    def _set_mode(self, mode: str, enabled: bool) -> None:
+        """Set one of the modes for the left mouse button, enabling one disables all others."""
+        if enabled:
+            self._region_selection, self._star_measurement, self._line_drawing = False, False, False
+        setattr(self, mode, enabled)
+        self._region_dragging, self._line_dragging = False, False
+        self.tools.update_modes()
+
+    def select_region(self, x0: float, y0: float, x1: float, y1: float) -> None:
+        """Select a region for statistics, which are shown in the overlay and emitted via regionSelected.
+
+        All pixels touched by the rectangle are used. The region is kept when stepping through
+        frames of the same size or streaming and its statistics updated.
+
+        Args:
+            x0: X coordinate of one corner in pixels.
+            y0: Y coordinate of one corner in pixels.
+            x1: X coordinate of opposite corner in pixels.
+            y1: Y coordinate of opposite corner in pixels.
+        """
+        self._region_bounds = (x0, y0, x1, y1)
+        self._update_region()
+        self._blit_overlay()
+
+    def clear_region(self) -> None:
+        """Clear selected region."""
+        had_region = self._region_bounds is not None
+        self._region_bounds = None
+        self._region_dragging = False
+        self.region = None
+        if had_region:
+            self.regionSelected.emit(None)
+            self._blit_overlay()
+
+    def _region_pixels(self) -> tuple[int, int, int, int] | None:
+        """Pixel bounds x0, x1, y0, y1 of selected region, the upper ones exclusive."""
+        if self._region_bounds is None:
+            return None
+        x0, y0, x1, y1 = self._region_bounds
+        ix0, ix1 = int(np.floor(min(x0, x1) + 0.5)), int(np.floor(max(x0, x1) + 0.5)) + 1
+        iy0, iy1 = int(np.floor(min(y0, y1) + 0.5)), int(np.floor(max(y0, y1) + 0.5)) + 1
+        return ix0, ix1, iy0, iy1
+
+    def _update_region(self, streaming: bool = False) -> None:
+        """Calculate statistics of selected region for current frame and emit them.
+
+        Args:
+            streaming: Whether data has been replaced by a new frame of a live stream, for which no summed-area
+                tables are built, so statistics are calculated from the pixels in the region.
+        """
+        pixels = self._region_pixels()
+        data = self.data if self.lazy_data is None else self.lazy_data
+        if pixels is None or data is None:
+            return
+        if not streaming:
+            self._build_summed_area()
+        self.region = region_statistics(data, *pixels, table=self.summed_area_table)
+        self.regionSelected.emit(self.region)
+
+    def _draw_region(self) -> None:
+        """Draw rectangle around selected region, if any."""
+        pixels = self._region_pixels()
+        if pixels is None:
+            return
+        if self._region_artist is None:
+            self._region_artist = Rectangle((0, 0), 0, 0, fill=False, ec=self._text_overlay_color, ls="--")
+            self._region_artist.set_animated(True)
+            self.ax.add_patch(self._region_artist)
+        x0, x1, y0, y1 = pixels
+        self._region_artist.set_xy((x0 - 0.5, y0 - 0.5))
+        self._region_artist.set_width(x1 - x0)
+        self._region_artist.set_height(y1 - y0)
+        self.ax.draw_artist(self._region_artist)
+
+    def _build_summed_area(self) -> None:
+        """Build summed-area tables for current frame in background, unless they exist already, it is read lazily
+        or it is too large."""
+        data = self.data
+        if data is None or self.lazy_data is not None or self.summed_area_table is not None:
+            return
+        if self._summed_area_task is not None and self._summed_area_task.data is data:
+            return
+        if data.size > self.summed_area_max_values:
+            return
+        self.summed_area_thread_pool.clear()
+        self._summed_area_task = BuildSummedAreaTable(data)
+        self._summed_area_task.signals.finished.connect(self._summed_area_finished)
+        self.summed_area_thread_pool.start(self._summed_area_task)
+
+    @QtCore.Slot(object, object)  # type: ignore
+    def _summed_area_finished(self, data: npt.NDArray[Any], table: SummedAreaTable) -> None:
+        """Store summed-area tables, if they are still for the current frame."""
+        if self._summed_area_task is not None and self._summed_area_task.data is data:
+            self._summed_area_task = None
+        if data is self.data:
+            self._summed_area = (data, table)
+
+    @property
+    def summed_area_table(self) -> SummedAreaTable | None:
+        """Summed-area tables of current frame for region statistics in constant time, if already built."""
+        if self._summed_area is None or self._summed_area[0] is not self.data or self.lazy_data is not None:
+            return None
+        return self._summed_area[1]
+
+    @property
+    def star_measurement(self) -> bool:
+        """Whether clicking with the left mouse button measures the star next to it."""
+        return self._star_measurement
+
+    @star_measurement.setter
+    def star_measurement(self, enabled: bool) -> None:
+        self._set_mode("_star_measurement", enabled)
+
+    def measure_star(self, x: float, y: float) -> None:
+        """Measure star next to given position in background, the result is shown in the overlay and emitted via
+        starMeasured. The star is measured again at the same position when stepping through frames of the same
+        size or streaming.
+
+        Args:
+            x: X coordinate near star in pixels.
+            y: Y coordinate near star in pixels.
+        """
+        self._star_position = (x, y)
+        self._request_star()
+
+    def measure_stars(self, positions: Iterable[tuple[float, float]]) -> list[StarMeasurement]:
+        """Measure stars next to given positions in current frame, e.g. for scripted focus runs.
+
+        Unlike measure_star(), this runs in the calling thread and doesn't change the overlay.
+
+        Args:
+            positions: X and Y coordinates near stars in pixels.
+
+        Returns:
+            Measurements in same order as positions.
+        """
+        data = self.data if self.lazy_data is None else self.lazy_data
+        if data is None:
+            return []
+        return measure_stars(data, positions, self.star_radius, self.star_model)
+
+    def clear_star(self) -> None:
+        """Clear measured star."""
+        had_star = self._star_position is not None
+        self._star_position = None
+        self.star = None
+        if had_star:
+            self.starMeasured.emit(None)
+            self._blit_overlay()
+
+    def _request_star(self) -> None:
+        """Send measurement at last position to worker, which is at the centroid after a successful one."""
+        data = self.data if self.lazy_data is None else self.lazy_data
+        if self._star_position is None or data is None:
+            return
+        x, y = self._star_position
+        self._measureRequested.emit(MeasureStarRequest(x, y, data, self.star_radius, self.star_model))
+
+    @QtCore.Slot(object, object)  # type: ignore
+    def _star_measured(self, data: npt.NDArray[Any] | LazyImage, star: StarMeasurement) -> None:
+        """Show measurement, if it is still for the current frame."""
+        if self._star_position is None or data is not (self.data if self.lazy_data is None else self.lazy_data):
+            return
+        self.star = star
+        if star.valid:
+            self._star_position = (star.x, star.y)
+        self.starMeasured.emit(star)
+        self._request_hover()
+
+    def _draw_star(self) -> None:
+        """Draw circle with HFD around measured star, if any."""
+        if self.star is None or not self.star.valid:
+            return
+        if self._star_artist is None:
+            self._star_artist = Circle((0, 0), 1, fill=False, ec=self._text_overlay_color)
+            self._star_artist.set_animated(True)
+            self.ax.add_patch(self._star_artist)
+        self._star_artist.set_center((self.star.x, self.star.y))
+        self._star_artist.set_radius(self.star.hfd / 2)
+        self.ax.draw_artist(self._star_artist)
+
+    @property
+    def line_drawing(self) -> bool:
+        """Whether dragging with the left mouse button draws a line for an intensity profile."""
+        return self._line_drawing
+
+    @line_drawing.setter
+    def line_drawing(self, enabled: bool) -> None:
+        self._set_mode("_line_drawing", enabled)
+
+    def draw_line(self, x0: float, y0: float, x1: float, y1: float) -> None:
+        """Draw a line, whose intensity profile is shown in a small plot and emitted via lineProfileChanged.
+
+        The line is kept when stepping through frames of the same size or streaming and its profile updated.
+
+        Args:
+            x0: X coordinate of start in pixels.
+            y0: Y coordinate of start in pixels.
+            x1: X coordinate of end in pixels.
+            y1: Y coordinate of end in pixels.
+        """
+        self._line_bounds = (x0, y0, x1, y1)
+        self._update_line_profile()
+        self._blit_overlay()
+
+    def clear_line(self) -> None:
+        """Clear line and its profile."""
+        had_line = self._line_bounds is not None
+        self._line_bounds = None
+        self._line_dragging = False
+        self.profile = None
+        self.ax_profile.set_visible(False)
+        if had_line:
+            self.lineProfileChanged.emit(None)
+            self._blit_overlay()
+
+    def _update_line_profile(self) -> None:
+        """Sample profile along line in current frame and emit it."""
+        data = self.data if self.lazy_data is None else self.lazy_data
+        if self._line_bounds is None or data is None:
+            return
+        self.profile = line_profile(data, *self._line_bounds)
+        self.ax_profile.set_visible(True)
+        self.lineProfileChanged.emit(self.profile)
+
+    def _draw_line_profile(self) -> None:
+        """Draw line and plot of its profile, if any."""
+        profile = self.profile
+        if profile is None or self._line_bounds is None:
+            return
+
+        # line on image
+        if self._line_artist is None:
+            self._line_artist = Line2D([], [], color=self._text_overlay_color, animated=True)
+            self.ax.add_line(self._line_artist)
+        self._line_artist.set_data([profile.x0, profile.x1], [profile.y0, profile.y1])
+        self.ax.draw_artist(self._line_artist)
+
+        # one curve per channel, limits are set on each draw, so only animated artists are used
+        values = profile.values.reshape(len(profile.distance), -1)
+        colors = [self._text_overlay_color] if values.shape[1] == 1 else ["red", "lime", "blue"]
+        while len(self._profile_lines) < values.shape[1]:
+            self._profile_lines.append(self.ax_profile.plot([], [], lw=1, animated=True)[0])
+        if self._profile_text is None:
+            self._profile_text = self.ax_profile.text(
+                0.02, 0.95, "", transform=self.ax_profile.transAxes, va="top", fontsize="small", animated=True
+            )
+
+        # limits from finite values
+        finite = values[np.isfinite(values)]
+        lo, hi = (float(np.min(finite)), float(np.max(finite))) if len(finite) > 0 else (0.0, 1.0)
+        pad = max(hi - lo, 1e-10) * 0.05
+        self.ax_profile.set_xlim(0, max(profile.length, 1.0))
+        self.ax_profile.set_ylim(lo - pad, hi + pad)
+
+        # draw it
+        self.ax_profile.draw_artist(self.ax_profile.patch)
+        for i, line in enumerate(self._profile_lines):
+            if i < values.shape[1]:
+                line.set_data(profile.distance, values[:, i])
+                line.set_color(colors[i])
+                self.ax_profile.draw_artist(line)
+        self._profile_text.set_text(f"Length: {profile.length:.1f} px, min/max: {lo:.1f} / {hi:.1f}")
+        self._profile_text.set_color(self._text_overlay_color)
+        self.ax_profile.draw_artist(self._profile_text)
+
     @QtCore.Slot(ProcessMouseHoverResult)  # type: ignore
     @QtCore.Slot(float, float, np.ndarray, float, float, np.ndarray)  # type: ignore
     def _update_mouse_over(
@@ -681,13 +2903,14 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
                 text = f"X/Y: {result.x:.1f} / {result.y:.1f}\n"
 
                 # WCS?
-                if "CTYPE1" in self.hdu.header and self.mouse_pos_wcs is not None:
+                world = self.wcs_grid.world(result.x, result.y) if self.wcs_grid is not None else None
+                if "CTYPE1" in self.hdu.header and world is not None:
                     if "RA---TAN" in self.hdu.header["CTYPE1"]:
                         text += (
-                            f"RA/Dec: {self.mouse_pos_wcs.ra.to_string(u.hour, precision=1)} / "
-                            f"{self.mouse_pos_wcs.dec.to_string(precision=1)}\n"
+                            f"RA/Dec: {Angle(world[0], u.deg).to_string(u.hour, precision=1)} / "
+                            f"{Angle(world[1], u.deg).to_string(precision=1)}\n"
                         )
-                    elif "HPLN-TAN" in self.hdu.header["CTYPE1"]:
+                    elif "HPLN-TAN" in self.hdu.header["CTYPE1"] and self.mouse_pos_wcs is not None:
                         text += (
                             f"Tx/Ty: {self.mouse_pos_wcs.Tx.to_string(precision=1)} / "
                             f"{self.mouse_pos_wcs.Ty.to_string(precision=1)}\n"
@@ -697,6 +2920,14 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
                 val = ", ".join([f"{v:.1f}" for v in result.value])
                 text += f"Pixel value: {val}\n"
                 text += f"Area mean/max: {result.mean:.1f} / {result.maxi:.1f}\n"
+                region = self.region
+                if region is not None and region.count > 0:
+                    text += f"Region {region.width}x{region.height} mean/std: {region.mean:.1f} / {region.std:.1f}\n"
+                    text += f"Region sum/min/max: {region.sum:.6g} / {region.min:.1f} / {region.max:.1f}\n"
+                star = self.star
+                if star is not None and star.valid:
+                    text += f"Star X/Y: {star.x:.1f} / {star.y:.1f}\n"
+                    text += f"Star FWHM/HFD: {star.fwhm:.2f} / {star.hfd:.2f} px\n"
                 self._draw_text_overlay(text)
 
             if self._center_mark_visible:
@@ -705,9 +2936,17 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
             if self._directions_visible:
                 self._draw_directions()
 
+            if self._sources_visible:
+                self._draw_sources()
+
             if self._zoom_visible:
                 self._draw_zoom(result.cut)
 
+        # selected region, measured star and line profile are shown independently of overlay
+        self._draw_region()
+        self._draw_star()
+        self._draw_line_profile()
+
         # draw it
         self.canvas.blit(self.figure.bbox)
         self.canvas.flush_events()
@@ -717,59 +2956,60 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
 
     def _trimsec(
         self, hdu: fits.ImageHDU, data: npt.NDArray[np.floating[Any]] | None = None
-    ) -> npt.NDArray[np.floating[Any]]:
-        """Trim an image to TRIMSEC.
+    ) -> tuple[npt.NDArray[np.floating[Any]], tuple[int, int]]:
+        """Trim an image to its science region from TRIMSEC, DATASEC or BIASSEC without copying it.
 
         Args:
             hdu: HDU to take data from.
             data: If given, take this instead of data from HDU.
 
         Returns:
-            Numpy array with image data.
+            Tuple of view on science region and its offset (x, y) in image.
         """
 
         # no data?
         if data is None:
             if self.hdu is not None and self.hdu.data is not None:
-                data = self.hdu.data.copy()
+                data = self.hdu.data
             else:
                 raise ValueError("No data.")
 
-        # keyword not given?
-        if "TRIMSEC" not in hdu.header:
-            # return whole data
-            return data
-
-        # get value of section
-        sec = hdu.header["TRIMSEC"]
-
-        # split values
-        s = sec[1:-1].split(",")
-        x = s[0].split(":")
-        y = s[1].split(":")
-
-        # set everything else to NaN
-        x0 = int(x[0]) - 1
-        x1 = int(x[1])
-        y0 = int(y[0]) - 1
-        y1 = int(y[1])
-        data[:, :x0] = 0
-        data[:, x1:] = 0
-        data[:y0, :] = 0
-        data[y1:, :] = 0
-
-        # return data
-        return data
-
-    def _debayer(self, arr: npt.NDArray[np.floating[Any]], pattern: str) -> npt.NDArray[np.floating[Any]]:
+        return trimsec(hdu.header, data, self.binning)
+
+    def _debayer(
+        self, arr: npt.NDArray[np.floating[Any]], pattern: str, superpixel: bool = False
+    ) -> npt.NDArray[np.floating[Any]]:
         """Debayer an image"""
+        return debayer(arr, pattern, superpixel)
+
+    @property
+    def render_backend(self) -> RenderBackend:
+        return self._render_backend
 
-        # what pattern do we have?
-        if pattern == "GBRG":
-            return cv2.cvtColor(arr, cv2.COLOR_BayerGB2BGR)
+    @render_backend.setter
+    def render_backend(self, backend: RenderBackend) -> None:
+        self._render_backend = backend
+        self._draw_image()
 
-        else:
-            raise ValueError("Unknown Bayer pattern.")
+    @property
+    def superpixel(self) -> bool:
+        """Whether Bayer images are debayered at half resolution by combining each 2x2 cell, for fast previews."""
+        return self._superpixel
+
+    @superpixel.setter
+    def superpixel(self, superpixel: bool) -> None:
+        if superpixel == self._superpixel:
+            return
+        self._superpixel = superpixel
+
+        # debayered data changes, so prepare current frame again
+        self.frame_cache.clear()
+        if len(self._blink_hdus) > 0:
+            self._prepare_blink()
+        elif self._frame_key is not None:
+            self.show_frame(*self._frame_key[1:])
+        elif self.hdu is not None and self.lazy_data is None and bayer_binning(self.hdu.header, True) > 1:
+            self._prepare(self.hdu)
 
     @property
     def show_overlay(self) -> bool:
@@ -778,7 +3018,7 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
     @show_overlay.setter
     def show_overlay(self, show: bool) -> None:
         self._show_overlay = show
-        self._draw_image()
+        self._overlay_changed()
 
     @property
     def center_mark_visible(self) -> bool:
@@ -787,7 +3027,7 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
     @center_mark_visible.setter
     def center_mark_visible(self, visible: bool) -> None:
         self._center_mark_visible = visible
-        self._draw_image()
+        self._overlay_changed()
 
     @property
     def center_mark_color(self) -> str:
@@ -796,7 +3036,7 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
     @center_mark_color.setter
     def center_mark_color(self, color: str) -> None:
         self._center_mark_color = color
-        self._draw_image()
+        self._overlay_changed()
 
     @property
     def center_mark_style(self) -> CenterMarkStyle:
@@ -805,7 +3045,7 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
     @center_mark_style.setter
     def center_mark_style(self, style: CenterMarkStyle) -> None:
         self._center_mark_style = style
-        self._draw_image()
+        self._overlay_changed()
 
     @property
     def center_mark_size(self) -> int:
@@ -814,7 +3054,7 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
     @center_mark_size.setter
     def center_mark_size(self, size: int) -> None:
         self._center_mark_size = size
-        self._draw_image()
+        self._overlay_changed()
 
     @property
     def directions_visible(self) -> bool:
@@ -823,7 +3063,7 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
     @directions_visible.setter
     def directions_visible(self, visible: bool) -> None:
         self._directions_visible = visible
-        self._draw_image()
+        self._overlay_changed()
 
     @property
     def directions_color(self) -> str:
@@ -832,7 +3072,27 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
     @directions_color.setter
     def directions_color(self, color: str) -> None:
         self._directions_color = color
-        self._draw_image()
+        self._overlay_changed()
+
+    @property
+    def sources_visible(self) -> bool:
+        return self._sources_visible
+
+    @sources_visible.setter
+    def sources_visible(self, visible: bool) -> None:
+        self._sources_visible = visible
+        self._sources_task = None
+        self._overlay_changed()
+        self._detect_sources()
+
+    @property
+    def sources_color(self) -> str:
+        return self._sources_color
+
+    @sources_color.setter
+    def sources_color(self, color: str) -> None:
+        self._sources_color = color
+        self._overlay_changed()
 
     @property
     def text_overlay_visible(self) -> bool:
@@ -841,7 +3101,7 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
     @text_overlay_visible.setter
     def text_overlay_visible(self, visible: bool) -> None:
         self._text_overlay_visible = visible
-        self._draw_image()
+        self._overlay_changed()
 
     @property
     def text_overlay_color(self) -> str:
@@ -850,7 +3110,7 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
     @text_overlay_color.setter
     def text_overlay_color(self, color: str) -> None:
         self._text_overlay_color = color
-        self._draw_image()
+        self._overlay_changed()
 
     @property
     def zoom_visible(self) -> bool:
@@ -859,7 +3119,39 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
     @zoom_visible.setter
     def zoom_visible(self, visible: bool) -> None:
         self._zoom_visible = visible
-        self._draw_image()
+        self._overlay_changed()
+
+    @property
+    def zoom_size(self) -> int:
+        """Width and height of the cutout shown in the zoom in pixels."""
+        return self._zoom_size
+
+    @zoom_size.setter
+    def zoom_size(self, size: int) -> None:
+        self._zoom_size = max(1, int(size))
+        self._overlay_changed()
+
+    @property
+    def zoom_magnification(self) -> float:
+        """Number of screen pixels per image pixel in the zoom."""
+        return self._zoom_magnification
+
+    @zoom_magnification.setter
+    def zoom_magnification(self, magnification: float) -> None:
+        self._zoom_magnification = magnification
+        if self.hdu is not None and self._update_overlay():
+            # zoom moved, so the whole figure needs to be drawn
+            self.canvas.draw()
+
+    @property
+    def zoom_interpolation(self) -> str:
+        """Interpolation used in zoom, see matplotlib's imshow()."""
+        return self._zoom_interpolation
+
+    @zoom_interpolation.setter
+    def zoom_interpolation(self, interpolation: str) -> None:
+        self._zoom_interpolation = interpolation
+        self._overlay_changed()
 
     def set_menu(self, entries: list[MenuEntry]) -> None:
         self._menu_entries = entries
@@ -868,4 +3160,4 @@ class QFitsWidget(QtWidgets.QWidget, Ui_FitsWidget):  # type: ignore
         self._menu_entries.clear()
 
 
-__all__ = ["QFitsWidget", "MenuAction", "MenuHeader", "MenuSeparator"]
+__all__ = ["QFitsWidget", "MenuAction", "MenuHeader", "MenuSeparator", "RenderBackend"]
@@ -17,7 +17,8 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
     QPalette, QPixmap, QRadialGradient, QTransform)
 from PySide6.QtWidgets import (QAbstractSpinBox, QApplication, QCheckBox, QComboBox,
     QDoubleSpinBox, QFrame, QHBoxLayout, QLabel,
-    QSizePolicy, QSpacerItem, QVBoxLayout, QWidget)
+    QSizePolicy, QSpacerItem, QSpinBox, QVBoxLayout,
+    QWidget)
 from . import resources_rc
 
 class Ui_FitsWidget(object):
@@ -34,6 +35,35 @@ class Ui_FitsWidget(object):
         self.horizontalLayout_6 = QHBoxLayout(self.widget_2)
         self.horizontalLayout_6.setObjectName(u"horizontalLayout_6")
         self.horizontalLayout_6.setContentsMargins(-1, 1, -1, 1)
+        self.widgetNavigation = QWidget(self.widget_2)
+        self.widgetNavigation.setObjectName(u"widgetNavigation")
+        self.horizontalLayout_7 = QHBoxLayout(self.widgetNavigation)
+        self.horizontalLayout_7.setObjectName(u"horizontalLayout_7")
+        self.horizontalLayout_7.setContentsMargins(0, 0, 0, 0)
+        self.labelExtension = QLabel(self.widgetNavigation)
+        self.labelExtension.setObjectName(u"labelExtension")
+
+        self.horizontalLayout_7.addWidget(self.labelExtension)
+
+        self.comboExtension = QComboBox(self.widgetNavigation)
+        self.comboExtension.setObjectName(u"comboExtension")
+
+        self.horizontalLayout_7.addWidget(self.comboExtension)
+
+        self.labelPlane = QLabel(self.widgetNavigation)
+        self.labelPlane.setObjectName(u"labelPlane")
+
+        self.horizontalLayout_7.addWidget(self.labelPlane)
+
+        self.spinPlane = QSpinBox(self.widgetNavigation)
+        self.spinPlane.setObjectName(u"spinPlane")
+        self.spinPlane.setKeyboardTracking(False)
+
+        self.horizontalLayout_7.addWidget(self.spinPlane)
+
+
+        self.horizontalLayout_6.addWidget(self.widgetNavigation)
+
         self.horizontalSpacer_4 = QSpacerItem(40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
 
         self.horizontalLayout_6.addItem(self.horizontalSpacer_4)
@@ -173,6 +203,8 @@ class Ui_FitsWidget(object):
 
     def retranslateUi(self, FitsWidget):
         FitsWidget.setWindowTitle(QCoreApplication.translate("FitsWidget", u"Form", None))
+        self.labelExtension.setText(QCoreApplication.translate("FitsWidget", u"HDU:", None))
+        self.labelPlane.setText(QCoreApplication.translate("FitsWidget", u"Plane:", None))
         self.labelColorbar.setText("")
         self.labelCuts.setText(QCoreApplication.translate("FitsWidget", u"Cuts:", None))
         self.labelStretch.setText(QCoreApplication.translate("FitsWidget", u"Stretch:", None))
@@ -1,6 +1,6 @@
 # Resource object code (Python 3)
 # Created by: object code
-# Created by: The Resource Compiler for Qt version 6.10.1
+# Created by: The Resource Compiler for Qt version 6.12.0
 # WARNING! All changes made in this file will be lost!
 
 from qtpy import QtCore
@@ -56,6 +56,61 @@ s10.35 2.672 13.\
 C448.6 396 448.9\
  402.3 446.1 407\
 .6z\x22/></svg>\
+\x00\x00\x01\x1c\
+<\
+svg xmlns=\x22http:\
+//www.w3.org/200\
+0/svg\x22 viewBox=\x22\
+0 0 512 512\x22><pa\
+th fill-rule=\x22ev\
+enodd\x22 d=\x22M256 9\
+6a160 160 0 1 1 \
+0 320a160 160 0 \
+1 1 0-320zM256 1\
+44a112 112 0 1 0\
+ 0 224a112 112 0\
+ 1 0 0-224z\x22/><p\
+ath d=\x22M232 0h48\
+v144h-48zM232 36\
+8h48v144h-48zM0 \
+232h144v48H0zM36\
+8 232h144v48H368\
+z\x22/></svg>\x0a\
+\x00\x00\x00\xfe\
+<\
+svg xmlns=\x22http:\
+//www.w3.org/200\
+0/svg\x22 viewBox=\x22\
+0 0 512 512\x22><pa\
+th d=\x22M32 32h128\
+v48H80v80H32zM35\
+2 32h128v128h-48\
+V80h-80zM32 352h\
+48v80h80v48H32zM\
+432 352h48v128H3\
+52v-48h80zM208 3\
+2h96v48h-96zM208\
+ 432h96v48h-96zM\
+32 208h48v96H32z\
+M432 208h48v96h-\
+48z\x22/></svg>\x0a\
+\x00\x00\x00\xe1\
+<\
+svg xmlns=\x22http:\
+//www.w3.org/200\
+0/svg\x22 viewBox=\x22\
+0 0 512 512\x22><pa\
+th d=\x22M32 32h48v\
+400h400v48H32z\x22/\
+><path fill=\x22non\
+e\x22 stroke=\x22#000\x22\
+ stroke-width=\x224\
+0\x22 stroke-linejo\
+in=\x22round\x22 d=\x22M1\
+12 368l72-64l64 \
+40l72-224l64 184\
+l96-48\x22/></svg>\x0a\
+\
 "
 
 qt_resource_name = b"\
@@ -67,15 +122,33 @@ qt_resource_name = b"\
 \x0dF\x0eG\
 \x00i\
 \x00m\x00a\x00g\x00e\x00-\x00s\x00o\x00l\x00i\x00d\x00.\x00s\x00v\x00g\
+\x00\x0e\
+\x02C|g\
+\x00c\
+\x00r\x00o\x00s\x00s\x00h\x00a\x00i\x00r\x00s\x00.\x00s\x00v\x00g\
+\x00\x0a\
+\x00nM\x07\
+\x00r\
+\x00e\x00g\x00i\x00o\x00n\x00.\x00s\x00v\x00g\
+\x00\x10\
+\x00\xb7\xb0\x07\
+\x00l\
+\x00i\x00n\x00e\x00-\x00p\x00r\x00o\x00f\x00i\x00l\x00e\x00.\x00s\x00v\x00g\
 "
 
 qt_resource_struct = b"\
 \x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x01\
 \x00\x00\x00\x00\x00\x00\x00\x00\
-\x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x02\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x04\x00\x00\x00\x02\
 \x00\x00\x00\x00\x00\x00\x00\x00\
+\x00\x00\x00^\x00\x00\x00\x00\x00\x01\x00\x00\x04!\
+\x00\x00\x01\xa1O$\x96\x7f\
+\x00\x00\x00x\x00\x00\x00\x00\x00\x01\x00\x00\x05#\
+\x00\x00\x01\xa1O0\xc2\x5c\
+\x00\x00\x00<\x00\x00\x00\x00\x00\x01\x00\x00\x03\x01\
+\x00\x00\x01\xa1O.\x02+\
 \x00\x00\x00\x18\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
-\x00\x00\x01\x84\xbe\xd7\xa3\xb5\
+\x00\x00\x01\x9a\xdbW\x5c\x98\
 "
 
 
@@ -19,12 +19,13 @@ from PySide6.QtWidgets import (QApplication, QCheckBox, QComboBox, QDialog,
     QFormLayout, QFrame, QGridLayout, QGroupBox,
     QHBoxLayout, QLabel, QSizePolicy, QSpinBox,
     QToolButton, QWidget)
+from . import resources_rc
 
 class Ui_DialogSettings(object):
     def setupUi(self, DialogSettings):
         if not DialogSettings.objectName():
             DialogSettings.setObjectName(u"DialogSettings")
-        DialogSettings.resize(409, 230)
+        DialogSettings.resize(401, 230)
         self.gridLayout = QGridLayout(DialogSettings)
         self.gridLayout.setObjectName(u"gridLayout")
         self.groupBox_3 = QGroupBox(DialogSettings)
@@ -45,8 +46,8 @@ class Ui_DialogSettings(object):
         self.horizontalLayout_3.setObjectName(u"horizontalLayout_3")
         self.labelTextOverlayColor = QFrame(self.groupBox_3)
         self.labelTextOverlayColor.setObjectName(u"labelTextOverlayColor")
-        self.labelTextOverlayColor.setFrameShape(QFrame.StyledPanel)
-        self.labelTextOverlayColor.setFrameShadow(QFrame.Raised)
+        self.labelTextOverlayColor.setFrameShape(QFrame.Shape.StyledPanel)
+        self.labelTextOverlayColor.setFrameShadow(QFrame.Shadow.Raised)
 
         self.horizontalLayout_3.addWidget(self.labelTextOverlayColor)
 
@@ -85,8 +86,8 @@ class Ui_DialogSettings(object):
         self.horizontalLayout_2.setObjectName(u"horizontalLayout_2")
         self.labelCenterColor = QFrame(self.groupBox_2)
         self.labelCenterColor.setObjectName(u"labelCenterColor")
-        self.labelCenterColor.setFrameShape(QFrame.StyledPanel)
-        self.labelCenterColor.setFrameShadow(QFrame.Raised)
+        self.labelCenterColor.setFrameShape(QFrame.Shape.StyledPanel)
+        self.labelCenterColor.setFrameShadow(QFrame.Shadow.Raised)
 
         self.horizontalLayout_2.addWidget(self.labelCenterColor)
 
@@ -128,6 +129,41 @@ class Ui_DialogSettings(object):
 
         self.formLayout_4.setWidget(0, QFormLayout.ItemRole.SpanningRole, self.checkZoomVisible)
 
+        self.label_6 = QLabel(self.groupBox_4)
+        self.label_6.setObjectName(u"label_6")
+
+        self.formLayout_4.setWidget(1, QFormLayout.ItemRole.LabelRole, self.label_6)
+
+        self.spinZoomSize = QSpinBox(self.groupBox_4)
+        self.spinZoomSize.setObjectName(u"spinZoomSize")
+        self.spinZoomSize.setMinimum(3)
+        self.spinZoomSize.setMaximum(201)
+        self.spinZoomSize.setSingleStep(2)
+
+        self.formLayout_4.setWidget(1, QFormLayout.ItemRole.FieldRole, self.spinZoomSize)
+
+        self.label_7 = QLabel(self.groupBox_4)
+        self.label_7.setObjectName(u"label_7")
+
+        self.formLayout_4.setWidget(2, QFormLayout.ItemRole.LabelRole, self.label_7)
+
+        self.spinZoomMagnification = QSpinBox(self.groupBox_4)
+        self.spinZoomMagnification.setObjectName(u"spinZoomMagnification")
+        self.spinZoomMagnification.setMinimum(1)
+        self.spinZoomMagnification.setMaximum(50)
+
+        self.formLayout_4.setWidget(2, QFormLayout.ItemRole.FieldRole, self.spinZoomMagnification)
+
+        self.label_8 = QLabel(self.groupBox_4)
+        self.label_8.setObjectName(u"label_8")
+
+        self.formLayout_4.setWidget(3, QFormLayout.ItemRole.LabelRole, self.label_8)
+
+        self.comboZoomInterpolation = QComboBox(self.groupBox_4)
+        self.comboZoomInterpolation.setObjectName(u"comboZoomInterpolation")
+
+        self.formLayout_4.setWidget(3, QFormLayout.ItemRole.FieldRole, self.comboZoomInterpolation)
+
 
         self.gridLayout.addWidget(self.groupBox_4, 0, 2, 1, 1)
 
@@ -149,8 +185,8 @@ class Ui_DialogSettings(object):
         self.horizontalLayout.setObjectName(u"horizontalLayout")
         self.labelDirectionsColor = QFrame(self.groupBox)
         self.labelDirectionsColor.setObjectName(u"labelDirectionsColor")
-        self.labelDirectionsColor.setFrameShape(QFrame.StyledPanel)
-        self.labelDirectionsColor.setFrameShadow(QFrame.Raised)
+        self.labelDirectionsColor.setFrameShape(QFrame.Shape.StyledPanel)
+        self.labelDirectionsColor.setFrameShadow(QFrame.Shadow.Raised)
 
         self.horizontalLayout.addWidget(self.labelDirectionsColor)
 
@@ -166,6 +202,41 @@ class Ui_DialogSettings(object):
 
         self.gridLayout.addWidget(self.groupBox, 1, 0, 1, 1)
 
+        self.groupBox_5 = QGroupBox(DialogSettings)
+        self.groupBox_5.setObjectName(u"groupBox_5")
+        self.formLayout_5 = QFormLayout(self.groupBox_5)
+        self.formLayout_5.setObjectName(u"formLayout_5")
+        self.checkSourcesVisible = QCheckBox(self.groupBox_5)
+        self.checkSourcesVisible.setObjectName(u"checkSourcesVisible")
+
+        self.formLayout_5.setWidget(0, QFormLayout.ItemRole.SpanningRole, self.checkSourcesVisible)
+
+        self.label_9 = QLabel(self.groupBox_5)
+        self.label_9.setObjectName(u"label_9")
+
+        self.formLayout_5.setWidget(1, QFormLayout.ItemRole.LabelRole, self.label_9)
+
+        self.horizontalLayout_4 = QHBoxLayout()
+        self.horizontalLayout_4.setObjectName(u"horizontalLayout_4")
+        self.labelSourcesColor = QFrame(self.groupBox_5)
+        self.labelSourcesColor.setObjectName(u"labelSourcesColor")
+        self.labelSourcesColor.setFrameShape(QFrame.Shape.StyledPanel)
+        self.labelSourcesColor.setFrameShadow(QFrame.Shadow.Raised)
+
+        self.horizontalLayout_4.addWidget(self.labelSourcesColor)
+
+        self.buttonSourcesColor = QToolButton(self.groupBox_5)
+        self.buttonSourcesColor.setObjectName(u"buttonSourcesColor")
+
+        self.horizontalLayout_4.addWidget(self.buttonSourcesColor)
+
+        self.horizontalLayout_4.setStretch(0, 1)
+
+        self.formLayout_5.setLayout(1, QFormLayout.ItemRole.FieldRole, self.horizontalLayout_4)
+
+
+        self.gridLayout.addWidget(self.groupBox_5, 1, 2, 1, 1)
+
 
         self.retranslateUi(DialogSettings)
 
@@ -186,9 +257,18 @@ class Ui_DialogSettings(object):
         self.label_4.setText(QCoreApplication.translate("DialogSettings", u"Size:", None))
         self.groupBox_4.setTitle(QCoreApplication.translate("DialogSettings", u"Zoom", None))
         self.checkZoomVisible.setText(QCoreApplication.translate("DialogSettings", u"Visible", None))
+        self.label_6.setText(QCoreApplication.translate("DialogSettings", u"Size:", None))
+        self.spinZoomSize.setSuffix(QCoreApplication.translate("DialogSettings", u" px", None))
+        self.label_7.setText(QCoreApplication.translate("DialogSettings", u"Magnification:", None))
+        self.spinZoomMagnification.setSuffix(QCoreApplication.translate("DialogSettings", u"x", None))
+        self.label_8.setText(QCoreApplication.translate("DialogSettings", u"Interpolation:", None))
         self.groupBox.setTitle(QCoreApplication.translate("DialogSettings", u"N/E directions", None))
         self.checkDirectionsVisible.setText(QCoreApplication.translate("DialogSettings", u"Visible", None))
         self.label.setText(QCoreApplication.translate("DialogSettings", u"Color:", None))
         self.buttonDirectionsColor.setText(QCoreApplication.translate("DialogSettings", u"...", None))
+        self.groupBox_5.setTitle(QCoreApplication.translate("DialogSettings", u"Sources", None))
+        self.checkSourcesVisible.setText(QCoreApplication.translate("DialogSettings", u"Visible", None))
+        self.label_9.setText(QCoreApplication.translate("DialogSettings", u"Color:", None))
+        self.buttonSourcesColor.setText(QCoreApplication.translate("DialogSettings", u"...", None))
     # retranslateUi
 
@@ -0,0 +1,168 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any
+import numpy as np
+import numpy.typing as npt
+
+from .cuts import SAMPLE_SIZE, stratified_sample
+from .imagestatistics import ImageStatistics
+from .lazy import LazyImage
+
+# maximum number of values of an image, i.e. pixels times channels, for which summed-area tables are built
+SUMMED_AREA_MAX_VALUES = 4096 * 4096
+
+
+class SummedAreaTable:
+    """Summed-area tables of an image, giving number, sum, mean and standard deviation of the finite pixels in any
+    rectangle from four lookups per table.
+
+    Pixels are shifted by an estimate of their mean before summing up, so that the variance of small regions doesn't
+    suffer from cancellation in the large sums of squares of big images. Tables are in double precision and one row
+    and column larger than the image, so they need 16 bytes per pixel and channel, plus another 4 for counting
+    finite pixels, if there are NaNs or infinite values.
+    """
+
+    def __init__(self, data: npt.NDArray[Any]):
+        """Build tables for given data.
+
+        Args:
+            data: Image data, either mono or RGB.
+        """
+        self.shape = data.shape[:2]
+        self.channels = 1 if len(data.shape) == 2 else data.shape[2]
+
+        # only finite pixels are summed up, mask is only needed, if there are others
+        finite = np.isfinite(data) if data.dtype.kind == "f" else None
+        if finite is not None and finite.all():
+            finite = None
+
+        # shift by mean of a sample
+        sample = stratified_sample(data, SAMPLE_SIZE)
+        self.shift = float(np.mean(sample, dtype=np.float64)) if len(sample) > 0 else 0.0
+        values = data.astype(np.float64)
+        values -= self.shift
+        if finite is not None:
+            values[~finite] = 0.0
+
+        # sums and sums of squares, re-using the shifted copy
+        self.sums = self._integrate(values, np.float64)
+        np.square(values, out=values)
+        self.squares = self._integrate(values, np.float64)
+        self.counts = None if finite is None else self._integrate(finite, np.int32 if finite.size < 2**31 else np.int64)
+
+    @staticmethod
+    def _integrate(values: npt.NDArray[Any], dtype: type[np.generic]) -> npt.NDArray[Any]:
+        """Cumulative sum over rows and columns, with a leading row and column of zeros."""
+        h, w = values.shape[:2]
+        table = np.zeros((h + 1, w + 1, *values.shape[2:]), dtype=dtype)
+        np.cumsum(values, axis=0, dtype=dtype, out=table[1:, 1:])
+        np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+        return table
+
+    @staticmethod
+    def _lookup(table: npt.NDArray[Any], x0: int, x1: int, y0: int, y1: int) -> Any:
+        """Sum over a rectangle, summed up over all channels."""
+        return np.sum(table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0])
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by tables."""
+        return self.sums.nbytes + self.squares.nbytes + (0 if self.counts is None else self.counts.nbytes)
+
+    def region(self, x0: int, x1: int, y0: int, y1: int) -> tuple[int, float, float, float]:
+        """Statistics of a rectangle, which must lie within the image.
+
+        Args:
+            x0: First column.
+            x1: Column after last one.
+            y0: First row.
+            y1: Row after last one.
+
+        Returns:
+            Number of finite pixels, their sum, mean and standard deviation, NaNs for the latter two if none.
+        """
+        if self.counts is None:
+            count = (x1 - x0) * (y1 - y0) * self.channels
+        else:
+            count = int(self._lookup(self.counts, x0, x1, y0, y1))
+        if count <= 0:
+            return 0, 0.0, np.nan, np.nan
+
+        # mean and variance of shifted values
+        mean = float(self._lookup(self.sums, x0, x1, y0, y1)) / count
+        variance = max(0.0, float(self._lookup(self.squares, x0, x1, y0, y1)) / count - mean**2)
+        return count, (mean + self.shift) * count, mean + self.shift, float(np.sqrt(variance))
+
+
+@dataclass
+class RegionStatistics:
+    """Statistics of the finite pixels in a rectangular region of an image.
+
+    Bounds are pixel indices, the upper ones exclusive. Channels of RGB images are combined.
+    """
+
+    x0: int
+    x1: int
+    y0: int
+    y1: int
+    count: int = 0
+    sum: float = 0.0
+    mean: float = np.nan
+    std: float = np.nan
+    min: float = np.nan
+    max: float = np.nan
+
+    @property
+    def width(self) -> int:
+        return self.x1 - self.x0
+
+    @property
+    def height(self) -> int:
+        return self.y1 - self.y0
+
+
+def region_statistics(
+    data: npt.NDArray[Any] | LazyImage, x0: int, x1: int, y0: int, y1: int, table: SummedAreaTable | None = None
+) -> RegionStatistics:
+    """Calculate statistics of a rectangular region, bounds are clipped to the image.
+
+    With summed-area tables, sum, mean and standard deviation are calculated in constant time, otherwise from the
+    pixels in the region. Min and max always need all pixels in the region.
+
+    Args:
+        data: Image data, either mono or RGB.
+        x0: First column.
+        x1: Column after last one.
+        y0: First row.
+        y1: Row after last one.
+        table: Summed-area tables for data, if available.
+
+    Returns:
+        Statistics of region.
+    """
+    h, w = data.shape[:2]
+    x0, x1, y0, y1 = max(0, x0), min(w, x1), max(0, y0), min(h, y1)
+    stats = RegionStatistics(x0, max(x0, x1), y0, max(y0, y1))
+    if stats.width == 0 or stats.height == 0:
+        return stats
+    cut = data[y0:y1, x0:x1]
+
+    # no tables? then do it on the pixels
+    if table is None or table.shape != (h, w):
+        full = ImageStatistics(cut, histogram=False, sample_size=0)
+        stats.count, stats.mean, stats.std, stats.min, stats.max = full.count, full.mean, full.std, full.min, full.max
+        stats.sum = full.mean * full.count if full.count > 0 else 0.0
+        return stats
+
+    # sums from tables, extrema from pixels
+    stats.count, stats.sum, stats.mean, stats.std = table.region(x0, x1, y0, y1)
+    if stats.count > 0 and table.counts is not None:
+        finite = np.isfinite(cut)
+        stats.min = float(np.min(cut, where=finite, initial=np.inf))
+        stats.max = float(np.max(cut, where=finite, initial=-np.inf))
+    elif stats.count > 0:
+        stats.min, stats.max = float(np.min(cut)), float(np.max(cut))
+    return stats
+
+
+__all__ = ["SUMMED_AREA_MAX_VALUES", "SummedAreaTable", "RegionStatistics", "region_statistics"]
@@ -0,0 +1,197 @@
+"""Render FITS images without Qt, exactly like they are displayed in the widget.
+
+Thumbnails for a directory of FITS files can be created in parallel with `qfitswidget-thumbnails` or
+`python -m qfitswidget.render`, run with `--help` for options.
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+import numpy as np
+import numpy.typing as npt
+from astropy.io import fits
+from matplotlib import colormaps  # type: ignore
+from matplotlib.image import imsave
+
+from .frame import CUTS_PRESETS, STRETCHES, FrameSettings, prepare_frame, render_frame, to_rgba
+from .pyramid import downsample
+
+# settings of a new widget
+DEFAULT_SETTINGS = FrameSettings(trimsec=True)
+
+# file names recognized as FITS files
+FITS_SUFFIXES = (".fits", ".fit", ".fts", ".fits.gz", ".fit.gz", ".fts.gz", ".fits.fz")
+
+
+def render_hdu(
+    hdu: fits.ImageHDU, settings: FrameSettings | None = None, plane: int = 0, max_size: int | None = None
+) -> npt.NDArray[np.uint8]:
+    """Render HDU to RGBA image, using the same cuts, stretch, debayering and colormap as the widget.
+
+    Like in the widget, the first row of the image is the bottom one.
+
+    Args:
+        hdu: HDU to render.
+        settings: Display settings, defaults to those of a new widget.
+        plane: Plane to render, if HDU contains a cube.
+        max_size: If given, the image is downsampled by factors of two until no side is larger, averaging the
+            normalized data like the widget does when zoomed out.
+
+    Returns:
+        RGBA image as uint8.
+    """
+
+    # downsampling requires normalized data, so don't use lookup table for RGBA
+    settings = settings or DEFAULT_SETTINGS
+    if max_size is not None:
+        settings = replace(settings, rgba_lut=False)
+    frame = prepare_frame(hdu, settings, plane=plane)
+    if frame is None:
+        raise ValueError("Could not prepare frame.")
+
+    # full resolution?
+    scaled = frame.scaled_data
+    if max_size is None or scaled is None or max(scaled.shape[:2]) <= max_size:
+        return render_frame(frame)
+
+    # average normalized data and apply colormap
+    while max(scaled.shape[:2]) > max_size and min(scaled.shape[:2]) >= 2:
+        scaled = downsample(scaled)
+    return to_rgba(scaled, scaled, None, colormaps[settings.cmap])
+
+
+def render_png(
+    hdu: fits.ImageHDU,
+    filename: str | Path,
+    settings: FrameSettings | None = None,
+    plane: int = 0,
+    max_size: int | None = None,
+) -> None:
+    """Render HDU to a PNG file, see render_hdu() for details.
+
+    Args:
+        hdu: HDU to render.
+        filename: Name of PNG file.
+        settings: Display settings, defaults to those of a new widget.
+        plane: Plane to render, if HDU contains a cube.
+        max_size: If given, maximum width and height of image.
+    """
+    imsave(filename, render_hdu(hdu, settings, plane, max_size), origin="lower", format="png")
+
+
+def image_hdu(hdu_list: fits.HDUList, ext: int | str | None = None) -> fits.ImageHDU:
+    """Get HDU to render from a file.
+
+    Args:
+        hdu_list: Opened FITS file.
+        ext: Index or name of extension, if not given, the first one containing an image is used.
+
+    Returns:
+        HDU with image.
+    """
+    if ext is not None:
+        return hdu_list[ext]
+    for hdu in hdu_list:
+        if hdu.is_image and hdu.header.get("NAXIS", 0) >= 2:
+            return hdu
+    raise ValueError("No image found.")
+
+
+def thumbnail_name(filename: str | Path) -> str:
+    """Name of thumbnail for a FITS file, i.e. its name with the FITS suffix replaced by .png."""
+    name = Path(filename).name
+    for suffix in FITS_SUFFIXES:
+        if name.lower().endswith(suffix):
+            return name[: -len(suffix)] + ".png"
+    return name + ".png"
+
+
+def _render_file(job: tuple[str, str, FrameSettings, int | None, int | str | None]) -> str | None:
+    """Render a FITS file to a PNG file in a worker process.
+
+    Returns:
+        Error message or None, if successful.
+    """
+    filename, output, settings, max_size, ext = job
+    try:
+        with fits.open(filename) as hdu_list:
+            render_png(image_hdu(hdu_list, ext), output, settings, max_size=max_size)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def _find_files(directory: Path, recursive: bool) -> list[Path]:
+    """Find all FITS files in a directory."""
+    files = directory.rglob("*") if recursive else directory.glob("*")
+    return sorted(f for f in files if f.is_file() and f.name.lower().endswith(FITS_SUFFIXES))
+
+
+def _extension(ext: str) -> int | str:
+    """Extension from command line, either index or name."""
+    return int(ext) if ext.isdigit() else ext
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Create PNG thumbnails for all FITS files in a directory.")
+    parser.add_argument("directory", type=Path, help="directory containing FITS files")
+    parser.add_argument("-o", "--output", type=Path, help="directory for thumbnails, defaults to input directory")
+    parser.add_argument("-s", "--size", type=int, default=512, help="maximum size of thumbnails, 0 for full size")
+    parser.add_argument("-r", "--recursive", action="store_true", help="also search subdirectories")
+    parser.add_argument("-e", "--ext", type=_extension, help="index or name of extension, defaults to first image")
+    parser.add_argument("--cuts", choices=CUTS_PRESETS, default=DEFAULT_SETTINGS.cuts_preset, help="cuts preset")
+    parser.add_argument("--stretch", choices=STRETCHES, default=DEFAULT_SETTINGS.stretch, help="stretch function")
+    parser.add_argument("--cmap", default=DEFAULT_SETTINGS.cmap, help="name of colormap for mono images")
+    parser.add_argument("--no-trimsec", action="store_true", help="show full image instead of science region")
+    parser.add_argument("--superpixel", action="store_true", help="debayer 2x2 cells into single pixels")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("-f", "--force", action="store_true", help="also render files with up-to-date thumbnails")
+    args = parser.parse_args(argv)
+    if args.cmap not in colormaps:
+        parser.error(f"Unknown colormap: {args.cmap}")
+    if not args.directory.is_dir():
+        parser.error(f"Not a directory: {args.directory}")
+
+    # settings
+    settings = replace(
+        DEFAULT_SETTINGS,
+        trimsec=not args.no_trimsec,
+        cuts_preset=args.cuts,
+        stretch=args.stretch,
+        cmap=args.cmap,
+        superpixel=args.superpixel,
+    )
+    max_size = args.size if args.size > 0 else None
+
+    # thumbnails next to FITS files or in same structure below output directory
+    jobs: list[tuple[str, str, FrameSettings, int | None, Any]] = []
+    for filename in _find_files(args.directory, args.recursive):
+        folder = filename.parent if args.output is None else args.output / filename.parent.relative_to(args.directory)
+        output = folder / thumbnail_name(filename)
+        if not args.force and output.exists() and output.stat().st_mtime >= filename.stat().st_mtime:
+            continue
+        folder.mkdir(parents=True, exist_ok=True)
+        jobs.append((str(filename), str(output), settings, max_size, args.ext))
+
+    # render in parallel
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for job, error in zip(jobs, executor.map(_render_file, jobs, chunksize=4)):
+            if error is not None:
+                failed += 1
+                print(f"{job[0]}: {error}", file=sys.stderr)
+    print(f"Rendered {len(jobs) - failed} of {len(jobs)} thumbnails.")
+    if failed > 0:
+        sys.exit(1)
+
+
+__all__ = ["render_hdu", "render_png", "image_hdu", "thumbnail_name", "main"]
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
 
 from qtpy import QtWidgets, QtGui  # type: ignore
+from matplotlib.image import interpolations_names
 
 if TYPE_CHECKING:
     from .qfitswidget import QFitsWidget
@@ -21,8 +22,9 @@ class Settings(QtWidgets.QDialog, Ui_DialogSettings):  # type: ignore
         # store
         self.fits_widget = fits_widget
 
-        # center mark styles
+        # center mark styles and zoom interpolations
         self.comboCenterStyle.addItems([s.value for s in CenterMarkStyle])
+        self.comboZoomInterpolation.addItems(sorted(interpolations_names))  # type: ignore
 
         # get values
         self.checkTextOverlayVisible.setChecked(fits_widget.text_overlay_visible)
@@ -33,7 +35,12 @@ class Settings(QtWidgets.QDialog, Ui_DialogSettings):  # type: ignore
         self.spinCenterSize.setValue(fits_widget.center_mark_size)
         self.checkDirectionsVisible.setChecked(fits_widget.directions_visible)
         self.labelDirectionsColor.setStyleSheet(f"background-color: {fits_widget.directions_color}")
+        self.checkSourcesVisible.setChecked(fits_widget.sources_visible)
+        self.labelSourcesColor.setStyleSheet(f"background-color: {fits_widget.sources_color}")
         self.checkZoomVisible.setChecked(fits_widget.zoom_visible)
+        self.spinZoomSize.setValue(fits_widget.zoom_size)
+        self.spinZoomMagnification.setValue(int(fits_widget.zoom_magnification))
+        self.comboZoomInterpolation.setCurrentText(fits_widget.zoom_interpolation)
 
         # connect signals
         self.checkTextOverlayVisible.stateChanged.connect(self._text_overlay_visible_changed)
@@ -44,7 +51,12 @@ class Settings(QtWidgets.QDialog, Ui_DialogSettings):  # type: ignore
         self.spinCenterSize.valueChanged.connect(self._center_size_changed)
         self.checkDirectionsVisible.stateChanged.connect(self._directions_visible_changed)
         self.buttonDirectionsColor.clicked.connect(self._directions_set_color)
+        self.checkSourcesVisible.stateChanged.connect(self._sources_visible_changed)
+        self.buttonSourcesColor.clicked.connect(self._sources_set_color)
         self.checkZoomVisible.stateChanged.connect(self._zoom_visible_changed)
+        self.spinZoomSize.valueChanged.connect(self._zoom_size_changed)
+        self.spinZoomMagnification.valueChanged.connect(self._zoom_magnification_changed)
+        self.comboZoomInterpolation.currentTextChanged.connect(self._zoom_interpolation_changed)
 
     def _text_overlay_visible_changed(self, state: int) -> None:
         self.fits_widget.text_overlay_visible = bool(state)
@@ -78,8 +90,25 @@ class Settings(QtWidgets.QDialog, Ui_DialogSettings):  # type: ignore
         self.labelDirectionsColor.setStyleSheet(f"background-color: {color.name()}")
         self.fits_widget.directions_color = color.name()
 
+    def _sources_visible_changed(self, state: int) -> None:
+        self.fits_widget.sources_visible = bool(state)
+
+    def _sources_set_color(self) -> None:
+        color = QtWidgets.QColorDialog.getColor(QtGui.QColor(self.fits_widget.sources_color), self)
+        self.labelSourcesColor.setStyleSheet(f"background-color: {color.name()}")
+        self.fits_widget.sources_color = color.name()
+
     def _zoom_visible_changed(self, state: int) -> None:
         self.fits_widget.zoom_visible = bool(state)
 
+    def _zoom_size_changed(self, size: int) -> None:
+        self.fits_widget.zoom_size = size
+
+    def _zoom_magnification_changed(self, magnification: int) -> None:
+        self.fits_widget.zoom_magnification = magnification
+
+    def _zoom_interpolation_changed(self, interpolation: str) -> None:
+        self.fits_widget.zoom_interpolation = interpolation
+
 
 __all__ = ["Settings"]
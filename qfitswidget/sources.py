@@ -0,0 +1,179 @@
+from __future__ import annotations
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+import cv2  # type: ignore
+import numpy as np
+import numpy.typing as npt
+
+# size of boxes for background estimation, tiles are a multiple of it
+BACKGROUND_BOX = 64
+
+# radius of window for centroids
+CENTROID_RADIUS = 3
+
+
+@dataclass
+class Sources:
+    """Detected sources, brightest first, positions in pixel coordinates of the image."""
+
+    x: npt.NDArray[np.float64] = field(default_factory=lambda: np.empty(0))
+    y: npt.NDArray[np.float64] = field(default_factory=lambda: np.empty(0))
+    peak: npt.NDArray[np.float64] = field(default_factory=lambda: np.empty(0))
+    flux: npt.NDArray[np.float64] = field(default_factory=lambda: np.empty(0))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+
+def _median(values: npt.NDArray[np.float32]) -> tuple[npt.NDArray[np.float32], npt.NDArray[np.intp]]:
+    """Median of finite values along last axis, NaN if there are none, and number of finite values."""
+    values = np.sort(values, axis=-1)
+    n = np.count_nonzero(np.isfinite(values), axis=-1)
+    lo = np.take_along_axis(values, np.maximum(0, (n - 1) // 2)[..., None], axis=-1)[..., 0]
+    hi = np.take_along_axis(values, np.maximum(0, n // 2)[..., None], axis=-1)[..., 0]
+    return np.where(n > 0, (lo + hi) / 2, np.nan).astype(np.float32), n
+
+
+def _background(tile: npt.NDArray[np.float32], x0: int, y0: int) -> tuple[npt.NDArray[Any], npt.NDArray[Any]]:
+    """Background and noise of a tile, interpolated between medians and MADs in boxes on a global grid.
+
+    Since boxes are aligned to the image and tiles overlap by a box, neighbouring tiles agree at their edges.
+    """
+
+    # boxes of tile, padded with NaNs to box grid, every second row and column is enough for the statistics
+    h, w = tile.shape
+    b = BACKGROUND_BOX
+    bx0, by0 = x0 // b * b, y0 // b * b
+    nx, ny = -(-(x0 + w - bx0) // b), -(-(y0 + h - by0) // b)
+    padded = np.full((ny * b, nx * b), np.nan, dtype=np.float32)
+    padded[y0 - by0 : y0 - by0 + h, x0 - bx0 : x0 - bx0 + w] = tile
+    boxes = padded.reshape(ny, b, nx, b)[:, ::2, :, ::2].swapaxes(1, 2).reshape(ny, nx, b * b // 4)
+
+    # median and MAD with one round of clipping for removing stars
+    median, _ = _median(boxes)
+    mad, _ = _median(np.abs(boxes - median[..., None]))
+    clipped = np.where(np.abs(boxes - median[..., None]) < 3 * 1.4826 * mad[..., None], boxes, np.nan)
+    clipped[mad == 0] = boxes[mad == 0]
+    median, n = _median(clipped)
+    mad, _ = _median(np.abs(clipped - median[..., None]))
+    noise = 1.4826 * mad
+    median[n < 10], noise[n < 10] = np.nan, np.nan
+
+    # fill empty boxes with the mean over all others
+    if np.all(np.isnan(median)):
+        return np.zeros_like(tile), np.full_like(tile, np.inf)
+    median[np.isnan(median)] = np.nanmean(median)
+    noise[np.isnan(noise)] = np.nanmean(noise)
+
+    # linear interpolation between box centers, constant beyond outer ones, is exactly what resizing does
+    size, crop = (nx * b, ny * b), np.s_[y0 - by0 : y0 - by0 + h, x0 - bx0 : x0 - bx0 + w]
+    return (
+        cv2.resize(median, size, interpolation=cv2.INTER_LINEAR)[crop],
+        cv2.resize(noise, size, interpolation=cv2.INTER_LINEAR)[crop],
+    )
+
+
+def _detect_tile(
+    image: npt.NDArray[np.float32], bounds: tuple[int, int, int, int], margin: int, threshold: float
+) -> Sources:
+    """Detect sources in a tile, including a margin around it, but only keep those within the tile."""
+    x0, x1, y0, y1 = bounds
+    h, w = image.shape
+    px0, px1, py0, py1 = max(0, x0 - margin), min(w, x1 + margin), max(0, y0 - margin), min(h, y1 + margin)
+    tile = image[py0:py1, px0:px1]
+
+    # subtract background, non-finite pixels are set to it
+    background, noise = _background(tile, px0, py0)
+    residual = np.nan_to_num(tile - background, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+    # smooth with a Gaussian, which reduces noise by the norm of the 2D kernel, i.e. the squared norm of the 1D one
+    kernel = cv2.getGaussianKernel(5, 1.0)
+    smoothed = cv2.sepFilter2D(residual, -1, kernel, kernel)
+    noise *= threshold * float(np.sum(kernel**2))
+
+    # local maxima above threshold
+    maxima = cv2.dilate(smoothed, np.ones((5, 5), np.uint8))
+    peaks = (smoothed == maxima) & (smoothed > noise)
+    ys, xs = np.nonzero(peaks)
+
+    # only in tile
+    inside = (xs + px0 >= x0) & (xs + px0 < x1) & (ys + py0 >= y0) & (ys + py0 < y1)
+    xs, ys = xs[inside], ys[inside]
+    if len(xs) == 0:
+        return Sources()
+
+    # centroids of positive residual in window around peaks
+    r = CENTROID_RADIUS
+    padded = np.pad(residual, r)
+    offsets = np.arange(-r, r + 1)
+    windows = padded[ys[:, None, None] + r + offsets[None, :, None], xs[:, None, None] + r + offsets[None, None, :]]
+    weights = np.clip(windows, 0, None)
+    total = np.sum(weights, axis=(1, 2))
+    total[total == 0] = 1
+    dx = np.sum(weights * offsets[None, None, :], axis=(1, 2)) / total
+    dy = np.sum(weights * offsets[None, :, None], axis=(1, 2)) / total
+    return Sources(
+        x=xs + px0 + dx,
+        y=ys + py0 + dy,
+        peak=residual[ys, xs].astype(np.float64),
+        flux=np.sum(windows, axis=(1, 2), dtype=np.float64),
+    )
+
+
+def detect_sources(
+    data: npt.NDArray[Any],
+    threshold: float = 5.0,
+    tile_size: int = 8 * BACKGROUND_BOX,
+    max_sources: int | None = 1000,
+    offset: tuple[int, int] = (0, 0),
+    workers: int | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> Sources | None:
+    """Detect point sources by peak finding above a local background, tiles of the image are processed in parallel.
+
+    Tiles overlap by a margin of one background box, so that background and peaks are identical on both sides of
+    a tile edge and each source is only found in the tile containing its peak.
+
+    Args:
+        data: Image data, RGB images are averaged over channels.
+        threshold: Detection threshold in units of background noise.
+        tile_size: Size of tiles, multiple of BACKGROUND_BOX.
+        max_sources: Maximum number of sources to return, only the brightest are kept.
+        offset: Offset in pixels to add to positions, e.g. for trimmed data.
+        workers: Number of threads, defaults to number of CPUs.
+        cancelled: Called before each tile, detection is stopped if it returns True.
+
+    Returns:
+        Detected sources or None, if cancelled.
+    """
+    image = np.asarray(np.mean(data, axis=2, dtype=np.float32) if len(data.shape) == 3 else data, dtype=np.float32)
+    h, w = image.shape
+    tiles = [
+        (x0, min(w, x0 + tile_size), y0, min(h, y0 + tile_size))
+        for y0 in range(0, h, tile_size)
+        for x0 in range(0, w, tile_size)
+    ]
+
+    def detect(bounds: tuple[int, int, int, int]) -> Sources | None:
+        if cancelled is not None and cancelled():
+            return None
+        return _detect_tile(image, bounds, BACKGROUND_BOX, threshold)
+
+    # detect in parallel
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = list(executor.map(detect, tiles))
+    if any(r is None for r in results) or (cancelled is not None and cancelled()):
+        return None
+
+    # merge and sort by flux
+    found = [r for r in results if r is not None and len(r) > 0]
+    if len(found) == 0:
+        return Sources()
+    x, y, peak, flux = (np.concatenate([getattr(r, a) for r in found]) for a in ("x", "y", "peak", "flux"))
+    order = np.argsort(flux)[::-1][:max_sources]
+    return Sources(x=x[order] + offset[0], y=y[order] + offset[1], peak=peak[order], flux=flux[order])
+
+
+__all__ = ["Sources", "detect_sources"]
@@ -0,0 +1,275 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+import numpy as np
+import numpy.typing as npt
+
+from .lazy import LazyImage
+
+# models for fitting the radial profile
+PROFILE_MODELS = ["gaussian", "moffat"]
+
+# number of Levenberg-Marquardt iterations
+FIT_ITERATIONS = 30
+
+# minimum peak above background in units of the noise in the outer ring of a cutout
+PEAK_THRESHOLD = 5.0
+
+
+@dataclass
+class StarMeasurement:
+    """Measurement of a star, all lengths in pixels and all values above the local background.
+
+    Values are NaN, if no star could be measured, e.g. outside the image or on plain background.
+    """
+
+    x: float = np.nan
+    y: float = np.nan
+    background: float = np.nan
+    peak: float = np.nan
+    flux: float = np.nan
+    hfd: float = np.nan
+    fwhm: float = np.nan
+    model: str = "gaussian"
+    beta: float = np.nan
+    radii: npt.NDArray[np.float64] = field(default_factory=lambda: np.empty(0))
+    profile: npt.NDArray[np.float64] = field(default_factory=lambda: np.empty(0))
+
+    @property
+    def valid(self) -> bool:
+        return bool(np.isfinite(self.hfd) and np.isfinite(self.fwhm))
+
+
+def _cutouts(
+    data: npt.NDArray[Any] | LazyImage, ix: npt.NDArray[np.int_], iy: npt.NDArray[np.int_], radius: int
+) -> npt.NDArray[np.float64]:
+    """Cutouts of size 2*radius+1 around given pixels, NaN outside image, RGB is averaged over channels."""
+    size = 2 * radius + 1
+    h, w = data.shape[:2]
+    cutouts = np.full((len(ix), size, size), np.nan)
+    for i, (x, y) in enumerate(zip(ix, iy)):
+        x0, x1, y0, y1 = max(0, x - radius), min(w, x + radius + 1), max(0, y - radius), min(h, y + radius + 1)
+        if x0 >= x1 or y0 >= y1:
+            continue
+        cut = np.asarray(data[y0:y1, x0:x1], dtype=np.float64)
+        if len(cut.shape) == 3:
+            cut = np.mean(cut, axis=2)
+        cutouts[i, y0 - y + radius : y1 - y + radius, x0 - x + radius : x1 - x + radius] = cut
+    cutouts[~np.isfinite(cutouts)] = np.nan
+    return cutouts
+
+
+def _gaussian(r2: npt.NDArray[Any], p: npt.NDArray[Any]) -> tuple[npt.NDArray[Any], npt.NDArray[Any]]:
+    """Gaussian with parameters amplitude and log(sigma) and its Jacobian, for squared radii r2 of shape (n, m)."""
+    a, s2 = p[:, 0:1], np.exp(2 * p[:, 1:2])
+    e = np.exp(-r2 / (2 * s2))
+    return a * e, np.stack([e, a * e * r2 / s2], axis=-1)
+
+
+def _moffat(r2: npt.NDArray[Any], p: npt.NDArray[Any]) -> tuple[npt.NDArray[Any], npt.NDArray[Any]]:
+    """Moffat with parameters amplitude, log(alpha) and log(beta) and its Jacobian."""
+    a, a2, beta = p[:, 0:1], np.exp(2 * p[:, 1:2]), np.exp(p[:, 2:3])
+    u = 1 + r2 / a2
+    f = u**-beta
+    return a * f, np.stack([f, a * f * beta / u * 2 * r2 / a2, -a * f * beta * np.log(u)], axis=-1)
+
+
+def _fit(
+    r2: npt.NDArray[Any], values: npt.NDArray[Any], weights: npt.NDArray[Any], p: npt.NDArray[Any], model: str
+) -> npt.NDArray[Any]:
+    """Fit model to pixels of all stars at once with Levenberg-Marquardt, each star with its own damping.
+
+    Args:
+        r2: Squared distances of pixels from centroids, shape (n, m).
+        values: Background-subtracted pixel values, shape (n, m).
+        weights: 1 for pixels to fit, 0 for others.
+        p: Initial parameters, shape (n, k).
+        model: Name of model.
+
+    Returns:
+        Fitted parameters.
+    """
+    func = _gaussian if model == "gaussian" else _moffat
+    result = p.copy()
+    index = np.arange(len(p))
+    damping = np.full(len(p), 1e-3)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        f, jac = func(r2, p)
+    cost = np.sum(weights * (values - f) ** 2, axis=1)
+    for _ in range(FIT_ITERATIONS):
+        # solve damped normal equations for all stars, a degenerate star just doesn't move
+        jwt = (jac * weights[..., None]).transpose(0, 2, 1)
+        jtj = jwt @ jac
+        grad = (jwt @ (values - f)[..., None])[..., 0]
+        diag = np.einsum("nkk->nk", jtj)
+        lhs = jtj + (damping[:, None] * diag + 1e-12)[..., None] * np.eye(p.shape[1])
+        bad = ~np.all(np.isfinite(lhs), axis=(1, 2)) | ~np.all(np.isfinite(grad), axis=1)
+        lhs[bad], grad[bad] = np.eye(p.shape[1]), 0
+        step = np.linalg.solve(lhs, grad[..., None])[..., 0]
+
+        # accept improvements, otherwise increase damping
+        p_new = p + step
+        if model == "moffat":
+            p_new[:, 2] = np.clip(p_new[:, 2], np.log(1.01), np.log(20))
+        with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+            f_new, jac_new = func(r2, p_new)
+            cost_new = np.sum(weights * (values - f_new) ** 2, axis=1)
+        better = np.isfinite(cost_new) & (cost_new < cost)
+        converged = np.where(better, cost - cost_new <= 1e-8 * cost, damping >= 1e7)
+        p = np.where(better[:, None], p_new, p)
+        f = np.where(better[:, None], f_new, f)
+        jac = np.where(better[:, None, None], jac_new, jac)
+        cost = np.where(better, cost_new, cost)
+        damping = np.clip(np.where(better, damping / 3, damping * 3), 1e-7, 1e7)
+
+        # only continue with stars that haven't converged yet
+        result[index] = p
+        if np.any(converged):
+            keep = ~converged
+            index, p, f, jac, cost, damping = index[keep], p[keep], f[keep], jac[keep], cost[keep], damping[keep]
+            r2, values, weights = r2[keep], values[keep], weights[keep]
+        if len(index) == 0:
+            break
+    return result
+
+
+def measure_stars(
+    data: npt.NDArray[Any] | LazyImage,
+    positions: Iterable[tuple[float, float]],
+    radius: int = 15,
+    model: str = "gaussian",
+) -> list[StarMeasurement]:
+    """Measure centroid, radial profile, FWHM and half-flux diameter of stars near given positions.
+
+    Each star is measured in a cutout around the brightest pixel near its position. Background is the median in
+    the outer ring of the cutout, the centroid is iterated within the inner half. The half-flux diameter is twice
+    the flux-weighted mean distance of pixels from the centroid, the FWHM is taken from a fit of a Gaussian or
+    Moffat profile to all pixels in the cutout. All stars are measured at once.
+
+    Args:
+        data: Image data, RGB images are averaged over channels.
+        positions: Pixel positions x/y near stars.
+        radius: Radius of cutouts in pixels, should be well beyond the wings of the stars.
+        model: Profile to fit, see PROFILE_MODELS.
+
+    Returns:
+        Measurements in same order as positions.
+    """
+    if model not in PROFILE_MODELS:
+        raise ValueError(f"Unknown model: {model}")
+    xy = np.array(list(positions), dtype=np.float64).reshape(-1, 2)
+    n = len(xy)
+    if n == 0:
+        return []
+
+    # pixel coordinates in cutouts relative to their centers
+    offsets = np.arange(-radius, radius + 1, dtype=np.float64)
+    gy, gx = np.meshgrid(offsets, offsets, indexing="ij")
+    distance = np.hypot(gx, gy).ravel()
+
+    # find brightest pixel within half the radius around given positions and cut out around it
+    ix, iy = np.floor(xy[:, 0] + 0.5).astype(int), np.floor(xy[:, 1] + 0.5).astype(int)
+    search = _cutouts(data, ix, iy, radius // 2).reshape(n, -1)
+    valid = np.any(np.isfinite(search), axis=1)
+    brightest = np.argmax(np.where(np.isfinite(search), search, -np.inf), axis=1)
+    ix += brightest % (2 * (radius // 2) + 1) - radius // 2
+    iy += brightest // (2 * (radius // 2) + 1) - radius // 2
+    cutouts = _cutouts(data, ix, iy, radius).reshape(n, -1)
+    finite = np.isfinite(cutouts)
+
+    # background from outer ring
+    ring = np.where((distance > 0.75 * radius)[None, :] & finite, cutouts, np.nan)
+    valid &= np.any(np.isfinite(ring), axis=1)
+    background = np.nanmedian(np.where(valid[:, None], ring, 0), axis=1)
+    noise = 1.4826 * np.nanmedian(np.where(valid[:, None], np.abs(ring - background[:, None]), 0), axis=1)
+    residual = np.where(finite, cutouts - background[:, None], 0.0)
+
+    # iterate centroid of positive residual within inner half
+    cx, cy = np.zeros(n), np.zeros(n)
+    for _ in range(5):
+        inner = np.hypot(gx.ravel()[None, :] - cx[:, None], gy.ravel()[None, :] - cy[:, None]) <= radius / 2
+        weights = np.where(inner, np.clip(residual, 0, None), 0)
+        total = np.sum(weights, axis=1)
+        valid &= total > 0
+        total[total == 0] = 1
+        cx, cy = np.sum(weights * gx.ravel(), axis=1) / total, np.sum(weights * gy.ravel(), axis=1) / total
+
+    # flux and HFD within aperture, excluding background ring
+    r = np.hypot(gx.ravel()[None, :] - cx[:, None], gy.ravel()[None, :] - cy[:, None])
+    aperture = (r <= 0.75 * radius) & finite
+    positive = np.where(aperture, np.clip(residual, 0, None), 0)
+    total = np.sum(positive, axis=1)
+    total[total == 0] = 1
+    hfd = 2 * np.sum(positive * r, axis=1) / total
+    flux = np.sum(np.where(aperture, residual, 0), axis=1)
+    peak = np.max(np.where(finite, residual, -np.inf), axis=1)
+    valid &= (peak > 0) & (peak > PEAK_THRESHOLD * noise)
+
+    # radial profile in bins of one pixel, mean per bin
+    nbins = int(np.ceil(0.75 * radius)) + 1
+    bins = np.minimum(r, nbins - 1).astype(int) + np.arange(n)[:, None] * nbins
+    count = np.bincount(bins[aperture], minlength=n * nbins).reshape(n, nbins)
+    sum_r = np.bincount(bins[aperture], weights=r[aperture], minlength=n * nbins).reshape(n, nbins)
+    sum_v = np.bincount(bins[aperture], weights=residual[aperture], minlength=n * nbins).reshape(n, nbins)
+
+    # fit profile, starting with width from HFD, which is 2.5 sigma for a Gaussian
+    sigma = np.clip(hfd / 2.5, 0.3, radius)
+    p0 = np.column_stack([np.maximum(peak, 1e-10), np.log(sigma)])
+    if model == "moffat":
+        # alpha for beta=3 with same FWHM
+        p0 = np.column_stack(
+            [p0[:, 0], np.log(sigma * 2.3548 / (2 * np.sqrt(2 ** (1 / 3) - 1))), np.full(n, np.log(3))]
+        )
+    p0 = np.where(valid[:, None], p0, [1.0] + [0.0] * (p0.shape[1] - 1))
+    p = _fit(r**2, residual, aperture.astype(np.float64), p0, model)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        if model == "gaussian":
+            fwhm, beta = 2 * np.sqrt(2 * np.log(2)) * np.exp(p[:, 1]), np.full(n, np.nan)
+        else:
+            beta = np.exp(p[:, 2])
+            fwhm = 2 * np.exp(p[:, 1]) * np.sqrt(2 ** (1 / beta) - 1)
+
+    # collect results
+    measurements = []
+    for i in range(n):
+        if not valid[i]:
+            measurements.append(StarMeasurement(model=model))
+            continue
+        used = count[i] > 0
+        measurements.append(
+            StarMeasurement(
+                x=float(ix[i] + cx[i]),
+                y=float(iy[i] + cy[i]),
+                background=float(background[i]),
+                peak=float(peak[i]),
+                flux=float(flux[i]),
+                hfd=float(hfd[i]),
+                fwhm=float(fwhm[i]) if 0 < fwhm[i] < 2 * radius else np.nan,
+                model=model,
+                beta=float(beta[i]),
+                radii=sum_r[i][used] / count[i][used],
+                profile=sum_v[i][used] / count[i][used],
+            )
+        )
+    return measurements
+
+
+def measure_star(
+    data: npt.NDArray[Any] | LazyImage, x: float, y: float, radius: int = 15, model: str = "gaussian"
+) -> StarMeasurement:
+    """Measure star near given position, see measure_stars() for details.
+
+    Args:
+        data: Image data.
+        x: X pixel position near star.
+        y: Y pixel position near star.
+        radius: Radius of cutout in pixels.
+        model: Profile to fit, see PROFILE_MODELS.
+
+    Returns:
+        Measurement of star.
+    """
+    return measure_stars(data, [(x, y)], radius, model)[0]
+
+
+__all__ = ["PROFILE_MODELS", "StarMeasurement", "measure_stars", "measure_star"]
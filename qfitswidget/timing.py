@@ -0,0 +1,139 @@
+from __future__ import annotations
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+import numpy as np
+
+
+@dataclass
+class TimingRecord:
+    """Durations of the stages of a single render or hover cycle.
+
+    Stages are stored in the order they were run, a stage that is run more than once is summed up.
+    """
+
+    kind: str
+    stages: dict[str, float] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.perf_counter)
+
+    @property
+    def total(self) -> float:
+        """Sum of all stages in seconds."""
+        return sum(self.stages.values())
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add duration of a stage.
+
+        Args:
+            stage: Name of stage.
+            seconds: Duration in seconds.
+        """
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Context manager that adds the time spent in it to a stage.
+
+        Args:
+            stage: Name of stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+
+@dataclass
+class StageSummary:
+    """Statistics of a stage over the records in a summary, all times in seconds."""
+
+    count: int
+    last: float
+    mean: float
+    median: float
+    max: float
+
+
+class TimingSummary:
+    """Rolling summary over the latest timing records of each kind."""
+
+    def __init__(self, length: int = 100):
+        """Create new summary.
+
+        Args:
+            length: Number of records of each kind to keep.
+        """
+        self.length = length
+        self._records: dict[str, deque[TimingRecord]] = {}
+
+    def add(self, record: TimingRecord) -> None:
+        """Add a new record, dropping the oldest of its kind, if necessary.
+
+        Args:
+            record: Record to add.
+        """
+        if record.kind not in self._records:
+            self._records[record.kind] = deque(maxlen=self.length)
+        self._records[record.kind].append(record)
+
+    def kinds(self) -> list[str]:
+        """Kinds of records in summary."""
+        return list(self._records.keys())
+
+    def records(self, kind: str) -> list[TimingRecord]:
+        """Latest records of given kind, oldest first.
+
+        Args:
+            kind: Kind of records.
+
+        Returns:
+            List of records.
+        """
+        return list(self._records.get(kind, []))
+
+    def stages(self, kind: str) -> dict[str, StageSummary]:
+        """Statistics for each stage of the records of given kind, including one for the "total".
+
+        Stages are only counted in records they appear in, e.g. cached stages of the render pipeline are skipped.
+
+        Args:
+            kind: Kind of records.
+
+        Returns:
+            Dictionary of stage names and their statistics.
+        """
+        durations: dict[str, list[float]] = {}
+        for record in self._records.get(kind, []):
+            for stage, seconds in list(record.stages.items()) + [("total", record.total)]:
+                durations.setdefault(stage, []).append(seconds)
+        return {
+            stage: StageSummary(
+                count=len(values),
+                last=values[-1],
+                mean=float(np.mean(values)),
+                median=float(np.median(values)),
+                max=float(np.max(values)),
+            )
+            for stage, values in durations.items()
+        }
+
+    def format(self) -> str:
+        """Format summary as a table with times in milliseconds."""
+        lines = [f"{'kind':<8} {'stage':<14} {'count':>6} {'last':>9} {'mean':>9} {'median':>9} {'max':>9}"]
+        for kind in self._records:
+            for stage, s in self.stages(kind).items():
+                lines.append(
+                    f"{kind:<8} {stage:<14} {s.count:>6d} {s.last * 1e3:>9.2f} {s.mean * 1e3:>9.2f} "
+                    f"{s.median * 1e3:>9.2f} {s.max * 1e3:>9.2f}"
+                )
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        """Remove all records."""
+        self._records.clear()
+
+
+__all__ = ["TimingRecord", "StageSummary", "TimingSummary"]
@@ -0,0 +1,158 @@
+from __future__ import annotations
+from typing import Any
+import numpy as np
+import numpy.typing as npt
+import astropy.units as u
+from astropy.coordinates import SkyCoord, BaseCoordinateFrame
+from astropy.wcs import WCS
+from astropy.wcs.utils import pixel_to_skycoord, wcs_to_celestial_frame
+
+
+class WCSGrid:
+    """Cache for fast pixel to world conversions of a celestial WCS.
+
+    The WCS is evaluated once on a coarse grid, which is refined until bilinear interpolation of the unit vectors
+    between grid points stays below a given error, checked at the centers of all grid cells. If that is not
+    possible or a position is outside the image, the exact WCS transformation is used.
+    """
+
+    def __init__(
+        self,
+        wcs: WCS,
+        shape: tuple[int, ...],
+        step: int = 64,
+        min_step: int = 8,
+        max_error: float = 0.05,
+    ):
+        """Build grid.
+
+        Args:
+            wcs: WCS to evaluate, only celestial axes are used.
+            shape: Shape of image, only the first two axes are used.
+            step: Initial distance between grid points in pixels.
+            min_step: Minimum distance between grid points, if error is still too large, exact conversion is used.
+            max_error: Maximum allowed interpolation error in arcsec.
+        """
+        self.wcs = wcs.celestial
+        self.shape = shape[:2]
+        self.frame: BaseCoordinateFrame | None = None
+        self.exact = True
+        self.error: float | None = None
+        self.step = step
+        self._units = [u.Unit(unit) for unit in self.wcs.world_axis_units]
+
+        # only works for celestial WCS
+        if not wcs.has_celestial:
+            return
+        try:
+            self.frame = wcs_to_celestial_frame(wcs)
+        except ValueError:
+            pass
+
+        # build grid, refine until error is small enough
+        while True:
+            self._build(step)
+            self.error = self._max_error(step)
+            if self.error <= max_error:
+                self.exact = False
+                self.step = step
+                break
+            if step // 2 < min_step:
+                break
+            step //= 2
+
+    def _build(self, step: int) -> None:
+        """Evaluate WCS on grid with given step size."""
+        h, w = self.shape
+        self._xs = np.arange(0, w + step, step, dtype=float)
+        self._ys = np.arange(0, h + step, step, dtype=float)
+        gx, gy = np.meshgrid(self._xs, self._ys)
+        self._vectors = self._to_vectors(*self._world_values(gx, gy))
+
+    def _world_values(self, x: npt.NDArray[Any], y: npt.NDArray[Any]) -> tuple[npt.NDArray[Any], npt.NDArray[Any]]:
+        """Exact world coordinates in degrees."""
+        lon, lat = self.wcs.pixel_to_world_values(x, y)
+        return (lon * self._units[0]).to_value(u.deg), (lat * self._units[1]).to_value(u.deg)
+
+    @staticmethod
+    def _to_vectors(lon: npt.NDArray[Any], lat: npt.NDArray[Any]) -> npt.NDArray[Any]:
+        """Convert lon/lat in degrees to unit vectors in last axis, which can be interpolated across wraps/poles."""
+        lon, lat = np.radians(lon), np.radians(lat)
+        return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+    @staticmethod
+    def _from_vectors(v: npt.NDArray[Any]) -> tuple[npt.NDArray[Any], npt.NDArray[Any]]:
+        """Convert (not necessarily normalized) vectors to lon/lat in degrees."""
+        lon = np.degrees(np.arctan2(v[..., 1], v[..., 0])) % 360.0
+        lat = np.degrees(np.arctan2(v[..., 2], np.hypot(v[..., 0], v[..., 1])))
+        return lon, lat
+
+    def _interpolate(self, x: npt.NDArray[Any], y: npt.NDArray[Any]) -> npt.NDArray[Any]:
+        """Bilinear interpolation of unit vectors on grid."""
+        fx, fy = x / self.step, y / self.step
+        ix = np.clip(fx.astype(int), 0, len(self._xs) - 2)
+        iy = np.clip(fy.astype(int), 0, len(self._ys) - 2)
+        tx, ty = (fx - ix)[..., None], (fy - iy)[..., None]
+        v = self._vectors
+        return (  # type: ignore
+            v[iy, ix] * (1 - tx) * (1 - ty)
+            + v[iy, ix + 1] * tx * (1 - ty)
+            + v[iy + 1, ix] * (1 - tx) * ty
+            + v[iy + 1, ix + 1] * tx * ty
+        )
+
+    def _max_error(self, step: int) -> float:
+        """Maximum interpolation error in arcsec at centers of all cells."""
+        cx, cy = np.meshgrid(self._xs[:-1] + step / 2, self._ys[:-1] + step / 2)
+        exact = self._to_vectors(*self._world_values(cx, cy))
+        interp = self._interpolate(cx, cy)
+        interp /= np.linalg.norm(interp, axis=-1, keepdims=True)
+        cos = np.clip(np.sum(exact * interp, axis=-1), -1, 1)
+        error = np.degrees(np.arccos(cos)) * 3600.0
+        return float(np.nanmax(error)) if error.size > 0 else 0.0
+
+    def _inside(self, x: float, y: float) -> bool:
+        return bool(0 <= x <= self._xs[-1] and 0 <= y <= self._ys[-1])
+
+    def world(self, x: float, y: float) -> tuple[float, float] | None:
+        """Convert pixel to world coordinates.
+
+        Args:
+            x: Zero-based x pixel coordinate.
+            y: Zero-based y pixel coordinate.
+
+        Returns:
+            Longitude and latitude in degrees or None, if WCS is not celestial.
+        """
+        if not self.wcs.has_celestial:
+            return None
+
+        # exact or interpolated
+        if self.exact or not self._inside(x, y):
+            lon, lat = self._world_values(np.array(x), np.array(y))
+        else:
+            lon, lat = self._from_vectors(self._interpolate(np.array(x), np.array(y)))
+        return float(lon), float(lat)
+
+    def pixel_to_skycoord(self, x: float, y: float) -> SkyCoord | None:
+        """Convert pixel to sky coordinates.
+
+        Args:
+            x: Zero-based x pixel coordinate.
+            y: Zero-based y pixel coordinate.
+
+        Returns:
+            Sky coordinates or None, if WCS is not celestial.
+        """
+        if self.frame is None:
+            return None
+        if self.exact or not self._inside(x, y):
+            return pixel_to_skycoord(x, y, self.wcs)
+        world = self.world(x, y)
+        if world is None:
+            return None
+        lon, lat = world
+        return SkyCoord((lon * u.deg).to(self._units[0]), (lat * u.deg).to(self._units[1]), frame=self.frame)
+
+
+__all__ = ["WCSGrid"]